@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):  # type: ignore
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self) -> None:
+        from . import sse_fanout
+
+        sse_fanout.eventstream_internals()
@@ -2,6 +2,7 @@ import logging
 
 from django_eventstream.channelmanager import DefaultChannelManager  # type: ignore [import-untyped]
 
+from app.models import channel_acl
 from app.models.utils import UserMitPlaya
 from app.sse_channels import SSEChannels
 
@@ -11,6 +12,26 @@ logger = logging.getLogger(__name__)
 
 
 class MyChannelManager(DefaultChannelManager):
+    def get_channels_for_request(self, request, view_kwargs) -> set[str]:
+        channels = super().get_channels_for_request(request, view_kwargs)
+
+        # The multiplexed player stream can also carry the events for the table they're looking at -- unless its hand
+        # is over, in which case there's nothing more to hear.  django-eventstream refuses the whole stream if we can't
+        # read any one of its channels, so we leave out tables we can't read, rather than lose our own events too.
+        if view_kwargs.get("multiplexed"):
+            tables = {
+                SSEChannels.table_html(int(hand_pk))
+                for hand_pk in request.GET.getlist("table")
+                if hand_pk.isdigit()
+            }
+            channels |= {
+                t
+                for t in tables - channel_acl.closed(tables).keys()
+                if self.can_read_channel(request.user, t)
+            }
+
+        return channels
+
     def can_read_channel(self, user: UserMitPlaya, channel: str) -> bool:
         # logger.warning(f"{user=} {channel=}")
         if user is None:
@@ -50,13 +71,12 @@ class MyChannelManager(DefaultChannelManager):
         # "table" messages are visible to those currently playing the table, as well as those who have played it in the
         # past.
         if (hand_pk := models.Hand.hand_pk_from_event_table_html_channel(channel)) is not None:
-            try:
-                hand = models.Hand.objects.get(pk=hand_pk)
-            except models.Hand.DoesNotExist:
-                logger.info("Hand %s does not exist => False", hand_pk)
-                return False
+            if (rv := channel_acl.get(player_pk=player.pk, channel=channel)) is not None:
+                return rv
 
-            return player.hand_at_which_we_played_board(hand.board) is not None
+            rv = self._has_played_table(player, hand_pk)
+            channel_acl.remember(player_pk=player.pk, channel=channel, allowed=rv)
+            return rv
 
         if channel == SSEChannels.PARTNERSHIPS:
             return True
@@ -64,3 +84,13 @@ class MyChannelManager(DefaultChannelManager):
         # everything else is visible to everyone, although I don't think there *are* any other messages.
         logger.warning("OK, so wtf is channel %s?", channel)
         return True
+
+    @staticmethod
+    def _has_played_table(player: models.Player, hand_pk: int) -> bool:
+        try:
+            hand = models.Hand.objects.get(pk=hand_pk)
+        except models.Hand.DoesNotExist:
+            logger.info("Hand %s does not exist => False", hand_pk)
+            return False
+
+        return player.hand_at_which_we_played_board(hand.board) is not None
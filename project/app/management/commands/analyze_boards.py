@@ -0,0 +1,17 @@
+# Work out the double-dummy trick table and par for every board that doesn't have them yet -- e.g., ones dealt before we
+# started doing that, or whose background analysis died with the web server.  See app.models.board_analysis.
+from __future__ import annotations
+
+from app.models import Board
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    def handle(self, *args, **options):
+        analyzed = 0
+        for b in Board.objects.filter(double_dummy_tricks__isnull=True).order_by("pk").iterator():
+            b.analyze()
+            analyzed += 1
+            self.stdout.write(f"{b}: par is {b.par_description}")
+
+        self.stdout.write(f"Analyzed {analyzed} boards")
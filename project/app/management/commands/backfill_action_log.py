@@ -0,0 +1,18 @@
+# Like update_redundant_fields, but just for Hand.action_log: recompute it (and num_actions) from the Call and Play rows.
+from __future__ import annotations
+
+from app.models import Hand
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    def handle(self, *args, **options):
+        changed = 0
+        for h in Hand.objects.order_by("pk").iterator():
+            old = h.action_log
+            h._rebuild_action_log()
+            if h.action_log != old:
+                changed += 1
+                self.stdout.write(f"Hand {h.pk}: {old!r} => {h.action_log!r}")
+
+        self.stdout.write(f"Changed {changed} hands' action logs")
@@ -22,6 +22,12 @@ everybodys_password = (
 class Command(BaseCommand):
     def add_arguments(self, parser) -> None:
         parser.add_argument("--tempo-seconds", type=float, default=5.0)
+        parser.add_argument(
+            "--turbo",
+            default=False,
+            action="store_true",
+            help="Have the bot play out each hand all at once, rather than a call or card per tempo",
+        )
 
         group = parser.add_mutually_exclusive_group()
         group.add_argument("--min-players", type=int, default=0)
@@ -46,6 +52,7 @@ class Command(BaseCommand):
             t, _ = Tournament.objects.get_or_create_tournament_open_for_signups(
                 boards_per_round_per_table=boards_per_round_per_table,
                 tempo_seconds=options["tempo_seconds"],
+                turbo_bot_hands=options["turbo"],
             )
 
             if (num_players := options.get("min_players", 0)) == 0:
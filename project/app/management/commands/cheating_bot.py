@@ -1,57 +1,119 @@
 from __future__ import annotations
 
-import datetime
+import concurrent.futures
+import dataclasses
 import logging
+import math
+import threading
 import time
 
+import app.metrics
 import app.models
+import django.db
 import django.db.models
 import django.utils.timezone
+import prometheus_client  # type: ignore [import-untyped]
+from app import solver
+from app.models import bot_memo, bot_queue, xscript_store
+from app.models.types import PK
 from django.core.management.base import BaseCommand
 
-from bridge.xscript import HandTranscript
-
 logger = logging.getLogger(__name__)
 
 
-def get_next_hand(
-    logger: logging.Logger | LessAnnoyingLogger | None = None,
-) -> app.models.Hand | None:
-    if logger is None:
-        logger = logging.getLogger(__name__)
+# If some update to the ready queue went missing, this is the longest we'll go without noticing.
+REBUILD_INTERVAL_SECONDS = 60
+
+# How often we log actions/sec and scheduling lag.
+REPORT_INTERVAL_SECONDS = 10
+
+# When a hand comes due while a worker is still acting on it, how long to put it off.
+BUSY_HAND_RETRY_SECONDS = 0.1
+
+# When the solver couldn't come up with a call or card in time, how long to put the hand off.
+SOLVER_RETRY_SECONDS = 1
 
-    expression = django.db.models.Q(pk__in=[])
-    for direction in app.models.common.attribute_names:
-        expression |= django.db.models.Q(**{f"{direction}__allow_bot_to_play_for_me": True})
+# When acting on a hand failed some other way -- say, the database or redis hiccuped -- how long to put it off: this,
+# doubled for each failure in a row, but never longer than ERROR_RETRY_MAX_SECONDS.
+ERROR_RETRY_SECONDS = 1
+ERROR_RETRY_MAX_SECONDS = 30
+
+
+def _playable_hands() -> django.db.models.QuerySet:
+    return app.models.Hand.objects.prepop().filter(
+        is_complete=False,
+        abandoned_because__isnull=True,
+        board__tournament__completed_at__isnull=True,
+        board__tournament__play_completion_deadline__gt=django.utils.timezone.now(),
+    )
 
-    # TODO -- this isn't quite right. What we *really* want is to consider only those hands for whom the current seat is
-    # controlled by a bot.  But the below sometimes gets us a hand whose current seat is controlled by a human, and that
-    # basically prevents us from doing any other work.
-    all_hands_with_bots = (
-        app.models.Hand.objects.prepop()
+
+def rebuild_ready_queue() -> int:
+    """Recreate the ready queue (see app.models.bot_queue) from scratch, from the database.
+
+    Returns how many hands are in the queue.
+    """
+    if (num_filled_in := app.models.Hand.objects.fill_in_missing_next_actors()) > 0:
+        logger.info("%s", f"Worked out whose turn it is in {num_filled_in} older hands")
+
+    due_by_hand_pk = {}
+    h: app.models.Hand
+    for h in (
+        app.models.Hand.objects.bot_is_due_to_act_on()
         .filter(
-            expression,
-            is_complete=False,
-            abandoned_because__isnull=True,
             board__tournament__completed_at__isnull=True,
             board__tournament__play_completion_deadline__gt=django.utils.timezone.now(),
         )
-        .order_by("last_action_time")
-    )
+        .select_related("board__tournament")
+    ):
+        if (due := h.bot_due_time()) is not None:
+            due_by_hand_pk[h.pk] = due
 
-    # "manually" find the oldest hand whose current seat is controlled by the bot.  ideally we'd have the database do
-    # this for us, rather than doing it here in Python; but it's not clear if that's possible.
-    h: app.models.Hand
-    for h in all_hands_with_bots:
-        s = h.next_seat_to_call or h.next_seat_to_play
+    bot_queue.replace_all(due_by_hand_pk)
+    return len(due_by_hand_pk)
 
-        if s is None:
-            continue
-        player = h.player_who_controls_seat(s, right_this_second=False)
-        if player.allow_bot_to_play_for_me:
-            return h
 
-    return None
+@xscript_store.request_scope()
+def act_on(hand_to_play: app.models.Hand, logger: logging.Logger | logging.LoggerAdapter) -> bool:
+    """Make the next call or play on this hand, if it's up to a bot.  Returns whether we did.
+
+    If everyone at the table is a bot, and the tournament allows it, we make all the rest of them instead.
+    """
+    if hand_to_play.play_out_if_all_bots():
+        logger.info("%s", "Everyone at the table is a bot, so I played out the rest of the hand")
+        return True
+
+    if (p := hand_to_play.player_who_may_call) is not None:
+        logger.info("%s", f"It is {p.name}'s turn to call")
+        p.refresh_from_db(fields=["allow_bot_to_play_for_me"])
+        if not p.allow_bot_to_play_for_me:
+            logger.info("%s", f"{p.name} is human")
+            return False
+
+        call = bot_memo.call(hand_to_play)
+        hand_to_play.add_call(call=call)
+        logger.info(
+            "%s",
+            f"I called {call} for {p.name} at {hand_to_play.direction_letters_by_player[p]}",
+        )
+        return True
+
+    if (s := hand_to_play.next_seat_to_play) is not None:
+        logger.info("%s", f"It is {s.name}'s turn to play")
+        p = hand_to_play.player_who_controls_seat(s, right_this_second=True)
+        p.refresh_from_db(fields=["allow_bot_to_play_for_me"])
+        if not p.allow_bot_to_play_for_me:
+            logger.info("%s", f"{p.name} may not play now: {p.allow_bot_to_play_for_me=}.")
+            return False
+
+        card = bot_memo.play(hand_to_play)
+        hand_to_play.add_play_from_model_player(player=p, card=card)
+        logger.info("%s", f"I played {card} for {p.name} at {s.name}")
+        return True
+
+    raise Exception(
+        "This is confusing -- supposedly this hand is in progress, but nobody can call or play"
+    )
 
 
 # adapted from https://stackoverflow.com/a/26092256
@@ -60,92 +122,166 @@ def get_next_hand(
 class LessAnnoyingLogger:
     def __init__(self):
         self._reset()
-        self.current_hand = None
 
     def _reset(self):
         self.invocations = 0
 
-    def note_current_hand(self, hand):
-        self.current_hand = hand
-
     def __getattr__(self, attr):
         self.invocations += 1
         if self.invocations.bit_count() == 1:  # i.e., it's a power of two
-            meth = getattr(logger, attr)
+            return getattr(logger, attr)
+        return lambda *args, **kwargs: None
 
-            if self.current_hand is None:
-                return meth
 
-            # Crude hack to get the current hand into each log message.
-            hand_pk = self.current_hand.pk
+class _HandLogger(logging.LoggerAdapter):
+    def process(self, msg, kwargs):
+        return f"hand {self.extra['hand']}: {msg}", kwargs
 
-            def amended_method(*args, **kwargs):
-                args = list(args)
-                args[0] = f"hand {hand_pk}: " + args[0]
-                return meth(*args, **kwargs)
 
-            return amended_method
-        return lambda *args, **kwargs: None
+@dataclasses.dataclass
+class Stats:
+    """How we've been doing since the last report."""
 
+    actions: int = 0
+    lags: list[float] = dataclasses.field(default_factory=list)
+    since: float = dataclasses.field(default_factory=time.monotonic)
+    lock: threading.Lock = dataclasses.field(default_factory=threading.Lock)
+
+    def note_lag(self, seconds: float) -> None:
+        app.metrics.BOT_SCHEDULING_LAG_SECONDS.observe(seconds)
+        with self.lock:
+            self.lags.append(seconds)
+
+    def note_action(self) -> None:
+        app.metrics.BOT_ACTIONS.inc()
+        with self.lock:
+            self.actions += 1
+
+    def report_and_reset(self) -> str:
+        with self.lock:
+            elapsed = time.monotonic() - self.since
+            lags = sorted(self.lags)
+            rv = f"{self.actions / elapsed:.1f} actions/sec"
+            if lags:
+                rv += f"; scheduling lag p50 {lags[len(lags) // 2]:.3f}s, max {lags[-1]:.3f}s"
+
+            self.actions = 0
+            self.lags = []
+            self.since = time.monotonic()
+
+        return rv
+
+
+class Executor:
+    """Acts on many hands at once, with a bounded pool of worker threads.
+
+    We only pop a hand off the ready queue when a worker is free to take it, so a backlog stays in the queue, in order
+    of when each hand was due.  Each hand is handled by at most one worker at a time: its next call or play only goes
+    back on the queue once this one is done (see Hand.update_bot_queue), and if it shows up early anyway (say, because
+    the queue got rebuilt), we put it back for later.
+    """
+
+    def __init__(self, *, workers: int) -> None:
+        self.pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="cheating-bot"
+        )
+        self.free_workers = threading.BoundedSemaphore(workers)
+        self.lock = threading.Lock()
+        self.in_flight: set[PK] = set()
+        # Hands whose last attempt failed, and how many times in a row that's happened.
+        self.failures: dict[PK, int] = {}
+        self.stats = Stats()
+
+    def run_forever(self, *, idle_logger: LessAnnoyingLogger) -> None:
+        last_rebuild = -math.inf
+        last_report = time.monotonic()
 
-class Command(BaseCommand):
-    def __init__(self, *args, **kwargs):
-        self.quiet_logger = LessAnnoyingLogger()
-        super().__init__(*args, **kwargs)
-
-    def wait_for_tempo(self, hand_to_play: app.models.Hand) -> None:
-        tempo = datetime.timedelta(seconds=hand_to_play.board.tournament.tempo_seconds)
-        wait_until = hand_to_play.last_action_time + tempo
-        now = django.utils.timezone.now()
-        sleepy_time = max(datetime.timedelta(seconds=0), wait_until - now)
-        time.sleep(sleepy_time.total_seconds())
-
-    def handle(self, *_args, **_options) -> None:
         while True:
-            hand_to_play = get_next_hand(logger=self.quiet_logger)
-            self.quiet_logger.note_current_hand(hand_to_play)
+            if time.monotonic() - last_rebuild > REBUILD_INTERVAL_SECONDS:
+                num_due = rebuild_ready_queue()
+                last_rebuild = time.monotonic()
+                logger.info("%s", f"Rebuilt the ready queue: {num_due} hands are waiting on a bot")
+
+            if time.monotonic() - last_report > REPORT_INTERVAL_SECONDS:
+                logger.info("%s", self.stats.report_and_reset())
+                last_report = time.monotonic()
+
+            self.free_workers.acquire()
 
-            if hand_to_play is None:
-                self.quiet_logger.info("No playable hand; waiting")
-                time.sleep(1)
+            if (popped := bot_queue.pop_due()) is None:
+                self.free_workers.release()
+                idle_logger.info("No playable hand; waiting")
+                next_due = bot_queue.next_due()
+                time.sleep(1 if next_due is None else min(1, max(0, next_due - time.time())))
                 continue
 
-            self.wait_for_tempo(hand_to_play)
-            xscript: HandTranscript = hand_to_play.get_xscript()
-
-            if (p := hand_to_play.player_who_may_call) is not None:
-                self.quiet_logger.info("%s", f"It is {p.name}'s turn to call")
-                p.refresh_from_db(fields=["allow_bot_to_play_for_me"])
-                if p.allow_bot_to_play_for_me:
-                    call = xscript.auction.make_standard_american_call(
-                        pbn=xscript.endplay_deal.to_pbn(),
-                        vuln=xscript.endplay_vulnerability(),
-                    )
-                    hand_to_play.add_call(call=call)
-                    self.quiet_logger._reset()
-                    self.quiet_logger.info(
-                        "%s",
-                        f"I called {call} for {p.name} at {hand_to_play.direction_letters_by_player[p]}",
-                    )
-                else:
-                    self.quiet_logger.info("%s", f"{p.name} is human")
-                    time.sleep(hand_to_play.board.tournament.tempo_seconds)
-            elif (s := hand_to_play.next_seat_to_play) is not None:
-                self.quiet_logger.info("%s", f"It is {s.name}'s turn to play")
-                p = hand_to_play.player_who_controls_seat(s, right_this_second=True)
-                p.refresh_from_db(fields=["allow_bot_to_play_for_me"])
-                if p.allow_bot_to_play_for_me:
-                    self.quiet_logger._reset()
-                    card = xscript.slightly_less_dumb_play().card
-                    hand_to_play.add_play_from_model_player(player=p, card=card)
-                    self.quiet_logger.info("%s", f"I played {card} for {p.name} at {s.name}")
-                else:
-                    self.quiet_logger.info(
-                        "%s",
-                        f"{p.name} may not play now: {p.allow_bot_to_play_for_me=}.",
-                    )
-                    time.sleep(hand_to_play.board.tournament.tempo_seconds)
-            else:
-                raise Exception(
-                    "This is confusing -- supposedly this hand is in progress, but nobody can call or play"
-                )
+            idle_logger._reset()
+            hand_pk, due = popped
+
+            with self.lock:
+                busy = hand_pk in self.in_flight
+                if not busy:
+                    self.in_flight.add(hand_pk)
+
+            if busy:
+                self.free_workers.release()
+                bot_queue.schedule(hand_pk=hand_pk, due=time.time() + BUSY_HAND_RETRY_SECONDS)
+                continue
+
+            self.stats.note_lag(time.time() - due)
+            self.pool.submit(self._act_on, hand_pk)
+
+    def _act_on(self, hand_pk: PK) -> None:
+        try:
+            django.db.close_old_connections()
+            # So that everything we look at on the hand, from here to the call or play, shares one transcript.
+            with xscript_store.request_scope():
+                if (h := _playable_hands().filter(pk=hand_pk).first()) is None:
+                    logger.info("%s", f"Hand {hand_pk} is no longer playable; skipping it")
+                elif act_on(h, logger=_HandLogger(logger, extra={"hand": hand_pk})):
+                    self.stats.note_action()
+        except solver.SolverUnavailable as e:
+            logger.warning("%s", f"Hand {hand_pk}: {e}; will try again")
+            bot_queue.schedule(hand_pk=hand_pk, due=time.time() + SOLVER_RETRY_SECONDS)
+        except Exception:
+            # We've already popped it off the queue; unless we put it back, it'd sit until the next rebuild.
+            with self.lock:
+                failures = self.failures[hand_pk] = self.failures.get(hand_pk, 0) + 1
+            delay = min(ERROR_RETRY_MAX_SECONDS, ERROR_RETRY_SECONDS * 2 ** (failures - 1))
+            logger.exception(
+                "%s", f"Trouble acting on hand {hand_pk}; will try again in {delay} seconds"
+            )
+            try:
+                bot_queue.schedule(hand_pk=hand_pk, due=time.time() + delay)
+            except Exception:
+                logger.exception("%s", f"Couldn't reschedule hand {hand_pk}; the next rebuild will")
+        else:
+            with self.lock:
+                self.failures.pop(hand_pk, None)
+        finally:
+            django.db.close_old_connections()
+            with self.lock:
+                self.in_flight.discard(hand_pk)
+            self.free_workers.release()
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="How many hands to call or play on at once",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=None,
+            help="If given, serve Prometheus metrics (actions, scheduling lag) on this port",
+        )
+
+    def handle(self, *_args, **options) -> None:
+        if options["metrics_port"] is not None:
+            prometheus_client.start_http_server(options["metrics_port"])
+
+        Executor(workers=options["workers"]).run_forever(idle_logger=LessAnnoyingLogger())
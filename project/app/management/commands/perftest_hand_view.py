@@ -3,7 +3,7 @@ from __future__ import annotations
 import sys
 import timeit
 
-from app.models import Hand, Player
+from app.models import Hand, Player, xscript_store
 from app.views import hand
 from django.core.management.base import BaseCommand
 from django.test.client import RequestFactory
@@ -23,3 +23,22 @@ class Command(BaseCommand):
         sys.stderr.write(
             f"{total_seconds=} for {number=} calls, mean {total_seconds / number} seconds\n",
         )
+
+        # Now count how often we hit the transcript cache per view, with and without the per-request memo that
+        # XscriptMemoMiddleware gives us.
+        def one_request() -> None:
+            with xscript_store.request_scope():
+                hand._interactive_view(request, h)
+
+        for description, view in (
+            ("without request memo", lambda: hand._interactive_view(request, h)),
+            ("with request memo", one_request),
+        ):
+            before = xscript_store.round_trips.copy()
+            for _ in range(number):
+                view()
+            per_view = {
+                op: (xscript_store.round_trips[op] - before[op]) / number
+                for op in ("get", "compare_and_set", "delete")
+            }
+            sys.stderr.write(f"{description}: transcript cache round trips per view: {per_view}\n")
@@ -0,0 +1,117 @@
+"""
+Open a bunch of event-stream clients against a running server, and check that they don't each hold a database
+connection (see app.views.events).
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+
+import requests
+from app.models import Player
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+
+def _count_db_connections() -> int:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()")
+        return cursor.fetchone()[0]
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--clients", type=int, default=50)
+        parser.add_argument("--server", default="http://localhost:9000")
+        parser.add_argument(
+            "--settle-seconds",
+            type=float,
+            default=5.0,
+            help="How long to wait, once every client is connected, before counting connections",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=int,
+            default=5,
+            help="How many more database connections than we started with we'll put up with",
+        )
+
+    def handle(self, *_args, **options) -> None:
+        num_clients = options["clients"]
+
+        players = list(
+            Player.objects.select_related("user", "current_hand").order_by("pk")[:num_clients]
+        )
+        if not players:
+            msg = "There are no players to connect as; try `just stress` first"
+            raise CommandError(msg)
+
+        # Log each player in once, and reuse their session cookie for every client that connects as them.
+        session_cookies: dict[int, str] = {}
+        for p in players:
+            c = Client()
+            c.force_login(p.user)
+            session_cookies[p.pk] = c.cookies[settings.SESSION_COOKIE_NAME].value
+
+        before = _count_db_connections()
+        self.stderr.write(f"{before} database connections before we connect any clients")
+
+        connected = threading.Semaphore(0)
+        stop = threading.Event()
+        failures: list[str] = []
+
+        def one_client(player: Player) -> None:
+            url = f"{options['server']}/events/player/{player.pk}/"
+            params = {"table": player.current_hand.pk} if player.current_hand is not None else {}
+            try:
+                with requests.get(
+                    url,
+                    params=params,
+                    cookies={settings.SESSION_COOKIE_NAME: session_cookies[player.pk]},
+                    stream=True,
+                    timeout=30,
+                ) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if line == b"event: stream-open":
+                            connected.release()
+                        if stop.is_set():
+                            return
+            except requests.RequestException as e:
+                failures.append(f"{player.name}: {e}")
+                connected.release()
+
+        threads = [
+            threading.Thread(target=one_client, args=(p,), daemon=True)
+            for p in itertools.islice(itertools.cycle(players), num_clients)
+        ]
+        for t in threads:
+            t.start()
+        for _ in threads:
+            connected.acquire()
+
+        time.sleep(options["settle_seconds"])
+        during = _count_db_connections()
+        stop.set()
+
+        self.stderr.write(
+            f"{during} database connections with {num_clients - len(failures)} clients connected"
+        )
+        for f in failures:
+            self.stderr.write(f"  {f}")
+
+        if failures:
+            msg = f"{len(failures)} of {num_clients} clients failed to connect"
+            raise CommandError(msg)
+
+        if during - before > options["tolerance"]:
+            msg = f"Database connections went from {before} to {during}: looks like each client is holding one"
+            raise CommandError(msg)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"OK: database connections went from {before} to {during}")
+        )
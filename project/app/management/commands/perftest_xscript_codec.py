@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pickle
+import sys
+import timeit
+
+from app.models import Hand, xscript_codec, xscript_store
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+
+class Command(BaseCommand):
+    help = "Compare the size and decoding speed of pickled transcripts with that of xscript_codec"
+
+    def handle(self, *args, **options):
+        h = (
+            Hand.objects.prepop()
+            .annotate(num_plays=Count("play"))
+            .filter(num_plays=52)
+            .order_by("pk")
+            .first()
+        )
+        if h is None:
+            sys.stderr.write("No hands with all 52 cards played; try loading a fixture.\n")
+            return
+
+        entry = h._get_xscript_entry()
+        xscript = h._xscript_from_entry(entry)
+
+        pickled = pickle.dumps(xscript, protocol=pickle.HIGHEST_PROTOCOL)
+        packed = xscript_codec.pack(board_pk=entry.board_pk, calls=entry.calls, plays=entry.plays)
+
+        def decode_packed() -> None:
+            board_pk, calls, plays = xscript_codec.unpack(packed)
+            h._xscript_from_entry(xscript_store.Entry(board_pk=board_pk, calls=calls, plays=plays))
+
+        number = 200
+        for description, size, fn in (
+            ("pickle", len(pickled), lambda: pickle.loads(pickled)),
+            ("codec", len(packed), decode_packed),
+        ):
+            total_seconds = timeit.timeit(fn, number=number)
+            sys.stderr.write(
+                f"{description:>6}: {size:6} bytes; {1_000_000 * total_seconds / number:9.1f} µs per decode\n",
+            )
@@ -0,0 +1,222 @@
+# Play complete tournaments of synthetic players, right here in this process, as fast as possible, and report how fast
+# that was -- as JSON on stdout, so that runs from different commits are easy to compare.
+#
+# Unlike big_bot_stress, this needs no cheating_bot running alongside, and doesn't wait for any tempo: it makes each
+# call and play itself, via the bot's own `act_on`, which goes through Hand.add_call and add_play_from_model_player
+# (and thence do_end_of_hand_stuff, when a hand ends).  So don't run a cheating_bot at the same time; it'd fight us for
+# the hands.
+from __future__ import annotations
+
+import json
+import logging
+import statistics
+import time
+
+from app import sse_outbox
+from app.management.commands.cheating_bot import act_on
+from app.models import (
+    Hand,
+    Player,
+    Tournament,
+    bot_memo,
+    bot_queue,
+    channel_acl,
+    logged_queries,
+    xscript_store,
+)
+from app.models.hand import enrich
+from app.models.tournament import _do_signup_expired_stuff
+from app.sse_replay import round_trips as sse_replay_round_trips
+from django.contrib import auth
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from .utils import is_safe
+
+logger = logging.getLogger(__name__)
+
+ROUND_TRIP_COUNTERS = {
+    "bot_memo": bot_memo.round_trips,
+    "bot_queue": bot_queue.round_trips,
+    "channel_acl": channel_acl.round_trips,
+    "sse_replay": sse_replay_round_trips,
+    "xscript_store": xscript_store.round_trips,
+}
+
+
+def _total_round_trips() -> dict[str, int]:
+    return {name: sum(counter.values()) for name, counter in ROUND_TRIP_COUNTERS.items()}
+
+
+class Command(BaseCommand):
+    help = "Play whole tournaments of bots in-process, and report hands/sec, actions/sec, queries per action, &c as JSON"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--tables", type=int, default=2, help="Tables per tournament")
+        parser.add_argument(
+            "--boards-per-round", type=int, default=2, help="Boards per round, per table"
+        )
+        parser.add_argument(
+            "--tournaments",
+            type=int,
+            default=1,
+            help="How many tournaments to play, one after another",
+        )
+        parser.add_argument(
+            "--no-sse",
+            default=False,
+            action="store_true",
+            help="Render server-sent events as usual, but don't publish them",
+        )
+        parser.add_argument(
+            "--turbo",
+            default=False,
+            action="store_true",
+            help="Set the tournaments' turbo_bot_hands, so that each hand gets played out all at once",
+        )
+        parser.add_argument(
+            "--keep",
+            default=False,
+            action="store_true",
+            help="Leave the tournaments and synthetic players in the database afterwards",
+        )
+
+    def handle(self, *_args, **options) -> None:
+        if not is_safe(self.stderr):
+            msg = "This creates, and then deletes, a bunch of players and tournaments; not in production, thanks"
+            raise CommandError(msg)
+
+        with override_settings(SSE_OUTBOX_DISCARD=options["no_sse"]):
+            report = self._simulate(
+                num_tables=options["tables"],
+                boards_per_round=options["boards_per_round"],
+                num_tournaments=options["tournaments"],
+                turbo=options["turbo"],
+                keep=options["keep"],
+            )
+
+        report["sse_published"] = not options["no_sse"]
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def _set_up_tournament(
+        self, *, num_tables: int, boards_per_round: int, turbo: bool
+    ) -> tuple[Tournament, list[int]]:
+        t = Tournament.objects.create(
+            boards_per_round_per_table=boards_per_round, tempo_seconds=0, turbo_bot_hands=turbo
+        )
+
+        user_pks = []
+        for _ in range(num_tables * 2):
+            p1 = Player.objects.create_synthetic()
+            p2 = Player.objects.create_synthetic()
+            p1.partner_with(p2)
+            t.sign_up_player_and_partner(p1)
+            user_pks.extend([p1.user_id, p2.user_id])
+
+        t.signup_deadline = timezone.now()
+        t.save()
+        _do_signup_expired_stuff(t)
+
+        return t, user_pks
+
+    def _simulate(
+        self,
+        *,
+        num_tables: int,
+        boards_per_round: int,
+        num_tournaments: int,
+        turbo: bool,
+        keep: bool,
+    ) -> dict:
+        latencies: list[float] = []
+        num_queries = 0
+        num_hands = 0
+        round_trips_before = _total_round_trips()
+        memo_lookups_before = bot_memo.lookups.copy()
+
+        start = time.perf_counter()
+
+        for _ in range(num_tournaments):
+            t, user_pks = self._set_up_tournament(
+                num_tables=num_tables, boards_per_round=boards_per_round, turbo=turbo
+            )
+            self.stderr.write(f"Playing tournament #{t.display_number}: {num_tables} tables")
+
+            while True:
+                # One call or play at each table in turn, as if they were all playing at once.
+                hands = list(
+                    enrich(Hand.objects.incomplete().filter(board__tournament=t)).order_by("pk")
+                )
+                if not hands:
+                    break
+
+                for h in hands:
+                    with xscript_store.request_scope(), logged_queries() as ql:
+                        action_start = time.perf_counter()
+                        acted = act_on(h, logger=logger)
+                        action_seconds = time.perf_counter() - action_start
+
+                    if not acted:
+                        msg = f"The bot wouldn't act on {h}; is somebody human?"
+                        raise CommandError(msg)
+
+                    latencies.append(action_seconds)
+                    num_queries += len(ql.calls)
+
+            t.refresh_from_db()
+            if not t.is_complete:
+                msg = f"Ran out of hands to play, but tournament #{t.display_number} isn't complete"
+                raise CommandError(msg)
+
+            num_hands += t.hands().count()
+
+            # Publishing is part of the work we're timing; and it needs the tournament's hands to still be there.
+            sse_outbox.drain()
+
+            if not keep:
+                t.delete()
+                auth.models.User.objects.filter(pk__in=user_pks).delete()
+
+        sse_outbox.drain()
+        elapsed = time.perf_counter() - start
+
+        num_actions = len(latencies)
+        # Only for the ratios below; there's nothing to divide if no hand needed anything doing.
+        per_action = max(num_actions, 1)
+        round_trips_after = _total_round_trips()
+        round_trips = {
+            name: round_trips_after[name] - round_trips_before[name] for name in ROUND_TRIP_COUNTERS
+        }
+        percentiles = (
+            statistics.quantiles(latencies, n=100, method="inclusive")
+            if num_actions > 1
+            else [0.0] * 99
+        )
+
+        return {
+            "tournaments": num_tournaments,
+            "tables": num_tables,
+            "boards_per_round": boards_per_round,
+            # If so, each "action" below is a whole hand.
+            "turbo": turbo,
+            "hands": num_hands,
+            "actions": num_actions,
+            "elapsed_seconds": elapsed,
+            # Includes setting up, and tearing down, each tournament.
+            "hands_per_second": num_hands / elapsed,
+            "actions_per_second": num_actions / elapsed,
+            "queries_per_action": num_queries / per_action,
+            "cache_round_trips_per_action": {
+                "total": sum(round_trips.values()) / per_action,
+                **{name: n / per_action for name, n in round_trips.items()},
+            },
+            "bot_memo_hits": sum(
+                n - memo_lookups_before[k] for k, n in bot_memo.lookups.items() if k[1] == "hit"
+            ),
+            "action_latency_seconds": {
+                "p50": percentiles[49],
+                "p99": percentiles[98],
+                "max": max(latencies, default=0.0),
+            },
+        }
@@ -0,0 +1,45 @@
+"""Our own Prometheus metrics, exported alongside django-prometheus's at /metrics."""
+
+from prometheus_client import Counter, Histogram  # type: ignore [import-untyped]
+
+SSE_FANOUT_PUBLISH_SECONDS = Histogram(
+    "bridge_sse_fanout_publish_seconds",
+    "Time spent publishing all the server-sent events for a single call or play",
+)
+
+SSE_FANOUT_EVENTS = Counter(
+    "bridge_sse_fanout_events_total",
+    "Server-sent events published by the per-action fan-out",
+)
+
+SSE_FANOUT_REDIS_ROUND_TRIPS = Counter(
+    "bridge_sse_fanout_redis_round_trips_total",
+    "Redis round trips made while publishing the per-action fan-out",
+)
+
+SSE_FANOUT_COALESCED_EVENTS = Counter(
+    "bridge_sse_fanout_coalesced_events_total",
+    "Server-sent events that were merged into a later one on the same channel, rather than published",
+)
+
+BOT_ACTIONS = Counter(
+    "bridge_bot_actions_total",
+    "Calls and plays made by the cheating_bot command",
+)
+
+BOT_SCHEDULING_LAG_SECONDS = Histogram(
+    "bridge_bot_scheduling_lag_seconds",
+    "How long after a hand came due the cheating_bot got around to acting on it",
+)
+
+BOT_MEMO_LOOKUPS = Counter(
+    "bridge_bot_memo_lookups_total",
+    "Times the bot (or the hint button) looked up a remembered decision, by kind of decision and whether it was there",
+    ["kind", "result"],
+)
+
+SOLVER_REQUESTS = Counter(
+    "bridge_solver_requests_total",
+    "Calls and plays asked of the solver pool, by kind and outcome (ok, busy, timeout, broken)",
+    ["kind", "result"],
+)
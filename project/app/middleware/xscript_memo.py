@@ -0,0 +1,12 @@
+from app.models import xscript_store
+
+
+class XscriptMemoMiddleware:
+    """Lets a request fetch (and unpickle) any given hand's transcript from the cache at most once."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with xscript_store.request_scope():
+            return self.get_response(request)
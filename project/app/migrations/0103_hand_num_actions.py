@@ -0,0 +1,40 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_num_actions(apps, schema_editor):
+    Hand = apps.get_model("app", "Hand")
+
+    def count_of(model_name: str) -> Coalesce:
+        model = apps.get_model("app", model_name)
+        counts = (
+            model.objects.filter(hand=OuterRef("pk"))
+            .order_by()
+            .values("hand")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    # One UPDATE for every hand, rather than a couple of queries apiece.
+    Hand.objects.update(num_actions=count_of("Call") + count_of("Play"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0102_call_explanation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hand",
+            name="num_actions",
+            field=models.PositiveSmallIntegerField(
+                db_comment="How many calls plus plays have been made; doubles as the version of the cached transcript",
+                default=0,
+            ),
+        ),
+        migrations.RunPython(backfill_num_actions, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+# Frozen copies of the tables in app.models.xscript_codec, as of this migration.
+CARDS = [suit + rank for suit in "♣♦♥♠" for rank in "23456789TJQKA"]
+CALLS = [
+    "Pass",
+    "Double",
+    "Redouble",
+    *[f"{level}{denomination}" for level in range(1, 8) for denomination in "♣♦♥♠N"],
+]
+
+
+def backfill_action_log(apps, schema_editor):
+    Hand = apps.get_model("app", "Hand")
+    for h in Hand.objects.all():
+        log = "".join(
+            chr(ord("!") + CALLS.index(c))
+            for c in h.call_set.order_by("id").values_list("serialized", flat=True)
+        ) + "".join(
+            chr(ord("!") + len(CALLS) + CARDS.index(p))
+            for p in h.play_set.order_by("id").values_list("serialized", flat=True)
+        )
+        h.action_log = log
+        h.num_actions = len(log)
+        h.save(update_fields=["action_log", "num_actions"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0103_hand_num_actions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hand",
+            name="action_log",
+            field=models.TextField(
+                blank=True,
+                db_comment="Every call and play, one character apiece (see xscript_codec); enough to rebuild the transcript",
+                default="",
+            ),
+        ),
+        migrations.RunPython(backfill_action_log, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Hands already in progress get these filled in by Hand.objects.fill_in_missing_next_actors, which the cheating_bot
+# command calls when it starts: working out whose turn it is means replaying the transcript, which needs the real
+# models, not the frozen ones we'd get here.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0104_hand_action_log"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hand",
+            name="next_actor_seat",
+            field=models.CharField(
+                choices=[("N", "NORTH"), ("E", "EAST"), ("S", "SOUTH"), ("W", "WEST")],
+                db_comment="The seat that gets to call or play next; null once the hand is complete or abandoned",
+                max_length=1,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="hand",
+            name="next_actor_player",
+            field=models.ForeignKey(
+                db_comment="Who controls next_actor_seat -- declarer, if it's dummy's turn to play",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="app.player",
+            ),
+        ),
+        migrations.AddField(
+            model_name="hand",
+            name="next_actor_is_bot",
+            field=models.BooleanField(
+                db_comment="Whether next_actor_player lets the bot call and play for them",
+                default=False,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hand",
+            index=models.Index(
+                condition=models.Q(("abandoned_because__isnull", True), ("is_complete", False)),
+                fields=["next_actor_is_bot", "last_action_time"],
+                name="app_hand_bot_is_due",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hand",
+            index=models.Index(
+                condition=models.Q(("abandoned_because__isnull", True), ("is_complete", False)),
+                fields=["next_actor_player", "last_action_time"],
+                name="app_hand_waiting_on_player",
+            ),
+        ),
+    ]
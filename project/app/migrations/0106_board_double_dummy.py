@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+# Existing boards get analyzed by the analyze_boards management command: the solver needs the real models (well, the
+# real Board.hand_strings_by_direction_letter), and it's too slow to make every deploy wait for it.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0105_hand_next_actor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="board",
+            name="double_dummy_tricks",
+            field=models.CharField(
+                db_comment="Tricks each seat (NESW) takes as declarer in each strain (C D H S NT), double-dummy; one hex digit apiece",
+                max_length=20,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="board",
+            name="par_score",
+            field=models.SmallIntegerField(db_comment="North/South's par score", null=True),
+        ),
+        migrations.AddField(
+            model_name="board",
+            name="par_contracts",
+            field=models.CharField(
+                db_comment='The par contracts (e.g. "4SN=", "5DEX-3"), separated by spaces',
+                max_length=100,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0106_board_double_dummy"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tournament",
+            name="turbo_bot_hands",
+            field=models.BooleanField(
+                db_comment="If set, a hand at which all four players are bots gets played out all at once, ignoring tempo_seconds",
+                default=False,
+            ),
+        ),
+    ]
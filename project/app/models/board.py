@@ -137,6 +137,22 @@ class Board(models.Model):
         db_comment=""" A, B, C &c """,  # type: ignore [call-overload]
     )
 
+    # See app.models.board_analysis.  All null until the board has been analyzed.
+    double_dummy_tricks = models.CharField(
+        max_length=20,
+        null=True,
+        db_comment="""Tricks each seat (NESW) takes as declarer in each strain (C D H S NT), double-dummy; one hex digit apiece""",  # type: ignore [call-overload]
+    )
+    par_score = models.SmallIntegerField(
+        null=True,
+        db_comment="""North/South's par score""",  # type: ignore [call-overload]
+    )
+    par_contracts = models.CharField(
+        max_length=100,
+        null=True,
+        db_comment="""The par contracts (e.g. "4SN=", "5DEX-3"), separated by spaces""",  # type: ignore [call-overload]
+    )
+
     objects = BoardManager()
 
     def was_played_at_table(self, *, table_display_number: int) -> models.QuerySet:
@@ -167,6 +183,41 @@ class Board(models.Model):
 
         return ("NeverSeenIt", None)
 
+    def analyze(self) -> None:
+        """Work out, and save, this board's double-dummy trick table and par."""
+        from app.models import board_analysis
+
+        analysis = board_analysis.analyze(self)
+        self.double_dummy_tricks = analysis.tricks
+        self.par_score = analysis.par_score
+        self.par_contracts = analysis.par_contracts
+        Board.objects.filter(pk=self.pk).update(
+            double_dummy_tricks=self.double_dummy_tricks,
+            par_score=self.par_score,
+            par_contracts=self.par_contracts,
+        )
+
+    @property
+    def is_analyzed(self) -> bool:
+        return self.double_dummy_tricks is not None
+
+    @property
+    def double_dummy_tricks_by_seat(self) -> dict[str, list[int]] | None:
+        from app.models import board_analysis
+
+        if self.double_dummy_tricks is None:
+            return None
+        return board_analysis.tricks_by_seat(self.double_dummy_tricks)
+
+    @property
+    def par_description(self) -> str | None:
+        from app.models import board_analysis
+
+        if self.par_contracts is None or self.par_score is None:
+            return None
+        contracts = [board_analysis.describe_contract(c) for c in self.par_contracts.split()]
+        return f"N/S {self.par_score:+}: {' or '.join(contracts) or 'passed out'}"
+
     def save(self, *args, **kwargs):
         assert isinstance(self.north_cards, str), f"Those bastards!! {self.north_cards=}"
         assert (
@@ -0,0 +1,145 @@
+"""Each board's double-dummy trick table and par score, worked out once, in the background
+
+A board never changes once it's been dealt, so there's no point in asking the solver about it more than once.  When
+Movement.ensure_boards deals a new board, we hand it to a background thread (after the transaction commits, so that the
+thread can actually see it), which solves it and stores the answer on the Board; the board archive page and the "hint"
+button just read it from there.  Boards that missed out -- older ones, or ones whose thread died with the web server --
+get analyzed by the `analyze_boards` management command.
+
+The trick table is stored as twenty hex digits: how many tricks each seat (N, E, S, W) would take as declarer, in each
+strain (clubs, diamonds, hearts, spades, notrump) -- so "d" means all thirteen.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import logging
+import re
+import threading
+from typing import TYPE_CHECKING
+
+import django.db
+import endplay.dds  # type: ignore [import-untyped]
+from django.db import transaction
+from endplay.types import Deal, Denom, Player, Vul  # type: ignore [import-untyped]
+
+from .types import PK
+
+if TYPE_CHECKING:
+    from .board import Board
+
+logger = logging.getLogger(__name__)
+
+SEATS = "NESW"
+STRAINS = ("♣", "♦", "♥", "♠", "NT")
+
+_ENDPLAY_DENOMS = (Denom.clubs, Denom.diamonds, Denom.hearts, Denom.spades, Denom.nt)
+_RANKS = "AKQJT98765432"
+_PBN_SUITS = "♠♥♦♣"
+
+# How we store par contracts: level, strain, declarer, doubled or not, result; e.g. "4SN=", "5DEX-3", "3NW+1".  This is
+# endplay's notation, with unicode turned off (see endplay.types.Contract.__str__) -- but we build it ourselves, since
+# what endplay does depends on its global config.
+_CONTRACT_RE = re.compile(
+    r"(?P<level>\d)(?P<strain>[CDHSN])(?P<declarer>[NESW])(?P<penalty>X{0,2})(?P<result>=|[+-]\d+)"
+)
+
+# The solver is quick -- well under a second a board -- and boards only get dealt when a tournament's movement is
+# built, so one thread is plenty.  It also means we never have two solves going at once in this process.
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="board-analysis"
+)
+_solver_lock = threading.Lock()
+
+
+@dataclasses.dataclass(frozen=True)
+class Analysis:
+    tricks: str  # see the module docstring
+    par_score: int  # from North/South's point of view
+    par_contracts: str  # see _CONTRACT_RE; separated by spaces
+
+
+def _pbn_hand(card_string: str) -> str:
+    # card_string is as in Board.north_cards &c: a suit symbol, then a rank, thirteen times.
+    ranks_by_suit: dict[str, list[str]] = {suit: [] for suit in _PBN_SUITS}
+    for suit, rank in zip(card_string[::2], card_string[1::2], strict=True):
+        ranks_by_suit[suit].append(rank)
+    return ".".join("".join(sorted(ranks_by_suit[suit], key=_RANKS.index)) for suit in _PBN_SUITS)
+
+
+def _contract_string(c) -> str:
+    strain = "SHDCN"[c.denom]
+    result = "=" if c.result == 0 else f"{c.result:+d}"
+    return f"{c.level}{strain}{SEATS[c.declarer]}{c.penalty.abbr.upper()}{result}"
+
+
+def analyze(board: Board) -> Analysis:
+    """Run the double-dummy solver over this board.  Slow-ish; see Board.analyze for the usual way in."""
+    deal = Deal.from_pbn(
+        "N:" + " ".join(_pbn_hand(board.hand_strings_by_direction_letter[seat]) for seat in SEATS)
+    )
+    vul = {
+        (False, False): Vul.none,
+        (True, False): Vul.ns,
+        (False, True): Vul.ew,
+        (True, True): Vul.both,
+    }[(board.ns_vulnerable, board.ew_vulnerable)]
+
+    with _solver_lock:
+        table = endplay.dds.calc_dd_table(deal)
+        par = endplay.dds.par(table, vul, Player.find(board.dealer))
+
+    return Analysis(
+        tricks="".join(
+            f"{table[denom, Player.find(seat)]:x}" for denom in _ENDPLAY_DENOMS for seat in SEATS
+        ),
+        par_score=par.score,
+        par_contracts=" ".join(_contract_string(c) for c in par),
+    )
+
+
+def tricks_by_seat(tricks: str) -> dict[str, list[int]]:
+    """Unpack Board.double_dummy_tricks: seat letter => tricks in each of STRAINS"""
+    return {
+        seat: [int(tricks[s * len(SEATS) + i], 16) for s in range(len(STRAINS))]
+        for i, seat in enumerate(SEATS)
+    }
+
+
+def describe_contract(contract: str) -> str:
+    """e.g. "4SN=" => "4♠ by N, making"; "5DEX-3" => "5♦X by E, down 3" """
+    m = _CONTRACT_RE.fullmatch(contract)
+    if m is None:
+        return contract
+
+    strain = STRAINS["CDHSN".index(m["strain"])]
+    result = m["result"]
+    if result == "=":
+        outcome = "making"
+    elif result.startswith("+"):
+        outcome = f"making {result[1:]} over"
+    else:
+        outcome = f"down {result[1:]}"
+
+    return f"{m['level']}{strain}{m['penalty']} by {m['declarer']}, {outcome}"
+
+
+def _analyze_by_pk(board_pk: PK) -> None:
+    from .board import Board
+
+    try:
+        django.db.close_old_connections()
+        if (board := Board.objects.filter(pk=board_pk).first()) is None:
+            logger.info("%s", f"Board {board_pk} is gone; not analyzing it")
+            return
+        board.analyze()
+    except Exception:
+        logger.exception("%s", f"Trouble analyzing board {board_pk}")
+    finally:
+        django.db.close_old_connections()
+
+
+def analyze_in_background(board_pk: PK) -> None:
+    """Once the current transaction commits, have a background thread analyze this board."""
+    transaction.on_commit(lambda: _executor.submit(_analyze_by_pk, board_pk))
@@ -0,0 +1,190 @@
+"""The bot's decisions, remembered, so that tables playing the same board needn't make them again
+
+In a Mitchell movement, every table plays the same boards, and tables full of bots tend to bid and play the same way.
+So rather than asking endplay for each call, or each card, from scratch, we remember its answer for every (deal,
+vulnerability, dealer, calls and plays so far), and the next table to get there just looks it up.  Both the
+cheating_bot command and the "hint" button go through here.
+
+Each deal's answers live in one redis hash per kind of decision, keyed by the hand's `action_log` -- which is a
+compact, exact description of every call and play so far, and so also of the contract and who's declaring it.  A hash
+holds at most `MAX_ENTRIES_PER_DEAL` answers, and disappears `TIMEOUT_SECONDS` after the last one was added; so the
+memo stays bounded no matter how many boards go by.
+
+Whatever we don't remember gets worked out by app.solver, in a separate process.
+
+With any other cache backend (e.g., in the unit tests), each deal's answers are a dict stored in the cache.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+import app.metrics
+import app.solver
+from bridge.card import Card as libCard
+from bridge.contract import Call as libCall
+
+if TYPE_CHECKING:
+    from bridge.xscript import HandTranscript
+
+    from .hand import Hand
+
+# Boards get played over an hour or two; nobody's going to reach the same auction a day later.
+TIMEOUT_SECONDS = 24 * 60 * 60
+
+# There are only so many ways that bots will bid, or play, a given deal; this is plenty.
+MAX_ENTRIES_PER_DEAL = 1000
+
+# KEYS[1]: the deal's hash
+# ARGV[1]: the field
+# ARGV[2]: the value
+# ARGV[3]: MAX_ENTRIES_PER_DEAL
+# ARGV[4]: TIMEOUT_SECONDS
+_REMEMBER_LUA = """
+if redis.call('HLEN', KEYS[1]) < tonumber(ARGV[3]) then
+  redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+"""
+
+# Hits and misses, by kind of decision.  For tests.
+lookups: collections.Counter[tuple[str, str]] = collections.Counter()
+
+# How many times we've talked to the cache backend, by operation.  For tests.
+round_trips: collections.Counter[str] = collections.Counter()
+
+
+def _cache():
+    # Not `django.core.cache.cache`: that's a proxy, and we need to know what kind of backend is behind it.
+    return caches["default"]
+
+
+def _key(*, kind: str, pbn: str, vuln: object, dealer: str) -> str:
+    deal = hashlib.sha1(f"{pbn}|{vuln}|{dealer}".encode()).hexdigest()
+    return f"bot-memo:{kind}:{deal}"
+
+
+def _get(key: str, field: str) -> str | None:
+    round_trips["get"] += 1
+    cache = _cache()
+
+    if isinstance(cache, RedisCache):
+        key = cache.make_and_validate_key(key)
+        value = cache._cache.get_client(key).hget(key, field)
+        return None if value is None else value.decode()
+
+    return (cache.get(key) or {}).get(field)
+
+
+def _remember(key: str, field: str, value: str) -> None:
+    round_trips["remember"] += 1
+    cache = _cache()
+
+    if isinstance(cache, RedisCache):
+        key = cache.make_and_validate_key(key)
+        client = cache._cache.get_client(key, write=True)
+        client.register_script(_REMEMBER_LUA)(
+            keys=[key], args=[field, value, MAX_ENTRIES_PER_DEAL, TIMEOUT_SECONDS]
+        )
+    else:
+        entries = cache.get(key) or {}
+        if len(entries) < MAX_ENTRIES_PER_DEAL:
+            entries.setdefault(field, value)
+        cache.set(key, entries, timeout=TIMEOUT_SECONDS)
+
+
+def _note_lookup(kind: str, *, hit: bool) -> None:
+    result = "hit" if hit else "miss"
+    lookups[(kind, result)] += 1
+    app.metrics.BOT_MEMO_LOOKUPS.labels(kind=kind, result=result).inc()
+
+
+def _key_for_xscript(kind: str, xscript: HandTranscript, *, dealer: str) -> str:
+    return _key(
+        kind=kind,
+        pbn=xscript.endplay_deal.to_pbn(),
+        vuln=xscript.endplay_vulnerability(),
+        dealer=dealer,
+    )
+
+
+def call(
+    hand: Hand, *, timeout: float = app.solver.BOT_TIMEOUT_SECONDS, wait: bool = True
+) -> libCall:
+    """The call the endplay bidder would make next in this hand.
+
+    `timeout` and `wait` are as for app.solver.call, which we consult if we don't remember.
+    """
+    return call_for_xscript(
+        hand.get_xscript(),
+        action_log=hand.action_log,
+        dealer=hand.board.dealer,
+        timeout=timeout,
+        wait=wait,
+    )
+
+
+def call_for_xscript(
+    xscript: HandTranscript,
+    *,
+    action_log: str,
+    dealer: str,
+    timeout: float = app.solver.BOT_TIMEOUT_SECONDS,
+    wait: bool = True,
+) -> libCall:
+    """Like `call`, but for a transcript that needn't match any Hand in the database; `action_log` must match it."""
+    key = _key_for_xscript("call", xscript, dealer=dealer)
+
+    if (remembered := _get(key, action_log)) is not None:
+        _note_lookup("call", hit=True)
+        serialized, explanation = json.loads(remembered)
+        rv = libCall.deserialize(serialized)
+        return rv.with_explanation(explanation) if explanation else rv
+
+    _note_lookup("call", hit=False)
+    rv = app.solver.call(xscript, timeout=timeout, wait=wait)
+    _remember(key, action_log, json.dumps([rv.serialize(), rv.explanation]))
+    return rv
+
+
+def play(
+    hand: Hand, *, timeout: float = app.solver.BOT_TIMEOUT_SECONDS, wait: bool = True
+) -> libCard:
+    """The card that `slightly_less_dumb_play` would play next in this hand.
+
+    `timeout` and `wait` are as for app.solver.play, which we consult if we don't remember.
+    """
+    return play_for_xscript(
+        hand.get_xscript(),
+        action_log=hand.action_log,
+        dealer=hand.board.dealer,
+        timeout=timeout,
+        wait=wait,
+    )
+
+
+def play_for_xscript(
+    xscript: HandTranscript,
+    *,
+    action_log: str,
+    dealer: str,
+    timeout: float = app.solver.BOT_TIMEOUT_SECONDS,
+    wait: bool = True,
+) -> libCard:
+    """Like `play`, but for a transcript that needn't match any Hand in the database; `action_log` must match it."""
+    key = _key_for_xscript("play", xscript, dealer=dealer)
+
+    if (remembered := _get(key, action_log)) is not None:
+        _note_lookup("play", hit=True)
+        return libCard.deserialize(remembered)
+
+    _note_lookup("play", hit=False)
+    rv = app.solver.play(xscript, timeout=timeout, wait=wait)
+    _remember(key, action_log, rv.serialize())
+    return rv
@@ -0,0 +1,136 @@
+"""Hands on which a bot is due to call or play, and when
+
+The cheating_bot command used to fetch every incomplete hand with a bot anywhere at the table, and replay each one's
+transcript until it found one where it was actually a bot's turn.  Instead, each hand whose next call or play is up to a
+bot sits in a redis sorted set, scored by when that's due -- its last_action_time plus the tournament's tempo -- and
+the bot just pops whichever hand is due.  Hands that are waiting on a human aren't in the set at all, so they can't
+hold anything up.
+
+Hand.update_bot_queue keeps the set current: it's called after every call and play, when a hand is created or
+abandoned, and when a player toggles their bot.  If the set gets lost or goes stale anyway (say redis restarts), the
+bot rebuilds it from the database with `replace_all`.
+
+With any other cache backend (e.g., in the unit tests), the set is a dict stored in the cache; that's fine for a single
+bot.
+"""
+
+from __future__ import annotations
+
+import collections
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+from .types import PK
+
+_KEY = "bot-ready-queue"
+
+# KEYS[1]: the sorted set
+# ARGV[1]: now
+_POP_DUE_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, 1)
+if #due == 0 then
+  return false
+end
+redis.call('ZREM', KEYS[1], due[1])
+return due
+"""
+
+# How many times we've talked to the cache backend, by operation.  For tests.
+round_trips: collections.Counter[str] = collections.Counter()
+
+
+def _cache():
+    # Not `django.core.cache.cache`: that's a proxy, and we need to know what kind of backend is behind it.
+    return caches["default"]
+
+
+def _redis_client_and_key(cache: RedisCache):
+    key = cache.make_and_validate_key(_KEY)
+    return cache._cache.get_client(key, write=True), key
+
+
+def schedule(*, hand_pk: PK, due: float) -> None:
+    """Note that a bot should act on this hand at `due` (seconds since the epoch), replacing any earlier note."""
+    round_trips["schedule"] += 1
+    cache = _cache()
+
+    if isinstance(cache, RedisCache):
+        client, key = _redis_client_and_key(cache)
+        client.zadd(key, {str(hand_pk): due})
+    else:
+        entries = cache.get(_KEY) or {}
+        entries[hand_pk] = due
+        cache.set(_KEY, entries, timeout=None)
+
+
+def unschedule(hand_pk: PK) -> None:
+    """Note that no bot need act on this hand, e.g. because it's a human's turn, or the hand is over."""
+    round_trips["unschedule"] += 1
+    cache = _cache()
+
+    if isinstance(cache, RedisCache):
+        client, key = _redis_client_and_key(cache)
+        client.zrem(key, str(hand_pk))
+    else:
+        entries = cache.get(_KEY) or {}
+        if entries.pop(hand_pk, None) is not None:
+            cache.set(_KEY, entries, timeout=None)
+
+
+def pop_due(now: float | None = None) -> tuple[PK, float] | None:
+    """Remove, and return, the hand that has been due the longest, and when it was due, if any is due."""
+    if now is None:
+        now = time.time()
+
+    round_trips["pop_due"] += 1
+    cache = _cache()
+
+    if isinstance(cache, RedisCache):
+        client, key = _redis_client_and_key(cache)
+        popped = client.register_script(_POP_DUE_LUA)(keys=[key], args=[now])
+        if popped is None:
+            return None
+        member, score = popped
+        return int(member), float(score)
+
+    entries = cache.get(_KEY) or {}
+    due = [(when, pk) for pk, when in entries.items() if when <= now]
+    if not due:
+        return None
+
+    when, hand_pk = min(due)
+    del entries[hand_pk]
+    cache.set(_KEY, entries, timeout=None)
+    return hand_pk, when
+
+
+def next_due() -> float | None:
+    """When the next hand is due, or None if there aren't any."""
+    round_trips["next_due"] += 1
+    cache = _cache()
+
+    if isinstance(cache, RedisCache):
+        client, key = _redis_client_and_key(cache)
+        [(_, when)] = client.zrange(key, 0, 0, withscores=True) or [(None, None)]
+        return when
+
+    entries = cache.get(_KEY) or {}
+    return min(entries.values(), default=None)
+
+
+def replace_all(due_by_hand_pk: dict[PK, float]) -> None:
+    """Throw away whatever we've got, and start over with these."""
+    round_trips["replace_all"] += 1
+    cache = _cache()
+
+    if isinstance(cache, RedisCache):
+        client, key = _redis_client_and_key(cache)
+        pipeline = client.pipeline(transaction=True)
+        pipeline.delete(key)
+        if due_by_hand_pk:
+            pipeline.zadd(key, {str(pk): due for pk, due in due_by_hand_pk.items()})
+        pipeline.execute()
+    else:
+        cache.set(_KEY, dict(due_by_hand_pk), timeout=None)
@@ -0,0 +1,78 @@
+"""Sets of cards as 52-bit integers.
+
+Bit n stands for `xscript_codec.CARDS[n]`, so each suit occupies 13 consecutive bits (clubs lowest, spades highest), with
+the deuce at the bottom.  Intersections, differences and "does this hand have any hearts" are then single integer
+operations, rather than loops over sets of Card objects.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Iterable
+
+import more_itertools
+
+from bridge.card import Card as libCard
+
+from . import xscript_codec
+
+CardSet = int
+
+EMPTY: CardSet = 0
+
+# Keyed by `Suit.name().lower()`, which is how AllFourSuitHoldings names its fields.
+SUIT_INDEX_BY_NAME = {"clubs": 0, "diamonds": 1, "hearts": 2, "spades": 3}
+
+_ONE_SUIT = (1 << 13) - 1
+
+
+@functools.cache
+def _card_objects() -> list[libCard]:
+    return [libCard.deserialize(c) for c in xscript_codec.CARDS]
+
+
+def bit(card: libCard) -> CardSet:
+    return 1 << xscript_codec.card_code(card.serialize())
+
+
+def from_cards(cards: Iterable[libCard]) -> CardSet:
+    rv = EMPTY
+    for c in cards:
+        rv |= bit(c)
+    return rv
+
+
+@functools.lru_cache(maxsize=1024)
+def from_card_string(card_string: str) -> CardSet:
+    """Parses strings like those in Board.north_cards.  Boards never change, so we remember the answers."""
+    return from_cards(libCard.deserialize(c) for c in more_itertools.sliced(card_string, 2))
+
+
+def suit_mask(suit_index: int) -> CardSet:
+    return _ONE_SUIT << (13 * suit_index)
+
+
+def suit_index(card: libCard) -> int:
+    return xscript_codec.card_code(card.serialize()) // 13
+
+
+def cards(card_set: CardSet) -> list[libCard]:
+    """The cards in `card_set`, lowest first."""
+    objects = _card_objects()
+    rv = []
+    while card_set:
+        lowest = card_set & -card_set
+        rv.append(objects[lowest.bit_length() - 1])
+        card_set ^= lowest
+    return rv
+
+
+def legal(holding: CardSet, *, led_suit: int | None) -> CardSet:
+    """Which cards in `holding` may be played to a trick whose first card was of `led_suit` (None if we're leading)."""
+    if led_suit is None:
+        return holding
+
+    if following := holding & suit_mask(led_suit):
+        return following
+
+    return holding
@@ -0,0 +1,120 @@
+"""Cached answers to "may this player read this event channel?"
+
+`MyChannelManager.can_read_channel` runs every time a browser connects, or reconnects, to an event stream, and for a
+table's channel the answer costs a few database queries.  So we remember the answers here, in the shared cache, where
+every worker can see them.
+
+Each player's answers live in one redis hash, keyed by channel, so that forgetting them all is a single DEL.  We forget
+them whenever the player is seated or unseated, since that's what changes which tables they may watch; and when a hand
+is created, we record right away that its players may read its table channel.
+
+We also remember which channels are closed for good -- those of hands that are complete or abandoned -- so that
+app.views.events can turn away browsers that reconnect to them without looking anything up.
+
+Answers that `can_read_channel` works out for itself are only stored if there isn't already one (HSETNX), so that an
+answer computed from a since-superseded view of the database can't overwrite the one we recorded at seating time.
+"""
+
+from __future__ import annotations
+
+import collections
+from collections.abc import Iterable
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+from .types import PK
+
+# Even if we somehow miss an invalidation, nothing stays wrong for longer than this.
+TIMEOUT_SECONDS = 24 * 60 * 60
+
+# A finished hand's channel stays closed forever, but after a week, nobody is still trying to listen to it.
+CLOSED_TIMEOUT_SECONDS = 7 * 24 * 60 * 60
+
+_ALLOWED = b"1"
+_DENIED = b"0"
+
+# How many times we've talked to the cache backend, by operation.  For tests.
+round_trips: collections.Counter[str] = collections.Counter()
+
+
+def _key(player_pk: PK) -> str:
+    return f"channel-acl:{player_pk}"
+
+
+def _cache():
+    # Not `django.core.cache.cache`: that's a proxy, and we need to know what kind of backend is behind it.
+    return caches["default"]
+
+
+def _redis_client_and_key(cache: RedisCache, player_pk: PK):
+    key = cache.make_and_validate_key(_key(player_pk))
+    return cache._cache.get_client(key, write=True), key
+
+
+def get(*, player_pk: PK, channel: str) -> bool | None:
+    """The remembered answer, or None if we don't have one."""
+    round_trips["get"] += 1
+    cache = _cache()
+
+    if isinstance(cache, RedisCache):
+        client, key = _redis_client_and_key(cache, player_pk)
+        value = client.hget(key, channel)
+    else:
+        value = (cache.get(_key(player_pk)) or {}).get(channel)
+
+    if value is None:
+        return None
+    return value == _ALLOWED
+
+
+def remember(*, player_pk: PK, channel: str, allowed: bool, overwrite: bool = False) -> None:
+    round_trips["remember"] += 1
+    cache = _cache()
+    value = _ALLOWED if allowed else _DENIED
+
+    if isinstance(cache, RedisCache):
+        client, key = _redis_client_and_key(cache, player_pk)
+        pipeline = client.pipeline(transaction=False)
+        if overwrite:
+            pipeline.hset(key, channel, value)
+        else:
+            pipeline.hsetnx(key, channel, value)
+        pipeline.expire(key, TIMEOUT_SECONDS)
+        pipeline.execute()
+    else:
+        answers = cache.get(_key(player_pk)) or {}
+        if overwrite or channel not in answers:
+            answers[channel] = value
+            cache.set(_key(player_pk), answers, timeout=TIMEOUT_SECONDS)
+
+
+def forget(player_pks: Iterable[PK]) -> None:
+    """Discard everything we remember about these players, e.g. because they've just been seated or unseated."""
+    keys = [_key(pk) for pk in player_pks]
+    if not keys:
+        return
+
+    round_trips["forget"] += 1
+    _cache().delete_many(keys)
+
+
+def _closed_key(channel: str) -> str:
+    return f"channel-closed:{channel}"
+
+
+def close(*, channel: str, reason: str) -> None:
+    """Note that nothing more will ever be sent on this channel."""
+    round_trips["close"] += 1
+    _cache().set(_closed_key(channel), reason, timeout=CLOSED_TIMEOUT_SECONDS)
+
+
+def closed(channels: Iterable[str]) -> dict[str, str]:
+    """Those of these channels that have been closed, and why."""
+    channels = list(channels)
+    if not channels:
+        return {}
+
+    round_trips["closed"] += 1
+    reasons = _cache().get_many([_closed_key(c) for c in channels])
+    return {c: reasons[_closed_key(c)] for c in channels if _closed_key(c) in reasons}
@@ -10,10 +10,11 @@ from collections.abc import Generator, Iterable
 from typing import TYPE_CHECKING, Any
 
 import more_itertools
+from django.conf import settings
 from django.contrib import admin
-from django.core.cache import cache
 from django.db import Error, models, transaction
-from django.db.models import Q
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat
 from django.db.models.query import QuerySet
 from django.http import Http404
 from django.urls import reverse
@@ -24,8 +25,9 @@ from django_eventstream import send_event  # type: ignore [import-untyped]
 from django_extensions.db.models import TimeStampedModel  # type: ignore [import-untyped]
 from django_prometheus.models import ExportModelOperationsMixin  # type: ignore [import-untyped]
 
+from app import sse_fanout
 from app.sse_channels import SSEChannels
-from app.sse_events import create_player_hand_event, create_table_event
+from app.sse_events import HAND_OVER, create_player_hand_event, create_table_event
 from bridge.auction import Auction, AuctionException
 from bridge.card import Card as libCard
 from bridge.card import Suit as libSuit
@@ -39,7 +41,8 @@ from bridge.table import Table as libTable
 from bridge.xscript import CBS, HandTranscript
 
 from ..utils import movements
-from .common import attribute_names
+from . import bot_memo, bot_queue, cardset, channel_acl, xscript_codec, xscript_store
+from .common import SEAT_CHOICES, attribute_names
 from .player import Player
 from .tournament import Tournament
 from .types import PK, PK_from_str
@@ -83,6 +86,64 @@ class TrickTuple:
 TrickTuples = list[TrickTuple]
 
 
+@dataclasses.dataclass(frozen=True)
+class HandState:
+    """Everything about a hand that we'd otherwise keep re-deriving from its transcript.
+
+    Computed at most once per (hand, num_actions); see Hand.state.
+    """
+
+    auction_status: Any
+    declarer: libPlayer | None
+    dummy: libPlayer | None
+    # These ignore abandonment; the Hand properties of the same name take that into account.
+    next_seat_to_call: Seat | None
+    next_seat_to_play: Seat | None
+    annotated_plays: TrickTuples
+    tricks: list[TrickTuples]
+    tricks_won_by_partnership: dict[str, int]
+    final_score: Any
+
+    @property
+    def num_plays(self) -> int:
+        return len(self.annotated_plays)
+
+    @classmethod
+    def from_xscript(cls, xscript: HandTranscript) -> HandState:
+        auction = xscript.auction
+
+        next_seat_to_call = None
+        if auction.status is Auction.Incomplete:
+            libAllowed = auction.allowed_caller()
+            assert libAllowed is not None
+            next_seat_to_call = libAllowed.seat
+
+        annotated_plays = [
+            TrickTuple(seat=p.seat, card=p.card, winner=p.wins_the_trick)
+            for t in xscript.tricks
+            for p in t.plays
+        ]
+
+        cc = collections.Counter([p.seat.value for p in annotated_plays if p.winner])
+
+        return cls(
+            auction_status=auction.status,
+            declarer=auction.declarer if auction.found_contract else None,
+            dummy=auction.dummy if auction.found_contract else None,
+            next_seat_to_call=next_seat_to_call,
+            next_seat_to_play=xscript.next_seat_to_play() if auction.found_contract else None,
+            annotated_plays=annotated_plays,
+            tricks=list(more_itertools.chunked(annotated_plays, 4)),
+            tricks_won_by_partnership={"N/S": cc["S"] + cc["N"], "E/W": cc["E"] + cc["W"]},
+            # Scoring isn't free, and there's nothing to score until the hand is over.
+            final_score=(
+                xscript.final_score()
+                if auction.status is Auction.PassedOut or len(annotated_plays) == 52
+                else None
+            ),
+        )
+
+
 @dataclasses.dataclass
 class SuitHolding:
     """Given the state of the play, can one of these cards be played?  "Yes" if the xscript says we're the current
@@ -163,7 +224,10 @@ def send_timestamped_event(
         when = time.time()
 
     logger.debug(f"Sending {summarize(data)=} to {channel=}")
-    send_event(channel=channel, event_type="message", data=data | {"time": when})
+    data = data | {"time": when}
+
+    with sse_fanout.collect(send=send_event) as fanout:
+        fanout.add(channel=channel, data=data)
 
 
 def enrich(qs: QuerySet) -> QuerySet:
@@ -178,6 +242,27 @@ class HandManager(models.Manager):
         for instance in self.all():
             instance._update_redundant_fields()
 
+    def incomplete(self) -> QuerySet:
+        return self.filter(is_complete=False, abandoned_because__isnull=True)
+
+    def bot_is_due_to_act_on(self) -> QuerySet:
+        """Hands in which it's a bot's turn to call or play."""
+        return self.incomplete().filter(next_actor_is_bot=True).order_by("last_action_time")
+
+    def waiting_on(self, player: Player) -> QuerySet:
+        """Hands in which it's this player's turn to call or play (or to play from dummy)."""
+        return self.incomplete().filter(next_actor_player=player).order_by("last_action_time")
+
+    def fill_in_missing_next_actors(self) -> int:
+        """Set the next_actor_* fields on hands from before we had them.  Returns how many we did."""
+        rv = 0
+        for h in self.prepop().filter(
+            is_complete=False, abandoned_because__isnull=True, next_actor_seat__isnull=True
+        ):
+            h._update_next_actor()
+            rv += 1
+        return rv
+
     def prepop(self) -> QuerySet:
         return enrich(self)
 
@@ -237,6 +322,7 @@ class HandManager(models.Manager):
 
             return None
 
+    @xscript_store.request_scope()
     def create(self, *args, **kwargs) -> Hand:
         board = kwargs.get("board")
         assert board is not None
@@ -264,6 +350,16 @@ class HandManager(models.Manager):
             p.current_hand = rv
             p.save()
 
+        if rv._update_next_actor():
+            rv.update_bot_queue()
+
+        # Being seated here may let them watch other tables, too; but for sure it lets them watch this one.
+        channel_acl.forget(p.pk for p in players)
+        for p in players:
+            channel_acl.remember(
+                player_pk=p.pk, channel=rv.event_table_html_channel, allowed=True, overwrite=True
+            )
+
         logger.debug(
             "New hand: %s, played by %s",
             rv,
@@ -321,6 +417,40 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
 
     last_action_time = models.DateTimeField(default=timezone.now)
 
+    action_log = models.TextField(
+        default="",
+        blank=True,
+        db_comment="Every call and play, one character apiece (see xscript_codec); enough to rebuild the transcript",
+    )  # type: ignore
+
+    num_actions = models.PositiveSmallIntegerField(
+        default=0,
+        db_comment="How many calls plus plays have been made; doubles as the version of the cached transcript",
+    )  # type: ignore
+
+    # These three are redundant, too: they say whose turn it is, which otherwise means replaying the transcript.  That
+    # way, "which hands is a bot due to act on" and "which hands are waiting on this player" are just index scans.
+    # _update_next_actor keeps them current.
+    next_actor_seat = models.CharField(
+        max_length=1,
+        choices=SEAT_CHOICES,
+        null=True,
+        db_comment="The seat that gets to call or play next; null once the hand is complete or abandoned",
+    )  # type: ignore
+
+    next_actor_player = models.ForeignKey["Player"](
+        "Player",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+        db_comment="Who controls next_actor_seat -- declarer, if it's dummy's turn to play",
+    )
+
+    next_actor_is_bot = models.BooleanField(
+        default=False,
+        db_comment="Whether next_actor_player lets the bot call and play for them",
+    )  # type: ignore
+
     def _clear_bot_flags(self) -> None:
         p: Player
         for p in (getattr(self, direction) for direction in attribute_names):
@@ -329,7 +459,167 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
                 p.allow_bot_to_play_for_me = False
                 p.save(update_fields=["allow_bot_to_play_for_me"])
 
+    def _update_next_actor(self) -> bool:
+        """Work out next_actor_seat, next_actor_player and next_actor_is_bot from the transcript, and save them.
+
+        We run after the call or play has committed, so someone else may have acted on the hand since; if so, our idea
+        of whose turn it is is stale, and we leave these fields to them.  Returns whether we saved them -- and so
+        whether the caller should go on to update_bot_queue.
+        """
+        seat = None
+        if not (self.is_complete or self.is_abandoned):
+            seat = self.next_seat_to_call or self.next_seat_to_play
+
+        next_actor_player_id = None
+        next_actor_is_bot = False
+
+        if seat is not None:
+            player = self.player_who_controls_seat(seat, right_this_second=True)
+            next_actor_player_id = player.pk
+            # Not the flag on our cached Player: it's deliberately not saved along with last_action, so it may be stale.
+            next_actor_is_bot = (
+                Player.objects.filter(pk=player.pk)
+                .values_list("allow_bot_to_play_for_me", flat=True)
+                .get()
+            )
+
+        if not Hand.objects.filter(pk=self.pk, num_actions=self.num_actions).update(
+            next_actor_seat=None if seat is None else seat.value,
+            next_actor_player_id=next_actor_player_id,
+            next_actor_is_bot=next_actor_is_bot,
+        ):
+            return False
+
+        self.next_actor_seat = None if seat is None else seat.value
+        self.next_actor_player_id = next_actor_player_id
+        self.next_actor_is_bot = next_actor_is_bot
+        return True
+
+    def bot_due_time(self) -> float | None:
+        """When (in seconds since the epoch) a bot should make the next call or play, or None if that's not up to a bot."""
+        if self.is_complete or self.is_abandoned or not self.next_actor_is_bot:
+            return None
+
+        if self._may_be_played_out_all_at_once():
+            # Nobody's watching; don't keep them waiting.
+            return self.last_action_time.timestamp()
+
+        return self.last_action_time.timestamp() + self.board.tournament.tempo_seconds
+
+    def update_bot_queue(self) -> None:
+        """Tell the bot whether, and when, it's due to act on this hand; see bot_queue."""
+        hand_pk = self.pk
+        due = self.bot_due_time()
+
+        # Not until we've committed, lest the bot look at this hand before it can see what we just did.
+        if due is None:
+            transaction.on_commit(lambda: bot_queue.unschedule(hand_pk))
+        else:
+            transaction.on_commit(lambda: bot_queue.schedule(hand_pk=hand_pk, due=due))
+
+    def _may_be_played_out_all_at_once(self) -> bool:
+        if not self.board.tournament.turbo_bot_hands:
+            return False
+
+        # Fresh from the db, for the same reason as in _update_next_actor.
+        return not Player.objects.filter(
+            pk__in=self.player_pks(), allow_bot_to_play_for_me=False
+        ).exists()
+
+    @xscript_store.request_scope()
+    def play_out_if_all_bots(self) -> bool:
+        """If our tournament has turbo_bot_hands set, and all four players are bots, play the rest of the hand at once.
+
+        Rather than a call or play at a time, each in its own transaction, with its own events for the browsers, we
+        work out all the bot's decisions, then save them all in one transaction and send just the end-of-hand events.
+        Returns whether we did that; if not (say, because somebody else acted in the meantime), the caller should carry
+        on a call or play at a time.
+        """
+        if self.is_complete or self.is_abandoned or not self._may_be_played_out_all_at_once():
+            return False
+
+        self._check_for_expired_tournament()
+
+        entry = self._get_xscript_entry()
+
+        # Our own copy, so as not to disturb the cached one until we've saved.
+        x = self._empty_xscript()
+        self._apply_codes(x, calls=entry.calls, plays=entry.plays)
+        action_log = self.action_log
+
+        new_calls: list[libCall] = []
+        new_cards: list[libCard] = []
+        while x.final_score() is None:
+            if x.auction.status is Auction.Incomplete:
+                call = bot_memo.call_for_xscript(x, action_log=action_log, dealer=self.board.dealer)
+                x.add_call(call)
+                new_calls.append(call)
+                action_log += xscript_codec.to_action_log(
+                    calls=xscript_codec.encode_calls([call.serialize()]), plays=b""
+                )
+            else:
+                card = bot_memo.play_for_xscript(x, action_log=action_log, dealer=self.board.dealer)
+                x.add_card(card)
+                new_cards.append(card)
+                action_log += xscript_codec.to_action_log(
+                    calls=b"", plays=xscript_codec.encode_plays([card.serialize()])
+                )
+
+        with transaction.atomic():
+            self._lock_for_action()
+            if self.num_actions != entry.version:
+                logger.info(
+                    "%s", f"{self}: somebody acted while we were working out the rest of the hand"
+                )
+                return False
+
+            Call.objects.bulk_create(
+                Call(hand=self, serialized=c.serialize(), explanation=c.explanation)
+                for c in new_calls
+            )
+            Play.objects.bulk_create(Play(hand=self, serialized=c.serialize()) for c in new_cards)
+
+            self._record_action(
+                previous=entry,
+                current=dataclasses.replace(
+                    entry,
+                    calls=entry.calls
+                    + xscript_codec.encode_calls(c.serialize() for c in new_calls),
+                    plays=entry.plays
+                    + xscript_codec.encode_plays(c.serialize() for c in new_cards),
+                    xscript=x,
+                    state=None,
+                ),
+            )
+
+            now = timezone.now()
+            self.is_complete = True
+            self.last_action_time = now
+            self.save()
+            for p in self.players():
+                p.last_action = (now, "played" if new_cards else "called")  # type: ignore [assignment]
+                p.save(update_fields=["last_action"])
+
+            logger.debug(
+                "%s: the bots made %d calls and %d plays all at once",
+                self,
+                len(new_calls),
+                len(new_cards),
+            )
+
+            with sse_fanout.collect(send=send_event):
+                if x.auction.status is Auction.PassedOut:
+                    self.do_end_of_hand_stuff(final_score_text="Passed Out")
+                else:
+                    self.do_end_of_hand_stuff(final_score_text=str(x.final_score()))
+
+            if self._update_next_actor():
+                self.update_bot_queue()
+
+        return True
+
     def _update_redundant_fields(self):
+        self._rebuild_action_log()
         x = self.get_xscript()
         self.is_complete = (x.auction.status is Auction.PassedOut) or x.num_plays == 52
         self.save(update_fields=["is_complete"])
@@ -412,7 +702,9 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
         if now is None:
             now = time.time()
 
-        p = Player.objects.get(pk=player_pk)
+        p = next((p for p in self.players() if p.pk == player_pk), None)
+        if p is None:
+            p = Player.objects.get(pk=player_pk)
         player_channel = p.event_HTML_hand_channel
 
         send_timestamped_event(channel=player_channel, data=data | {"hand_pk": self.pk}, when=now)
@@ -455,53 +747,144 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
             assert_type(p, libPlayer)
         return libTable(players=players)
 
-    def _cache_key(self) -> str:
-        return f"hand:{self.pk}"
+    def _empty_xscript(self) -> HandTranscript:
+        lib_table = self.lib_table_with_cards_as_dealt
+        dealt_cards_by_seat: CBS = {
+            Seat(direction): self.board.cards_for_direction_letter(direction)
+            for direction in "NESW"
+        }
 
-    def _cache_set(self, value: HandTranscript) -> None:
-        assert_type(value, HandTranscript)
-        cache.set(self._cache_key(), value)
+        return HandTranscript(
+            table=lib_table,
+            auction=Auction(table=lib_table, dealer=Seat(self.board.dealer)),
+            ns_vuln=self.board.ns_vulnerable,
+            ew_vuln=self.board.ew_vulnerable,
+            dealt_cards_by_seat=dealt_cards_by_seat,
+        )
 
-    def _cache_get(self) -> HandTranscript | None:
-        rv = cache.get(self._cache_key())
-        assert_type(rv, HandTranscript | None)
-        return rv
+    @staticmethod
+    def _apply_codes(xscript: HandTranscript, *, calls: bytes, plays: bytes) -> None:
+        for c in xscript_codec.decode_calls(calls):
+            xscript.add_call(libBid.deserialize(c))
+        for c in xscript_codec.decode_plays(plays):
+            xscript.add_card(libCard.deserialize(c))
 
-    def get_xscript(self) -> HandTranscript:
-        def calls() -> Iterator[tuple[libPlayer, libCall]]:
-            for seat, call in self.annotated_calls:
-                player = self.libPlayers_by_libSeat[seat]
-                yield (player, call.libraryThing)
-
-        if (_xscript := self._cache_get()) is None:
-            lib_table = self.lib_table_with_cards_as_dealt
-            auction = Auction(table=lib_table, dealer=Seat(self.board.dealer))
-            dealt_cards_by_seat: CBS = {
-                Seat(direction): self.board.cards_for_direction_letter(direction)
-                for direction in "NESW"
-            }
-
-            for player, call in calls():
-                auction.append_located_call(player=player, call=call)
-
-            _xscript = HandTranscript(
-                table=lib_table,
-                auction=auction,
-                ns_vuln=self.board.ns_vulnerable,
-                ew_vuln=self.board.ew_vulnerable,
-                dealt_cards_by_seat=dealt_cards_by_seat,
+    def _xscript_from_entry(self, entry: xscript_store.Entry) -> HandTranscript:
+        if entry.xscript is None:
+            _xscript = self._empty_xscript()
+            self._apply_codes(_xscript, calls=entry.calls, plays=entry.plays)
+            entry.xscript = _xscript
+
+        return entry.xscript
+
+    def _entry_from_action_log(self) -> xscript_store.Entry:
+        calls, plays = xscript_codec.from_action_log(self.action_log)
+        return xscript_store.Entry(board_pk=self.board_id, calls=calls, plays=plays)
+
+    def _get_xscript_entry(self) -> xscript_store.Entry:
+        entry = xscript_store.get(self.pk, version=self.num_actions)
+
+        if entry is not None and entry.version > self.num_actions:
+            # Either someone acted since we were loaded, or the cache is ahead of the database because a transaction
+            # rolled back after updating it.  Ask the db which.
+            self.refresh_from_db(fields=["num_actions", "action_log"])
+
+        if (
+            entry is not None
+            and entry.board_pk == self.board_id
+            and entry.version == self.num_actions
+        ):
+            return entry
+
+        fresh = self._entry_from_action_log()
+
+        if (
+            entry is not None
+            and entry.board_pk == self.board_id
+            and entry.xscript is not None
+            and fresh.calls.startswith(entry.calls)
+            and fresh.plays.startswith(entry.plays)
+        ):
+            # We've already got a transcript that's merely behind; catch it up, rather than starting from scratch.
+            self._apply_codes(
+                entry.xscript,
+                calls=fresh.calls[len(entry.calls) :],
+                plays=fresh.plays[len(entry.plays) :],
             )
+            fresh.xscript = entry.xscript
+            entry.state = None
+
+        xscript_store.compare_and_set(
+            self.pk,
+            expected_version=None if entry is None else entry.version,
+            entry=fresh,
+        )
 
-            for play in self.plays:
-                _xscript.add_card(libCard.deserialize(play.serialized))
+        return fresh
 
-            self._cache_set(_xscript)
+    def get_xscript(self) -> HandTranscript:
+        return self._xscript_from_entry(self._get_xscript_entry())
+
+    @property
+    def state(self) -> HandState:
+        entry = self._get_xscript_entry()
+        if entry.state is None:
+            entry.state = HandState.from_xscript(self._xscript_from_entry(entry))
+        return entry.state
 
-        return _xscript
+    def _lock_for_action(self) -> None:
+        """Serialize writers: whoever holds this row lock is the only one who may add a call or play to this hand.
+
+        Must be called inside a transaction.
+        """
+        self.num_actions, self.action_log = (
+            Hand.objects.select_for_update()
+            .values_list("num_actions", "action_log")
+            .get(pk=self.pk)
+        )
+
+    def _record_action(
+        self, *, previous: xscript_store.Entry, current: xscript_store.Entry
+    ) -> None:
+        """Append the action that turned `previous` into `current` to our action log, and cache `current`."""
+        new_actions = xscript_codec.to_action_log(
+            calls=current.calls[len(previous.calls) :],
+            plays=current.plays[len(previous.plays) :],
+        )
+
+        Hand.objects.filter(pk=self.pk).update(
+            num_actions=current.version,
+            action_log=Concat(F("action_log"), Value(new_actions)),
+        )
+        self.num_actions = current.version
+        self.action_log += new_actions
+
+        if not xscript_store.compare_and_set(
+            self.pk,
+            expected_version=previous.version,
+            entry=current,
+        ):
+            # Somebody else's idea of the transcript got in there; let the next reader sort it out from the db.
+            xscript_store.delete(self.pk)
+
+    def _rebuild_action_log(self) -> None:
+        """Recompute action_log and num_actions from our Call and Play rows, which remain the audit log."""
+        self.action_log = xscript_codec.to_action_log(
+            calls=xscript_codec.encode_calls(c.libraryThing.serialize() for c in self.calls),
+            plays=xscript_codec.encode_plays(
+                libCard.deserialize(p.serialized).serialize() for p in self.plays
+            ),
+        )
+        self.num_actions = len(self.action_log)
+        Hand.objects.filter(pk=self.pk).update(
+            num_actions=self.num_actions, action_log=self.action_log
+        )
+        xscript_store.delete(self.pk)
 
     def serializable_xscript(self) -> Any:
         return self.get_xscript().serializable()
 
+    @xscript_store.request_scope()
     def add_call(self, *, call: libCall) -> None:
         assert_type(call, libCall)
 
@@ -514,6 +897,8 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
         player = self.player_who_may_call
         if player is None:
             raise AuctionError("Nobody may call now")
+        seat_that_just_called = self.next_seat_to_call
+        assert seat_that_just_called is not None
 
         try:
             the_call = self.call_set.create(
@@ -536,75 +921,187 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
             self.last_action_time,
         )
 
-        if dummy_player := self.model_dummy:
-            # Notify dummy player's checkbox to update (becomes disabled)
-            from types import SimpleNamespace
+        # Everything below just tells the browsers and bots what happened; it all gets published in one go at the end.
+        with sse_fanout.collect(send=send_event) as fanout:
+            if dummy_player := self.model_dummy:
+                # Notify dummy player's checkbox to update (becomes disabled)
+                from types import SimpleNamespace
 
-            from django.template.loader import render_to_string
+                from django.template.loader import render_to_string
 
-            html = render_to_string(
-                "bot-checkbox.html",
-                {"user": SimpleNamespace(player=dummy_player), "error_message": None},
-            )
-            send_event(
-                channel=dummy_player.bot_checkbox_channel,
-                event_type="message",
-                data=html,
-                json_encode=False,
+                html = render_to_string(
+                    "bot-checkbox.html",
+                    {"user": SimpleNamespace(player=dummy_player), "error_message": None},
+                )
+                fanout.add(channel=dummy_player.bot_checkbox_channel, data=html, json_encode=False)
+
+            now = time.time()
+
+            if settings.SSE_DELTA_EVENTS:
+                # The last cell of the auction display is the call that was just made.
+                *_, cell_html = (c for c in self.auction.fancy_HTML_display()[-1] if c is not None)
+                self._send_delta_events(
+                    now=now,
+                    new_call={
+                        "seat": seat_that_just_called.name,
+                        "serialized": call.serialize(),
+                        "html": str(cell_html),
+                        "explanation": call.explanation,
+                    },
+                )
+            else:
+                self._send_call_HTML(fanout=fanout, now=now)
+
+            self.send_JSON_to_players(
+                data={
+                    "hand_pk": self.pk,
+                    "new-call": {"serialized": call.serialize(), "explanation": call.explanation},
+                    "tempo_seconds": self.board.tournament.tempo_seconds,
+                }
             )
 
-        now = time.time()
+            if self.declarer:  # the auction just settled
+                contract = self.auction.status
+                assert isinstance(contract, libContract)
+                assert contract.declarer is not None
+
+                data = {
+                    "contract_text": str(contract),
+                    "contract": {
+                        "opening_leader": contract.declarer.seat.lho().value,
+                    },
+                }
+
+                self.send_JSON_to_players(data=data)
+
+                # Observers' interactive hand pages need this to know that it's time to reload, in order to show the
+                # "play" slides.  The players' pages swap them in instead.
+                send_timestamped_event(
+                    channel=self.event_table_html_channel,
+                    data=data,  # Send the full data dict including both contract_text and contract
+                )
+                self._send_play_phase_HTML()
+
+            elif self.state.final_score is not None:
+                self.do_end_of_hand_stuff(final_score_text="Passed Out")
+
+        if self._update_next_actor():
+            self.update_bot_queue()
+
+    def _send_call_HTML(self, *, fanout: sse_fanout.Fanout, now: float) -> None:
+        from app.views.hand import (
+            _bidding_box_HTML_for_seated_player,
+            _player_may_call,
+            auction_history_HTML_for_table,
+        )
 
         for p in self.players():
+            may_call = _player_may_call(hand=self, player=p)
             send_timestamped_event(
                 channel=p.event_HTML_hand_channel,
                 data=create_player_hand_event(
-                    bidding_box_html=self._get_current_bidding_box_html_for_player(p),
+                    bidding_box_html=fanout.render_once(
+                        ("bidding-box", self.pk, may_call),
+                        lambda may_call=may_call: _bidding_box_HTML_for_seated_player(
+                            hand=self, may_call=may_call
+                        ),
+                    ),
                     hand_pk=self.pk,
-                    show_hint_button=p.is_my_turn_to_interact(),
+                    show_hint_button=self._is_players_turn(p),
                 ),
                 when=now,
             )
 
-        self.send_JSON_to_players(
-            data={
-                "hand_pk": self.pk,
-                "new-call": {"serialized": call.serialize(), "explanation": call.explanation},
-                "tempo_seconds": self.board.tournament.tempo_seconds,
-            }
-        )
-
-        from app.views.hand import auction_history_HTML_for_table
-
         send_timestamped_event(
             channel=self.event_table_html_channel,
             data=create_table_event(auction_history_html=auction_history_HTML_for_table(hand=self)),
             when=now,
         )
 
-        if self.declarer:  # the auction just settled
-            contract = self.auction.status
-            assert isinstance(contract, libContract)
-            assert contract.declarer is not None
+    def _send_play_phase_HTML(self) -> None:
+        """Send each player the "play" slides, now that the auction has settled.
+
+        Their browsers swap these in where the "auction" slides were, rather than all four of them reloading the whole
+        page at once.
+        """
+        from app.views.hand import _play_phase_HTML_for_player
+
+        now = time.time()
+        for p in self.players():
+            send_timestamped_event(
+                channel=p.event_HTML_hand_channel,
+                data=create_player_hand_event(
+                    hand_pk=self.pk,
+                    phase_html=_play_phase_HTML_for_player(hand=self, player=p),
+                ),
+                when=now,
+            )
+
+    def _send_review_HTML(self) -> None:
+        """Send each player the review of this hand, now that it's over, along with a link to their next hand (if any).
 
-            data = {
-                "contract_text": str(contract),
-                "contract": {
-                    "opening_leader": contract.declarer.seat.lho().value,
-                },
-            }
+        As with the "play" slides, their browsers swap this in rather than reloading; the review is the same for
+        everyone, so we only render it once.
+        """
+        from app.views.hand import _review_HTML_for_hand
 
-            self.send_JSON_to_players(data=data)
+        review_html = _review_HTML_for_hand(self)
+        now = time.time()
 
-            # The interactive hand page needs this to know that it's time to reload, in order to show the "play" slides.
+        # Fresh from the database, since we may just have moved them to their next hand.
+        for p in Player.objects.filter(pk__in=self.player_pks()).select_related("current_hand"):
             send_timestamped_event(
-                channel=self.event_table_html_channel,
-                data=data,  # Send the full data dict including both contract_text and contract
+                channel=p.event_HTML_hand_channel,
+                data=create_player_hand_event(
+                    hand_pk=self.pk,
+                    review_html=review_html,
+                    next_hand_html=(
+                        None if p.current_hand is None else str(p.current_hand.as_link())
+                    ),
+                ),
+                when=now,
             )
 
-        elif self.get_xscript().final_score() is not None:
-            self.do_end_of_hand_stuff(final_score_text="Passed Out")
+    def _send_delta_events(self, *, now: float, **change: Any) -> None:
+        """Tell the browsers just what changed, rather than sending them freshly-rendered HTML.
+
+        bridge-game.js applies the change to the page itself.  Everyone at the table learns what was just called or
+        played, whose turn it is now, and what they may legally do; each player additionally learns whether they get to
+        do it.
+        """
+        next_seat = self.next_seat_to_call or self.next_seat_to_play
+
+        legal: list[str] = []
+        if self.next_seat_to_call is not None:
+            legal = [c.serialize() for c in self.auction.legal_calls()]
+        elif self.next_seat_to_play is not None:
+            legal = [c.serialize() for c in cardset.cards(self._legal_card_set())]
 
+        send_timestamped_event(
+            channel=self.event_table_html_channel,
+            data=create_table_event(
+                num_actions=self.num_actions,
+                next_seat=None if next_seat is None else next_seat.name,
+                legal=legal,
+                **change,
+            ),
+            when=now,
+        )
+
+        for p in self.players():
+            turn = self._is_players_turn(p)
+            send_timestamped_event(
+                channel=p.event_HTML_hand_channel,
+                data=create_player_hand_event(
+                    hand_pk=self.pk,
+                    num_actions=self.num_actions,
+                    may_act=turn or (self.open_access and next_seat is not None),
+                    show_hint_button=turn,
+                ),
+                when=now,
+            )
+
+    @xscript_store.request_scope()
     def add_play_from_model_player(self, *, player: Player, card: libCard) -> Play:
         assert_type(player, Player)
         assert_type(card, libCard)
@@ -645,35 +1142,65 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
             card,
         )
 
-        self.send_JSON_to_players(
-            data={
-                "new-play": {
-                    "hand_pk": self.pk,
-                    "serialized": card.serialize(),
-                },
-                "tempo_seconds": self.board.tournament.tempo_seconds,
-            }
-        )
+        with sse_fanout.collect(send=send_event):
+            self.send_JSON_to_players(
+                data={
+                    "new-play": {
+                        "hand_pk": self.pk,
+                        "serialized": card.serialize(),
+                    },
+                    "tempo_seconds": self.board.tournament.tempo_seconds,
+                }
+            )
 
-        send_timestamped_event(
-            channel=self.event_table_html_channel,
-            data=create_table_event(
-                trick_counts_string=self.trick_counts_string(),
-                trick_html=self._get_current_trick_html(),
-            ),
-        )
+            if (final_score := self.state.final_score) is not None:
+                send_timestamped_event(
+                    channel=self.event_table_html_channel,
+                    data=create_table_event(
+                        trick_counts_string=self.trick_counts_string(),
+                        trick_html=self._get_current_trick_html(),
+                    ),
+                )
+                self.do_end_of_hand_stuff(final_score_text=str(final_score))
+            elif settings.SSE_DELTA_EVENTS:
+                self._send_delta_events(
+                    now=time.time(),
+                    trick_counts_string=self.trick_counts_string(),
+                    new_play=self._new_play_delta(),
+                )
+                if self.state.num_plays == 1:
+                    # The opening lead exposes dummy, whose cards aren't on anyone's page yet.
+                    self.send_HTML_update_to_appropriate_channels(last_seat=seat_that_just_played)
+            else:
+                send_timestamped_event(
+                    channel=self.event_table_html_channel,
+                    data=create_table_event(
+                        trick_counts_string=self.trick_counts_string(),
+                        trick_html=self._get_current_trick_html(),
+                    ),
+                )
+                self.send_HTML_update_to_appropriate_channels(last_seat=seat_that_just_played)
 
-        if (final_score := self.get_xscript().final_score()) is not None:
-            self.do_end_of_hand_stuff(final_score_text=str(final_score))
-        else:
-            self.send_HTML_update_to_appropriate_channels(last_seat=seat_that_just_played)
+        if self._update_next_actor():
+            self.update_bot_queue()
 
         return rv
 
-    def _get_current_bidding_box_html_for_player(self, p: Player) -> str:
-        from app.views.hand import _bidding_box_HTML_for_hand_for_player
+    def _new_play_delta(self) -> dict[str, Any]:
+        state = self.state
+        trick = state.tricks[-1]
+        tt = trick[-1]
+        winner = next((t.seat.name for t in trick if t.winner), None)
 
-        return _bidding_box_HTML_for_hand_for_player(self, p)
+        return {
+            "seat": tt.seat.name,
+            "serialized": tt.card.serialize(),
+            "text": str(tt.card),
+            "color": tt.card.color,
+            "suit": tt.card.suit.name().lower(),
+            "leads_trick": len(trick) == 1,
+            "trick_winner": winner if len(trick) == 4 else None,
+        }
 
     def _get_current_trick_html(self) -> str:
         from app.views.hand import _three_by_three_HTML_for_trick
@@ -689,6 +1216,17 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
             viewer_may_control_this_seat=viewer_may_control_this_seat,
         )
 
+    def _is_players_turn(self, p: Player) -> bool:
+        """Same as `p.is_my_turn_to_interact()`, but without p fetching its own copy of this hand."""
+        if p.current_hand_id != self.pk:
+            return p.is_my_turn_to_interact()
+
+        current_seat = self.next_seat_to_play or self.next_seat_to_call
+        if current_seat is None:
+            return False
+
+        return self.player_who_controls_seat(current_seat, right_this_second=True) == p
+
     @staticmethod
     def has_player(player: Player | int | str) -> Q:
         expression = Q(pk__in=[])
@@ -715,19 +1253,43 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
                 recipients = [controlling_player]
 
             for r in recipients:
+                viewer_may_control_this_seat = r == controlling_player
                 self.send_HTML_to_player(
                     data=create_player_hand_event(
                         current_hand_direction=seat.name,
-                        current_hand_html=self._get_current_seat_html(
-                            seat=seat,
-                            viewer_may_control_this_seat=r == controlling_player,
+                        current_hand_html=sse_fanout.render_once(
+                            ("seat", self.pk, seat, viewer_may_control_this_seat),
+                            lambda seat=seat, v=viewer_may_control_this_seat: (
+                                self._get_current_seat_html(
+                                    seat=seat, viewer_may_control_this_seat=v
+                                )
+                            ),
                         ),
                         tempo_seconds=self.tournament.tempo_seconds,
-                        show_hint_button=r.is_my_turn_to_interact(),
+                        show_hint_button=self._is_players_turn(r),
                     ),
                     player=r,
                 )
 
+    def end_table_stream(self) -> None:
+        """Tell everyone watching this table that there'll be nothing more to see, and turn away anyone who tries
+        to listen from now on.
+
+        We don't say how the hand ended: the score goes out with do_end_of_hand_stuff's own events, to those who may
+        see it.
+        """
+        channel = self.event_table_html_channel
+
+        # Registered before our event is, so browsers that reconnect on hearing it get turned away.
+        transaction.on_commit(lambda: channel_acl.close(channel=channel, reason=HAND_OVER))
+
+        with sse_fanout.collect(send=send_event) as fanout:
+            fanout.add(
+                channel=channel,
+                data=create_table_event(hand_over=HAND_OVER),
+                event_type=SSEChannels.HAND_OVER_EVENT_TYPE,
+            )
+
     def do_end_of_hand_stuff(self, *, final_score_text: str) -> None:
         with transaction.atomic():
             assert self.is_complete
@@ -765,15 +1327,18 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
                         f"We've played all the boards in tournament #{self.tournament.display_number}, board group {self.board.group}, at table #{self.table_display_number}"
                     )
 
+            # After the next hands exist, so we can tell the players where to go; and before the table stream ends, so
+            # that the players' browsers have swapped in the review, and needn't reload when they hear that it has.
+            self._send_review_HTML()
+            self.end_table_stream()
+
     @property
     def auction(self) -> Auction:
         return self.get_xscript().auction
 
     @property
     def declarer(self) -> libPlayer | None:
-        if not self.auction.found_contract:
-            return None
-        return self.auction.declarer
+        return self.state.declarer
 
     @property
     def model_declarer(self) -> Player | None:
@@ -784,9 +1349,7 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
 
     @property
     def dummy(self) -> libPlayer | None:
-        if not self.auction.found_contract:
-            return None
-        return self.auction.dummy
+        return self.state.dummy
 
     @property
     def model_dummy(self) -> Player | None:
@@ -800,12 +1363,7 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
         if self.is_abandoned:
             return None
 
-        if self.auction.status is Auction.Incomplete:
-            libAllowed = self.auction.allowed_caller()
-            assert libAllowed is not None
-            return libAllowed.seat
-
-        return None
+        return self.state.next_seat_to_call
 
     # For UI stuff, "player_who_controls_seat" is likely what you want here.
     @property
@@ -821,10 +1379,7 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
         if self.is_abandoned:
             return None
 
-        if not self.auction.found_contract:
-            return None
-
-        seat_who_may_play = self.get_xscript().next_seat_to_play()
+        seat_who_may_play = self.state.next_seat_to_play
         if seat_who_may_play is None:
             return None
 
@@ -838,25 +1393,31 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
         return ""
 
     def player_who_controls_seat(self, seat: Seat, right_this_second: bool) -> Player:
-        for d in self.direction_names:
-            p: Player = getattr(self, d)
-            assert p.current_hand == self, (
-                f"So like {p.name}'s current hand is {p.current_hand=}, but I am {self=}"
+        # Same logic as Player.controls_seat, but without each player having to fetch their current hand.
+        state = self.state
+
+        controlling_seat: Seat | None = seat
+        if state.num_plays >= 1 and state.dummy is not None and seat == state.dummy.seat:
+            assert state.declarer is not None
+            controlling_seat = state.declarer.seat
+
+        if right_this_second and seat != (self.next_seat_to_play or self.next_seat_to_call):
+            controlling_seat = None
+
+        if controlling_seat is None:
+            raise Exception(
+                f"Internal error: no player controls {seat.name=} of hand {self} ({self.pk=})"
             )
-            if p.controls_seat(seat=seat, right_this_second=right_this_second):
-                return p
 
-        raise Exception(
-            f"Internal error: no player controls {seat.name=} of hand {self} ({self.pk=})"
+        p: Player = getattr(self, controlling_seat.name)
+        assert p.current_hand_id == self.pk, (
+            f"So like {p.name}'s current hand is {p.current_hand_id=}, but I am {self=}"
         )
+        return p
 
     @property
     def next_seat_to_play(self) -> Seat | None:
-        if not self.auction.found_contract:
-            return None
-
-        xscript = self.get_xscript()
-        return xscript.next_seat_to_play()
+        return self.state.next_seat_to_play
 
     def modPlayer_by_seat(self, seat: Seat) -> Player:
         return getattr(self, seat.name)
@@ -887,60 +1448,82 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
     def direction_letters_by_player(self) -> dict[Player, str]:
         return {v: k for k, v in self.players_by_direction_letter.items()}
 
-    def current_cards_by_seat(self, *, as_dealt: bool = False) -> dict[Seat, set[libCard]]:
-        rv = {}
-        for direction_letter, cardstring in self.board.hand_strings_by_direction_letter.items():
-            seat = Seat(direction_letter)
-            rv[seat] = {libCard.deserialize(c) for c in more_itertools.sliced(cardstring, 2)}
+    def _card_sets_by_seat(
+        self, *, as_dealt: bool = False, annotated_plays: TrickTuples | None = None
+    ) -> dict[Seat, cardset.CardSet]:
+        rv = {
+            Seat(direction_letter): cardset.from_card_string(cardstring)
+            for direction_letter, cardstring in self.board.hand_strings_by_direction_letter.items()
+        }
 
         if as_dealt:
             return rv
 
-        if self.auction.found_contract:
-            for tt in self.annotated_plays:
-                rv[tt.seat].remove(tt.card)
+        if annotated_plays is None:
+            annotated_plays = self.annotated_plays
+
+        for tt in annotated_plays:
+            rv[tt.seat] &= ~cardset.bit(tt.card)
 
         return rv
 
+    def current_cards_by_seat(self, *, as_dealt: bool = False) -> dict[Seat, set[libCard]]:
+        return {
+            seat: set(cardset.cards(cs))
+            for seat, cs in self._card_sets_by_seat(as_dealt=as_dealt).items()
+        }
+
     def players_remaining_cards(self, *, player: libPlayer) -> libHand:
         ccbs = self.current_cards_by_seat()
         return libHand(cards=list(ccbs[player.seat]))
 
+    def _legal_card_set(
+        self, *, current: dict[Seat, cardset.CardSet] | None = None
+    ) -> cardset.CardSet:
+        """Which of the current player's cards may they play?
+
+        That depends only on what they hold, and the suit that was led to the current trick (if anyone has led yet).
+        """
+        state = self.state
+        if state.next_seat_to_play is None:
+            return cardset.EMPTY
+
+        if current is None:
+            current = self._card_sets_by_seat(annotated_plays=state.annotated_plays)
+
+        led_suit = None
+        if (position_in_trick := state.num_plays % 4) != 0:
+            led_suit = cardset.suit_index(state.annotated_plays[-position_in_trick].card)
+        return cardset.legal(current[state.next_seat_to_play], led_suit=led_suit)
+
     def display_skeleton(self, *, as_dealt: bool = False) -> DisplaySkeleton:
         """A simplified representation of the hand, with all the attributes "filled in" -- about halfway between the model and the view."""
-        xscript = self.get_xscript()
-        whose_turn_is_it = None
+        state = self.state
+        whose_turn_is_it = state.next_seat_to_play
+        annotated_plays = state.annotated_plays
 
-        if xscript.auction.found_contract:
-            whose_turn_is_it = xscript.next_seat_to_play()
+        current = self._card_sets_by_seat(annotated_plays=annotated_plays)
+        displayed = self._card_sets_by_seat(as_dealt=True) if as_dealt else current
+        legal_now = self._legal_card_set(current=current)
 
         rv = {}
-        # xscript.legal_cards tells us which cards are legal for the current player.
-        for seat, cards in self.current_cards_by_seat(as_dealt=as_dealt).items():
+        for seat, cs in displayed.items():
             assert_type(seat, Seat)
 
-            cards_by_suit = collections.defaultdict(list)
-            for c in cards:
-                cards_by_suit[c.suit].append(c)
-
             kwargs = {}
 
             for suit in libSuit:
-                legal_now = False
-                if seat == whose_turn_is_it:
-                    legal_now = any(
-                        c in xscript.legal_cards(some_cards=list(cards))
-                        for c in cards_by_suit[suit]
-                    )
+                name = suit.name().lower()
+                this_suit = cardset.suit_mask(cardset.SUIT_INDEX_BY_NAME[name])
 
-                kwargs[suit.name().lower()] = SuitHolding(
-                    cards_of_one_suit=cards_by_suit[suit],
-                    legal_now=legal_now,
+                kwargs[name] = SuitHolding(
+                    cards_of_one_suit=cardset.cards(cs & this_suit),
+                    legal_now=seat == whose_turn_is_it and bool(legal_now & cs & this_suit),
                 )
 
             rv[seat] = AllFourSuitHoldings(
                 **kwargs,
-                textual_summary=f"{len(cards)} cards",
+                textual_summary=f"{cs.bit_count()} cards",
             )
         return DisplaySkeleton(holdings_by_seat=rv)
 
@@ -980,7 +1563,7 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
     def auction_display_with_explanations(self) -> list[list[dict[str, str] | None]]:
         """Return the auction in 2D table form (like fancy_HTML_display) with explanations from DB."""
         html_rows = self.auction.fancy_HTML_display()
-        db_calls = list(self.calls.all())
+        explanations = list(self.calls.values_list("explanation", flat=True))
 
         result: list[list[dict[str, str] | None]] = []
         call_index = 0
@@ -990,9 +1573,7 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
                 if cell is None:
                     result_row.append(None)
                 else:
-                    explanation = (
-                        db_calls[call_index].explanation if call_index < len(db_calls) else ""
-                    )
+                    explanation = explanations[call_index] if call_index < len(explanations) else ""
                     result_row.append({"html": str(cell), "explanation": explanation})
                     call_index += 1
             result.append(result_row)
@@ -1006,11 +1587,11 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
 
     @property
     def tricks(self) -> Iterator[TrickTuples]:
-        return more_itertools.chunked(self.annotated_plays, 4)
+        return iter(self.state.tricks)
 
     @property
     def current_trick(self) -> TrickTuples | None:
-        tricks = list(self.tricks)
+        tricks = self.state.tricks
         if not tricks:
             return None
 
@@ -1018,20 +1599,10 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
 
     @property
     def annotated_plays(self) -> TrickTuples:
-        flattened: TrickTuples = []
-
-        for t in self.get_xscript().tricks:
-            # Who won this trick?
-            for p in t.plays:
-                flattened.append(TrickTuple(seat=p.seat, card=p.card, winner=p.wins_the_trick))
-
-        return flattened
+        return self.state.annotated_plays
 
     def trick_counts_string(self) -> str:
-        cc = collections.Counter([p.seat.value for p in self.annotated_plays if p.winner])
-        ns = cc["S"] + cc["N"]
-        ew = cc["E"] + cc["W"]
-        return json.dumps({"N/S": ns, "E/W": ew})
+        return json.dumps(self.state.tricks_won_by_partnership)
 
     # This is meant for use by get_xscript; anyone else who wants to examine our plays should call that.
     @property
@@ -1039,7 +1610,7 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
         return self.play_set.order_by("id")
 
     def _score_by_player(self, *, player: Player) -> int:
-        fs = self.get_xscript().final_score()
+        fs = self.state.final_score
         assert fs is not None
 
         if fs == 0:
@@ -1085,7 +1656,7 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
                     "-",
                 )
 
-        auction_status = self.get_xscript().auction.status
+        auction_status = self.state.auction_status
 
         if auction_status is self.auction.Incomplete:
             return "Auction incomplete", "-"
@@ -1101,7 +1672,7 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
             if (direction := self.direction_letters_by_player.get(as_viewed_by)) is not None:
                 my_seat_letter = direction
 
-        fs = self.get_xscript().final_score()
+        fs = self.state.final_score
 
         if fs is None:
             trick_summary = (
@@ -1121,6 +1692,14 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
         return (f"{auction_status}: {trick_summary}", total_score)
 
     def save(self, *_args, **kwargs) -> None:
+        # num_actions and action_log are maintained by CallManager and PlayManager; a full save from a stale instance
+        # mustn't roll them back.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in {"num_actions", "action_log"}
+            ]
         super().save(**kwargs)
         if self.abandoned_because is None:
             for attribute_name in attribute_names:
@@ -1142,6 +1721,18 @@ class Hand(ExportModelOperationsMixin("hand"), TimeStampedModel):  # type: ignor
                 name="%(app_label)s_%(class)s_a_board_can_be_played_only_once_at_a_given_table",
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["next_actor_is_bot", "last_action_time"],
+                condition=Q(is_complete=False, abandoned_because__isnull=True),
+                name="%(app_label)s_%(class)s_bot_is_due",
+            ),
+            models.Index(
+                fields=["next_actor_player", "last_action_time"],
+                condition=Q(is_complete=False, abandoned_because__isnull=True),
+                name="%(app_label)s_%(class)s_waiting_on_player",
+            ),
+        ]
         ordering = [
             "board__tournament__display_number",
             "table_display_number",
@@ -1159,18 +1750,35 @@ class CallManager(models.Manager):
     def create(self, *args, **kwargs) -> Call:
         h: Hand = kwargs["hand"]
 
-        x: HandTranscript = h.get_xscript()
-
-        c = libBid.deserialize(kwargs["serialized"])
-        x.add_call(c)
-
-        rv = super().create(*args, **kwargs)
-
-        h._cache_set(x)
+        with transaction.atomic():
+            h._lock_for_action()
+
+            entry = h._get_xscript_entry()
+            x: HandTranscript = h._xscript_from_entry(entry)
+
+            c = libBid.deserialize(kwargs["serialized"])
+
+            try:
+                x.add_call(c)
+                rv = super().create(*args, **kwargs)
+            except Exception:
+                # x may be our request-scoped copy, and we may have half-modified it.
+                xscript_store.forget(h.pk)
+                raise
+
+            h._record_action(
+                previous=entry,
+                current=dataclasses.replace(
+                    entry,
+                    calls=entry.calls + xscript_codec.encode_calls([c.serialize()]),
+                    xscript=x,
+                    state=None,
+                ),
+            )
 
-        if x.auction.status is Auction.PassedOut:
-            h.is_complete = True
-            h.save()
+            if x.auction.status is Auction.PassedOut:
+                h.is_complete = True
+                h.save()
 
         return rv
 
@@ -1214,19 +1822,35 @@ class PlayManager(models.Manager):
         """Only Hand.add_play_from_model_player may call me; the rest of y'all should call *that*."""
         h: Hand = kwargs["hand"]
 
-        x: HandTranscript = h.get_xscript()
-
-        card = libCard.deserialize(kwargs["serialized"])
-
-        x.add_card(card)
-
-        rv = super().create(*args, **kwargs)
-
-        h._cache_set(x)
+        with transaction.atomic():
+            h._lock_for_action()
+
+            entry = h._get_xscript_entry()
+            x: HandTranscript = h._xscript_from_entry(entry)
+
+            card = libCard.deserialize(kwargs["serialized"])
+
+            try:
+                x.add_card(card)
+                rv = super().create(*args, **kwargs)
+            except Exception:
+                # x may be our request-scoped copy, and we may have half-modified it.
+                xscript_store.forget(h.pk)
+                raise
+
+            h._record_action(
+                previous=entry,
+                current=dataclasses.replace(
+                    entry,
+                    plays=entry.plays + xscript_codec.encode_plays([card.serialize()]),
+                    xscript=x,
+                    state=None,
+                ),
+            )
 
-        if x.num_plays == 52:
-            h.is_complete = True
-            h.save()
+            if x.num_plays == 52:
+                h.is_complete = True
+                h.save()
 
         return rv
 
@@ -29,6 +29,7 @@ import bridge.table
 from app.sse_channels import SSEChannels
 from app.sse_events import PartnershipEvent
 
+from . import channel_acl
 from .board import Board
 from .common import attribute_names
 from .message import Message
@@ -230,6 +231,7 @@ class Player(DirtyFieldsMixin, TimeStampedModel):
                 if getattr(h, direction_name) == self:
                     self.current_hand = h
                     self.save(update_fields=["current_hand"])
+                    channel_acl.forget([self.pk])
 
     def controls_seat(self, *, seat: bridge.seat.Seat, right_this_second: bool) -> bool:
         # Take declarer & dummy into account.  This isn't all that complex, but I keep getting it wrong, so it needs to
@@ -246,7 +248,7 @@ class Player(DirtyFieldsMixin, TimeStampedModel):
         seats_by_player = {getattr(hand, s.name): set([s]) for s in bridge.seat.Seat}
 
         # Now update that dict, taking into account declarer & dummy
-        if hand.play_set.count() >= 1:
+        if hand.state.num_plays >= 1:
             seats_by_player[hand.model_dummy] = set()
             seats_by_player[hand.model_declarer].add(hand.dummy.seat)
 
@@ -262,6 +264,13 @@ class Player(DirtyFieldsMixin, TimeStampedModel):
 
         return Hand.objects.all().filter(Hand.has_player(self))
 
+    # hands in which it's our turn to call or play (including, if we're declarer, to play from dummy)
+    @property
+    def hands_waiting_on_me(self) -> models.QuerySet:
+        from app.models import Hand
+
+        return Hand.objects.waiting_on(self)
+
     @property
     def boards_played(self) -> models.QuerySet:
         return Board.objects.filter(pk__in=self.hands_played)
@@ -275,12 +284,19 @@ class Player(DirtyFieldsMixin, TimeStampedModel):
     def abandon_my_hand(self, reason: str | None = None) -> None:
         with transaction.atomic():
             if (h := self.current_hand) is not None:
+                # Everyone at the table abandons it in turn, e.g. when the tournament expires; only say so once.
+                already_abandoned = h.is_abandoned
                 h.abandoned_because = reason or f"{self.name} left"
                 h._clear_bot_flags()
                 h.save()
+                if h._update_next_actor():
+                    h.update_bot_queue()
+                if not already_abandoned and not h.is_complete:
+                    h.end_table_stream()
 
                 self.current_hand = None
                 self.save()
+                channel_acl.forget([self.pk])
 
                 logger.debug(
                     "%s",
@@ -321,10 +337,21 @@ class Player(DirtyFieldsMixin, TimeStampedModel):
         return None
 
     def toggle_bot(self) -> None:
+        from app.models import Hand
+
         with transaction.atomic():
             self.allow_bot_to_play_for_me = not self.allow_bot_to_play_for_me
             self.save()
 
+            # Just the flag; whoever's adding a call or play right now may be about to change whose turn it is.
+            Hand.objects.filter(next_actor_player=self).update(
+                next_actor_is_bot=self.allow_bot_to_play_for_me
+            )
+
+            if self.current_hand is not None:
+                self.current_hand.refresh_from_db(fields=["next_actor_is_bot"])
+                self.current_hand.update_bot_queue()
+
     def save(self, *args, **kwargs) -> None:
         # Capture dirty fields before saving
         dirty_fields = self.get_dirty_fields() if self.pk else {}
@@ -353,7 +380,7 @@ class Player(DirtyFieldsMixin, TimeStampedModel):
 
             send_event(
                 channel=self.bot_checkbox_channel,
-                event_type="message",
+                event_type=SSEChannels.event_type(self.bot_checkbox_channel),
                 data=html,
                 json_encode=False,
             )
@@ -378,7 +405,7 @@ class Player(DirtyFieldsMixin, TimeStampedModel):
                     )
                     send_event(
                         channel=dummy.bot_checkbox_channel,
-                        event_type="message",
+                        event_type=SSEChannels.event_type(dummy.bot_checkbox_channel),
                         data=dummy_html,
                         json_encode=False,
                     )
@@ -14,9 +14,11 @@ from django.utils import timezone
 from django_eventstream import send_event  # type: ignore[import-untyped]
 
 import app.models
+import app.models.channel_acl
 import app.models.common
 import app.utils.movements
 import app.utils.scoring
+from app import sse_fanout
 from app.models.signups import TournamentSignup
 from app.models.throttle import throttle
 from app.models.types import PK
@@ -98,14 +100,14 @@ def check_for_expirations(sender, **kwargs) -> None:
                 t.abandon_all_hands(reason=f"play completion deadline ({deadline_str}) has passed")
                 t.save()
 
-                for h in t.hands():
-                    send_event(
-                        channel=h.event_table_html_channel,
-                        event_type="message",
-                        data=create_table_event(
-                            play_completion_deadline=t.play_completion_deadline.isoformat()
-                        ),
-                    )
+                with sse_fanout.collect(send=send_event) as fanout:
+                    for h in t.hands():
+                        fanout.add(
+                            channel=h.event_table_html_channel,
+                            data=create_table_event(
+                                play_completion_deadline=t.play_completion_deadline.isoformat()
+                            ),
+                        )
                 continue
 
             if t.signup_deadline_has_passed():
@@ -225,6 +227,11 @@ class Tournament(models.Model):
         default=1.0,
     )
 
+    turbo_bot_hands = models.BooleanField(
+        default=False,
+        db_comment="If set, a hand at which all four players are bots gets played out all at once, ignoring tempo_seconds",
+    )  # type: ignore[call-overload]
+
     objects = TournamentManager()
 
     @property
@@ -514,6 +521,7 @@ class Tournament(models.Model):
                         reason=f"play completion deadline ({self.play_completion_deadline}) has passed"
                     )
                 else:
+                    app.models.channel_acl.forget(self.players().values_list("pk", flat=True))
                     self.players().update(current_hand=None, random_state=None)
                 self.save()
 
@@ -0,0 +1,112 @@
+"""A compact, pickle-free representation of a hand's calls and plays.
+
+Every call and every card gets a one-byte code, so a complete hand fits in a few dozen bytes, rather than the several
+kilobytes that pickling a HandTranscript (with its Table, Players, Auction and Tricks) costs.  The HandTranscript itself
+is rebuilt from these codes on demand, by replaying them into a fresh transcript; see `Hand._empty_xscript`.
+
+Layout: format byte, board pk (4 bytes), number of calls (2 bytes), the call codes, then the play codes.
+
+The same codes, shifted into printable ASCII, make up `Hand.action_log`: calls are "!" through "F", and cards are "G"
+through "z".  Since all the calls come before any of the plays, the log can be split back into the two without any
+separator.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable
+
+import bridge.contract
+
+from .types import PK
+
+FORMAT = 1
+
+_HEADER = struct.Struct(">BIH")
+
+# Clubs first, and within a suit, deuce first; same order as the deck is usually sorted.
+CARDS: list[str] = [suit + rank for suit in "♣♦♥♠" for rank in "23456789TJQKA"]
+
+# The 38 possible calls: pass, double, redouble, then the 35 bids from 1♣ up to 7N.
+CALLS: list[str] = [
+    bridge.contract.Pass.serialize(),
+    bridge.contract.Double.serialize(),
+    bridge.contract.Redouble.serialize(),
+    *[f"{level}{denomination}" for level in range(1, 8) for denomination in "♣♦♥♠N"],
+]
+
+_FIRST_CALL_CHAR = ord("!")
+_FIRST_CARD_CHAR = _FIRST_CALL_CHAR + len(CALLS)
+
+_CARD_CODES = {c: code for code, c in enumerate(CARDS)}
+_CALL_CODES = {c: code for code, c in enumerate(CALLS)}
+
+
+class CodecError(Exception):
+    pass
+
+
+def card_code(serialized_card: str) -> int:
+    try:
+        return _CARD_CODES[serialized_card]
+    except KeyError as e:
+        msg = f"Don't know how to encode the card {serialized_card!r}"
+        raise CodecError(msg) from e
+
+
+def encode_calls(serialized_calls: Iterable[str]) -> bytes:
+    try:
+        return bytes(_CALL_CODES[c] for c in serialized_calls)
+    except KeyError as e:
+        msg = f"Don't know how to encode the call {e.args[0]!r}"
+        raise CodecError(msg) from e
+
+
+def encode_plays(serialized_cards: Iterable[str]) -> bytes:
+    try:
+        return bytes(_CARD_CODES[c] for c in serialized_cards)
+    except KeyError as e:
+        msg = f"Don't know how to encode the card {e.args[0]!r}"
+        raise CodecError(msg) from e
+
+
+def decode_calls(codes: bytes) -> list[str]:
+    return [CALLS[code] for code in codes]
+
+
+def decode_plays(codes: bytes) -> list[str]:
+    return [CARDS[code] for code in codes]
+
+
+def to_action_log(*, calls: bytes, plays: bytes) -> str:
+    return "".join(chr(_FIRST_CALL_CHAR + code) for code in calls) + "".join(
+        chr(_FIRST_CARD_CHAR + code) for code in plays
+    )
+
+
+def from_action_log(log: str) -> tuple[bytes, bytes]:
+    """Returns the call codes and the play codes."""
+    codes = [ord(ch) - _FIRST_CALL_CHAR for ch in log]
+    num_calls = sum(1 for code in codes if code < len(CALLS))
+    if any(not 0 <= code < len(CALLS) + len(CARDS) for code in codes) or any(
+        code < len(CALLS) for code in codes[num_calls:]
+    ):
+        msg = f"Malformed action log {log!r}"
+        raise CodecError(msg)
+
+    return bytes(codes[:num_calls]), bytes(code - len(CALLS) for code in codes[num_calls:])
+
+
+def pack(*, board_pk: PK, calls: bytes, plays: bytes) -> bytes:
+    return _HEADER.pack(FORMAT, board_pk, len(calls)) + calls + plays
+
+
+def unpack(blob: bytes) -> tuple[PK, bytes, bytes]:
+    """Returns the board pk, the call codes, and the play codes."""
+    format_, board_pk, num_calls = _HEADER.unpack_from(blob)
+    if format_ != FORMAT:
+        msg = f"Unknown transcript format {format_}"
+        raise CodecError(msg)
+
+    body = blob[_HEADER.size :]
+    return board_pk, body[:num_calls], body[num_calls:]
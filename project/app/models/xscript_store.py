@@ -0,0 +1,205 @@
+"""Versioned storage for cached HandTranscripts.
+
+Each entry is keyed by hand pk, and holds the hand's calls and plays in the compact form described in xscript_codec.
+The number of actions (calls plus plays) is the entry's version; it matches `Hand.num_actions` once the action has been
+committed.
+
+Writers use compare-and-set: an entry is only replaced if the version currently in the cache is the one the writer
+started from.  That way two processes acting on the same hand can't silently clobber each other's transcripts; the
+loser just leaves the cache alone, and the next reader replays whatever is missing from the database.
+
+Inside a `request_scope()`, entries are also remembered in-process, so that a single request (or a single call or play)
+fetches and decodes any given hand's transcript at most once, no matter how many Hand properties it consults.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import contextvars
+import dataclasses
+import struct
+import threading
+from typing import TYPE_CHECKING
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+from bridge.xscript import HandTranscript
+
+from . import xscript_codec
+from .types import PK
+
+if TYPE_CHECKING:
+    from .hand import HandState
+
+# Big-endian unsigned short.  The longest possible auction is 319 calls, plus 52 plays, so this is plenty.
+_VERSION_HEADER = struct.Struct(">H")
+
+# KEYS[1]: the cache key
+# ARGV[1]: the version header we expect to find; empty if we expect no entry at all
+# ARGV[2]: the new value
+# ARGV[3]: timeout in seconds; empty for "never expire"
+_CAS_LUA = """
+local current = redis.call('GETRANGE', KEYS[1], 0, 1)
+if current ~= ARGV[1] then
+    return 0
+end
+if ARGV[3] == '' then
+    redis.call('SET', KEYS[1], ARGV[2])
+else
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+end
+return 1
+"""
+
+# Only used when the cache isn't redis (e.g., LocMemCache in the unit tests), where everything is in one process anyway.
+_local_lock = threading.Lock()
+
+# How many times we've talked to the cache backend, by operation.  For benchmarks and tests.
+round_trips: collections.Counter[str] = collections.Counter()
+
+
+@dataclasses.dataclass
+class Entry:
+    board_pk: PK
+    calls: bytes
+    plays: bytes
+
+    # Built from the above by Hand._xscript_from_entry, the first time someone asks for it.
+    xscript: HandTranscript | None = dataclasses.field(default=None, compare=False, repr=False)
+    # Likewise, by Hand.state.
+    state: HandState | None = dataclasses.field(default=None, compare=False, repr=False)
+
+    @property
+    def version(self) -> int:
+        return len(self.calls) + len(self.plays)
+
+
+_memo: contextvars.ContextVar[dict[PK, Entry] | None] = contextvars.ContextVar(
+    "xscript_memo", default=None
+)
+
+
+@contextlib.contextmanager
+def request_scope():
+    """Remember transcripts in-process until we exit.  Nests; only the outermost scope does anything."""
+    if _memo.get() is not None:
+        yield
+        return
+
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def _remember(hand_pk: PK, entry: Entry | None) -> None:
+    if (memo := _memo.get()) is None:
+        return
+    if entry is None:
+        memo.pop(hand_pk, None)
+    else:
+        memo[hand_pk] = entry
+
+
+def forget(hand_pk: PK) -> None:
+    """Drop our in-process copy, e.g. because someone mutated it and then failed to store the result."""
+    _remember(hand_pk, None)
+
+
+def _key(hand_pk: PK) -> str:
+    return f"xscript:{hand_pk}"
+
+
+def _header(version: int | None) -> bytes:
+    if version is None:
+        return b""
+    return _VERSION_HEADER.pack(version)
+
+
+def _encode(entry: Entry) -> bytes:
+    return _header(entry.version) + xscript_codec.pack(
+        board_pk=entry.board_pk, calls=entry.calls, plays=entry.plays
+    )
+
+
+def _decode(blob: bytes | None) -> Entry | None:
+    if not blob:
+        return None
+    try:
+        board_pk, calls, plays = xscript_codec.unpack(blob[_VERSION_HEADER.size :])
+    except (xscript_codec.CodecError, struct.error):
+        # Perhaps written by an older version of this code.  Treat it as a miss; `get` will delete it.
+        return None
+    return Entry(board_pk=board_pk, calls=calls, plays=plays)
+
+
+def _cache():
+    # Not `django.core.cache.cache`: that's a proxy, and we need to know what kind of backend is behind it.
+    return caches["default"]
+
+
+def _redis_client_and_key(cache: RedisCache, hand_pk: PK):
+    key = cache.make_and_validate_key(_key(hand_pk))
+    return cache._cache.get_client(key, write=True), key
+
+
+def get(hand_pk: PK, *, version: int | None = None) -> Entry | None:
+    """Fetch the cached entry.  If we're in a request scope that already has `version` of it, skip the round trip."""
+    entry = (_memo.get() or {}).get(hand_pk)
+    if entry is not None and entry.version == version:
+        return entry
+
+    round_trips["get"] += 1
+    cache = _cache()
+    if isinstance(cache, RedisCache):
+        client, key = _redis_client_and_key(cache, hand_pk)
+        blob = client.get(key)
+    else:
+        blob = cache.get(_key(hand_pk))
+
+    entry = _decode(blob)
+    if blob and entry is None:
+        # Otherwise nobody could ever compare-and-set over it.
+        delete(hand_pk)
+
+    _remember(hand_pk, entry)
+    return entry
+
+
+def compare_and_set(hand_pk: PK, *, expected_version: int | None, entry: Entry) -> bool:
+    """Store `entry` iff the cache currently holds `expected_version` (or nothing at all, if that's None).
+
+    Returns True if we stored it.
+    """
+    round_trips["compare_and_set"] += 1
+    cache = _cache()
+    blob = _encode(entry)
+    timeout = cache.get_backend_timeout()
+
+    if isinstance(cache, RedisCache):
+        client, key = _redis_client_and_key(cache, hand_pk)
+        script = client.register_script(_CAS_LUA)
+        stored = bool(
+            script(
+                keys=[key],
+                args=[_header(expected_version), blob, "" if timeout is None else timeout],
+            )
+        )
+    else:
+        with _local_lock:
+            current = cache.get(_key(hand_pk))
+            stored = (current or b"")[: _VERSION_HEADER.size] == _header(expected_version)
+            if stored:
+                cache.set(_key(hand_pk), blob, timeout=timeout)
+
+    _remember(hand_pk, entry if stored else None)
+    return stored
+
+
+def delete(hand_pk: PK) -> None:
+    round_trips["delete"] += 1
+    _cache().delete(_key(hand_pk))
+    _remember(hand_pk, None)
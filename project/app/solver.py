@@ -0,0 +1,202 @@
+"""
+Endplay's bidder, and the bridge library's card player, in a pool of worker processes
+
+Working out the bot's next call or card is CPU-bound, and holds the GIL while it runs; doing it on a daphne request
+thread (for the "hint" button), or on one of the cheating_bot's worker threads, slows everything else in that process
+down.  So instead we pickle the hand's transcript off to a `ProcessPoolExecutor` and wait for the answer there.
+
+Two limits keep that from getting out of hand:
+
+- at most `SOLVER_MAX_PENDING` requests may be queued or running at once.  Past that, a caller that can't wait (the hint
+  button) gets `Busy` right away -- so the web server says "try again" rather than tying up a request thread -- while
+  one that can (the bot) waits its turn, up to its timeout.
+
+- each request has a timeout, after which the caller gets `TimedOut`.  The worker may well still be grinding away; it
+  keeps its slot until it's done, so that a pile of slow requests can't sneak past the limit above.
+
+Answers aren't cached here, since both callers go through app.models.bot_memo, which already remembers every decision
+for each board.
+
+If `SOLVER_PROCESSES` is zero (e.g., in the unit tests), requests run on the caller's thread instead; the limit on
+pending requests still applies, but timeouts can't be enforced.
+"""
+
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import concurrent.futures.process
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+import django
+from django.conf import settings
+
+import app.metrics
+
+if TYPE_CHECKING:
+    from bridge.card import Card as libCard
+    from bridge.contract import Call as libCall
+    from bridge.xscript import HandTranscript
+
+# A person is waiting on a hint; if it hasn't arrived by then, they'd rather be told to try again.
+HINT_TIMEOUT_SECONDS = 5
+
+# The bot has nothing better to do; this just keeps one pathological hand from tying up one of its threads forever.
+BOT_TIMEOUT_SECONDS = 60
+
+# How each request turned out, by kind of request.  For tests.
+outcomes: collections.Counter[tuple[str, str]] = collections.Counter()
+
+_pool: concurrent.futures.ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+_num_pending = 0
+_pending_changed = threading.Condition()
+
+
+class SolverUnavailable(Exception):
+    pass
+
+
+class Busy(SolverUnavailable):
+    pass
+
+
+class TimedOut(SolverUnavailable):
+    pass
+
+
+# These run in the worker processes.
+
+
+def _call(xscript: HandTranscript) -> libCall:
+    return xscript.auction.make_standard_american_call(
+        pbn=xscript.endplay_deal.to_pbn(), vuln=xscript.endplay_vulnerability()
+    )
+
+
+def _play(xscript: HandTranscript) -> libCard:
+    return xscript.slightly_less_dumb_play().card
+
+
+def _get_pool() -> concurrent.futures.ProcessPoolExecutor:
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            # "spawn", since forking a process that's running threads (as daphne and the bot both are) can deadlock.
+            # The new process then needs django set up before it can unpickle anything of ours.
+            _pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=settings.SOLVER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=django.setup,
+            )
+        return _pool
+
+
+def _forget_pool(broken: concurrent.futures.ProcessPoolExecutor) -> None:
+    global _pool
+
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _claim_slot(*, deadline: float, wait: bool) -> bool:
+    global _num_pending
+
+    with _pending_changed:
+        while _num_pending >= settings.SOLVER_MAX_PENDING:
+            remaining = deadline - time.monotonic()
+            if not wait or remaining <= 0:
+                return False
+            _pending_changed.wait(remaining)
+        _num_pending += 1
+        return True
+
+
+def _release_slot() -> None:
+    global _num_pending
+
+    with _pending_changed:
+        _num_pending -= 1
+        _pending_changed.notify()
+
+
+def _note_outcome(kind: str, result: str) -> None:
+    outcomes[(kind, result)] += 1
+    app.metrics.SOLVER_REQUESTS.labels(kind=kind, result=result).inc()
+
+
+def _solve(
+    kind: str,
+    fn: Callable[[HandTranscript], Any],
+    xscript: HandTranscript,
+    *,
+    timeout: float,
+    wait: bool,
+):
+    deadline = time.monotonic() + timeout
+
+    if not _claim_slot(deadline=deadline, wait=wait):
+        _note_outcome(kind, "busy")
+        msg = f"Too many requests ahead of this {kind}"
+        raise Busy(msg)
+
+    if settings.SOLVER_PROCESSES == 0:
+        try:
+            rv = fn(xscript)
+        finally:
+            _release_slot()
+        _note_outcome(kind, "ok")
+        return rv
+
+    pool = _get_pool()
+    try:
+        future = pool.submit(fn, xscript)
+    except concurrent.futures.process.BrokenProcessPool as e:
+        _release_slot()
+        _forget_pool(pool)
+        _note_outcome(kind, "broken")
+        msg = "The solver's worker processes died; starting new ones"
+        raise SolverUnavailable(msg) from e
+    except BaseException:
+        _release_slot()
+        raise
+
+    future.add_done_callback(lambda _: _release_slot())
+
+    try:
+        rv = future.result(timeout=max(0, deadline - time.monotonic()))
+    except concurrent.futures.TimeoutError as e:
+        future.cancel()
+        _note_outcome(kind, "timeout")
+        msg = f"No {kind} after {timeout} seconds"
+        raise TimedOut(msg) from e
+    except concurrent.futures.process.BrokenProcessPool as e:
+        _forget_pool(pool)
+        _note_outcome(kind, "broken")
+        msg = "The solver's worker processes died; starting new ones"
+        raise SolverUnavailable(msg) from e
+
+    _note_outcome(kind, "ok")
+    return rv
+
+
+def call(
+    xscript: HandTranscript, *, timeout: float = BOT_TIMEOUT_SECONDS, wait: bool = True
+) -> libCall:
+    """The call the endplay bidder would make next.  Raises SolverUnavailable if it can't say in time."""
+    return _solve("call", _call, xscript, timeout=timeout, wait=wait)
+
+
+def play(
+    xscript: HandTranscript, *, timeout: float = BOT_TIMEOUT_SECONDS, wait: bool = True
+) -> libCard:
+    """The card that `slightly_less_dumb_play` would play next.  Raises SolverUnavailable if it can't say in time."""
+    return _solve("play", _play, xscript, timeout=timeout, wait=wait)
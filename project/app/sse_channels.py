@@ -5,6 +5,8 @@ Centralized channel name generation for Server-Sent Events.
 This ensures consistency and makes it easy to find all channel usages.
 """
 
+from typing import ClassVar
+
 
 class SSEChannels:
     """Registry of all SSE channel names used in the Bridge game."""
@@ -14,6 +16,19 @@ class SSEChannels:
     PARTNERSHIPS = "partnerships"
     ALL_TABLES = "all-tables"
 
+    # A browser gets its own HTML, its bot checkbox, and its table's HTML over a single multiplexed stream
+    # (/events/player/{player_pk}/?table={hand_pk}), so events on those channels carry an event type that says which
+    # channel they came from.  Everything else is plain "message" -- as are these, on their per-channel endpoints (see
+    # app.views.events).
+    _EVENT_TYPES_BY_PREFIX: ClassVar[dict[str, str]] = {
+        "player:html:hand:": "player-html",
+        "player:bot-checkbox:": "bot-checkbox",
+        "table:html:": "table-html",
+    }
+
+    # The last event on a table's channel, once its hand is complete or abandoned (see Hand.end_table_stream).
+    HAND_OVER_EVENT_TYPE = "hand-over"
+
     @staticmethod
     def player_html_hand(player_pk: int) -> str:
         """Player's private HTML updates (bidding box, hand display).
@@ -59,6 +74,17 @@ class SSEChannels:
         """
         return f"chat:player-to-player:{channel_name}"
 
+    @classmethod
+    def multiplexed_event_types(cls) -> frozenset[str]:
+        return frozenset(cls._EVENT_TYPES_BY_PREFIX.values())
+
+    @classmethod
+    def event_type(cls, channel: str) -> str:
+        for prefix, event_type in cls._EVENT_TYPES_BY_PREFIX.items():
+            if channel.startswith(prefix):
+                return event_type
+        return "message"
+
 
 # Backward compatibility: expose as module-level functions
 def player_html_hand_channel(player_pk: int) -> str:
@@ -9,12 +9,15 @@ event shapes across the application.
 from dataclasses import dataclass
 from typing import Optional
 
+# TableEvent.hand_over's only value.
+HAND_OVER = "hand over"
+
 
 @dataclass
 class PlayerHandEvent:
     """Events sent to individual players about their hand state.
 
-    Channel: /events/player/html/hand/{player_pk}/
+    Channel: /events/player/html/hand/{player_pk}/, or /events/player/{player_pk}/ as "player-html"
     """
 
     bidding_box_html: Optional[str] = None
@@ -24,6 +27,16 @@ class PlayerHandEvent:
     hand_pk: Optional[int] = None
     show_hint_button: Optional[bool] = None
 
+    # Instead of reloading the page: interactive_hand.html's "hand-phase" partial, once the auction settles; and
+    # read-only_hand.html's "review" partial, plus a link to the player's next hand, once the hand is over.
+    phase_html: Optional[str] = None
+    review_html: Optional[str] = None
+    next_hand_html: Optional[str] = None
+
+    # Delta mode (settings.SSE_DELTA_EVENTS): whether this player may call or play for TableEvent.next_seat.
+    may_act: Optional[bool] = None
+    num_actions: Optional[int] = None
+
     def to_dict(self):
         """Return only non-None fields (without deep copying)"""
         return {k: v for k, v in self.__dict__.items() if v is not None}
@@ -33,16 +46,33 @@ class PlayerHandEvent:
 class TableEvent:
     """Events sent to all players at a table.
 
-    Channel: /events/table/html/{hand_pk}/
+    Channel: /events/table/html/{hand_pk}/, or /events/player/{player_pk}/?table={hand_pk} as "table-html"
     """
 
     auction_history_html: Optional[str] = None
     trick_html: Optional[str] = None
     trick_counts_string: Optional[str] = None
-    contract_text: Optional[str] = None  # Triggers reload
-    final_score: Optional[dict] = None  # Triggers reload
+    contract_text: Optional[str] = (
+        None  # Triggers reload, except for players at the table (see phase_html)
+    )
+    final_score: Optional[dict] = (
+        None  # Triggers reload, except for players at the table (see review_html)
+    )
     play_completion_deadline: Optional[str] = None  # Triggers reload
 
+    # Delta mode (settings.SSE_DELTA_EVENTS): what just happened, instead of auction_history_html or trick_html.
+    # {"seat": "North", "serialized": "1♣", "html": ..., "explanation": ...}
+    new_call: Optional[dict] = None
+    # {"seat": "North", "serialized": "♠A", "text": ..., "color": ..., "leads_trick": True, "trick_winner": None, ...}
+    new_play: Optional[dict] = None
+    next_seat: Optional[str] = None  # "East"; absent once nobody may act
+    legal: Optional[list] = None  # serialized calls or cards that next_seat may make
+    num_actions: Optional[int] = None  # lets the browser notice that it missed something
+
+    # Sent as a "hand-over" event, once the hand is complete or abandoned: there'll be nothing more on this channel.
+    # Always HAND_OVER: whoever's listening may not be entitled to know how it turned out.
+    hand_over: Optional[str] = None
+
     def to_dict(self):
         """Return only non-None fields (without deep copying)"""
         return {k: v for k, v in self.__dict__.items() if v is not None}
@@ -52,7 +82,7 @@ class TableEvent:
 class BotCheckboxEvent:
     """Bot checkbox state update.
 
-    Channel: /events/player/bot-checkbox/{player_pk}/
+    Channel: /events/player/bot-checkbox/{player_pk}/, or /events/player/{player_pk}/ as "bot-checkbox"
     """
 
     html: str  # Rendered bot-checkbox.html
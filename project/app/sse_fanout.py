@@ -0,0 +1,302 @@
+"""
+Per-action fan-out of Server-Sent Events
+
+A single call or play produces a dozen or so events: a bidding box or hand for each player, JSON for each player's
+bot, the auction or trick for the table, and so on.  Rather than rendering and publishing each one as we go, the Hand
+collects them inside `collect()`, and hands them all to the outbox (see sse_outbox) when the block exits; they get
+published once the surrounding transaction commits.
+
+While collecting, `render_once` remembers each rendered fragment under a key of the caller's choosing, so that e.g. a
+bidding box that looks the same to three of the four players only gets rendered once.
+
+If django-eventstream is publishing through redis, all the events go out in one pipeline -- that is, one round trip --
+rather than one round trip apiece.  That means using some of its private functions (see `eventstream_internals`); if
+the installed version lacks any of them, we fall back to calling `send_event` once per event.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import json
+import logging
+import time
+import types
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import django_eventstream  # type: ignore [import-untyped]
+from django.core.serializers.json import DjangoJSONEncoder
+
+from . import metrics, sse_outbox
+from .sse_channels import SSEChannels
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class Event:
+    channel: str
+    data: Any
+    json_encode: bool = True
+    # Normally implied by the channel; see SSEChannels.event_type.
+    event_type: str | None = None
+
+    def type(self) -> str:
+        return self.event_type or SSEChannels.event_type(self.channel)
+
+
+class Fanout:
+    def __init__(self, *, send: Callable[..., None]) -> None:
+        # Normally `django_eventstream.send_event`; the tests substitute their own.
+        self.send = send
+        self.events: list[Event] = []
+        self.fragments: dict[Hashable, Any] = {}
+
+    def add(
+        self, *, channel: str, data: Any, json_encode: bool = True, event_type: str | None = None
+    ) -> None:
+        self.events.append(
+            Event(channel=channel, data=data, json_encode=json_encode, event_type=event_type)
+        )
+
+    def render_once(self, key: Hashable, render: Callable[[], Any]) -> Any:
+        if key not in self.fragments:
+            self.fragments[key] = render()
+        return self.fragments[key]
+
+    def publish(self) -> None:
+        if not self.events:
+            return
+
+        start = time.perf_counter()
+        try:
+            if (
+                self.send is django_eventstream.send_event
+                and (internals := eventstream_internals()) is not None
+                and internals.eventstream.redis_client is not None
+            ):
+                self._publish_pipelined(internals)
+            else:
+                self._publish_one_at_a_time()
+        finally:
+            metrics.SSE_FANOUT_PUBLISH_SECONDS.observe(time.perf_counter() - start)
+            metrics.SSE_FANOUT_EVENTS.inc(len(self.events))
+            self.events.clear()
+
+    def _publish_one_at_a_time(self) -> None:
+        for e in self.events:
+            kwargs = {} if e.json_encode else {"json_encode": False}
+            self.send(
+                channel=e.channel,
+                event_type=e.type(),
+                data=e.data,
+                **kwargs,
+            )
+
+        if _redis_client() is not None:
+            metrics.SSE_FANOUT_REDIS_ROUND_TRIPS.inc(len(self.events))
+
+    def _publish_pipelined(self, internals: _EventstreamInternals) -> None:
+        # This mirrors django_eventstream.send_event, except for batching the redis publishes.
+        storage = internals.get_storage()
+        channelmanager = internals.get_channelmanager()
+        pipeline = internals.eventstream.redis_client.pipeline(transaction=False)
+
+        encoded = [
+            (
+                e.channel,
+                e.type(),
+                json.dumps(e.data, cls=DjangoJSONEncoder) if e.json_encode else e.data,
+            )
+            for e in self.events
+        ]
+
+        # Store the events that need storing, all at once if the storage knows how (see sse_replay).
+        pub_ids: dict[int, str] = {}
+        if storage:
+            to_store = [
+                i
+                for i, (channel, _, _) in enumerate(encoded)
+                if channelmanager.is_channel_reliable(channel)
+            ]
+            items = [encoded[i] for i in to_store]
+            if hasattr(storage, "append_events"):
+                stored = storage.append_events(items)
+            else:
+                stored = [storage.append_event(*item) for item in items]
+            pub_ids = {i: str(s.id) for i, s in zip(to_store, stored, strict=True)}
+
+        grip_publications = []
+        for i, (channel, event_type, data) in enumerate(encoded):
+            pub_id = pub_ids.get(i)
+            pub_prev_id = str(int(pub_id) - 1) if pub_id is not None else None
+
+            pipeline.publish(
+                "events_channel",
+                json.dumps(
+                    {
+                        "channel": channel,
+                        "event_type": event_type,
+                        "data": data,
+                        "pub_id": pub_id,
+                    }
+                ),
+            )
+            grip_publications.append((channel, event_type, data, pub_id, pub_prev_id))
+
+        pipeline.execute()
+        metrics.SSE_FANOUT_REDIS_ROUND_TRIPS.inc()
+
+        for args in grip_publications:
+            internals.publish_event(*args, skip_user_ids=[], blocking=False)
+
+
+# Clients only care about the latest state of these channels, so successive events on them can be merged ...
+_COALESCIBLE_CHANNEL_PREFIXES = ("table:html:", "player:html:hand:")
+# ... except for events with these fields, which either tell the browser to reload the page, or describe a single call
+# or play (see Hand._send_delta_events), and so must all arrive, in order.  The same goes for events with a type of
+# their own, like "hand-over".
+_UNMERGEABLE_FIELDS = frozenset(
+    {
+        "contract_text",
+        "final_score",
+        "play_completion_deadline",
+        "new_call",
+        "new_play",
+        "phase_html",
+        "review_html",
+    }
+)
+
+
+def _coalesce_events(events: list[Event]) -> list[Event]:
+    rv: list[Event] = []
+    index_by_key: dict[Hashable, int] = {}
+
+    for e in events:
+        if not (
+            e.json_encode
+            and isinstance(e.data, dict)
+            and e.channel.startswith(_COALESCIBLE_CHANNEL_PREFIXES)
+        ):
+            rv.append(e)
+            continue
+
+        if e.event_type is not None or _UNMERGEABLE_FIELDS & e.data.keys():
+            # Don't merge anything that comes after this into anything that came before it.
+            index_by_key = {k: i for k, i in index_by_key.items() if k[0] != e.channel}
+            rv.append(e)
+            continue
+
+        # A player's channel carries updates for more than one seat; those mustn't overwrite each other.
+        key = (e.channel, e.data.get("hand_pk"), e.data.get("current_hand_direction"))
+        if (i := index_by_key.get(key)) is None:
+            index_by_key[key] = len(rv)
+            rv.append(e)
+        else:
+            rv[i] = Event(channel=e.channel, data=rv[i].data | e.data)
+
+    return rv
+
+
+def coalesce(fanouts: list[Fanout]) -> list[Fanout]:
+    """Merge successive batches that go to the same place into one, keeping only the newest value of each field."""
+    rv: list[Fanout] = []
+
+    for f in fanouts:
+        if rv and rv[-1].send is f.send:
+            rv[-1].events.extend(f.events)
+        else:
+            merged = Fanout(send=f.send)
+            merged.events = list(f.events)
+            rv.append(merged)
+
+    for f in rv:
+        before = len(f.events)
+        f.events = _coalesce_events(f.events)
+        metrics.SSE_FANOUT_COALESCED_EVENTS.inc(before - len(f.events))
+
+    return rv
+
+
+@dataclasses.dataclass(frozen=True)
+class _EventstreamInternals:
+    eventstream: types.ModuleType
+    get_channelmanager: Callable[[], Any]
+    get_storage: Callable[[], Any]
+    publish_event: Callable[..., None]
+
+
+@functools.cache
+def eventstream_internals() -> _EventstreamInternals | None:
+    """The private parts of django-eventstream that `_publish_pipelined` needs, or None if it's not the version we know.
+
+    The app's `ready` calls this, so that we find out at startup rather than on the first call or play.
+    """
+    from django_eventstream import eventstream, utils  # type: ignore [import-untyped]
+
+    wanted = [
+        (eventstream, "redis_client"),
+        (utils, "get_channelmanager"),
+        (utils, "get_storage"),
+        (utils, "publish_event"),
+    ]
+    if missing := [
+        f"{module.__name__}.{name}" for module, name in wanted if not hasattr(module, name)
+    ]:
+        logger.warning(
+            "%s",
+            f"django-eventstream has no {', '.join(missing)}; publishing events one at a time",
+        )
+        return None
+
+    return _EventstreamInternals(
+        eventstream=eventstream,
+        get_channelmanager=utils.get_channelmanager,
+        get_storage=utils.get_storage,
+        publish_event=utils.publish_event,
+    )
+
+
+def _redis_client():
+    if (internals := eventstream_internals()) is None:
+        return None
+    return internals.eventstream.redis_client
+
+
+_current: contextvars.ContextVar[Fanout | None] = contextvars.ContextVar("sse_fanout", default=None)
+
+
+def current() -> Fanout | None:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def collect(*, send: Callable[..., None]):
+    """Collect events until we exit, then publish them after the transaction commits.  Nests; only the outermost
+    block publishes.
+
+    If the block raises, nothing is published.
+    """
+    if (fanout := _current.get()) is not None:
+        yield fanout
+        return
+
+    fanout = Fanout(send=send)
+    token = _current.set(fanout)
+    try:
+        yield fanout
+    finally:
+        _current.reset(token)
+
+    sse_outbox.enqueue(fanout)
+
+
+def render_once(key: Hashable, render: Callable[[], Any]) -> Any:
+    """Render via the current fan-out's memo, if there is one; otherwise just render."""
+    if (fanout := _current.get()) is None:
+        return render()
+    return fanout.render_once(key, render)
@@ -0,0 +1,106 @@
+"""
+Transactional outbox for Server-Sent Events
+
+Events that describe a database change mustn't reach the browsers before that change is committed -- otherwise a
+client might react to a call or play that then gets rolled back -- and the request that made the change shouldn't have
+to wait on redis before returning.
+
+So `enqueue` doesn't publish anything right away.  It waits for the current transaction to commit (immediately, if
+there isn't one), then hands the publishing off to a single background thread.  If the transaction rolls back, the
+events are simply dropped.  Since there's just the one thread, events are published in the order they were committed.
+
+If `SSE_COALESCE_SECONDS` is positive, the thread waits that long after receiving a batch, to see if any more arrive;
+then it merges them all (see `sse_fanout.coalesce`) before publishing.  When bots are playing at full speed, that turns
+a flurry of trick and auction updates into just the latest one.
+
+If `SSE_OUTBOX_DISCARD` is set, events are rendered and collected as usual, but then thrown away; the
+simulate_tournament command uses that to measure everything but the publishing.
+
+The unit tests set `SSE_OUTBOX_SYNCHRONOUS`, which publishes right away, on the caller's thread: pytest-django runs
+each test inside a transaction that never commits, and the tests want to see the events.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+if TYPE_CHECKING:
+    from .sse_fanout import Fanout
+
+logger = logging.getLogger(__name__)
+
+_queue: queue.Queue[Fanout] = queue.Queue()
+_worker: threading.Thread | None = None
+_worker_lock = threading.Lock()
+
+
+def enqueue(fanout: Fanout) -> None:
+    if getattr(settings, "SSE_OUTBOX_DISCARD", False):
+        return
+
+    if getattr(settings, "SSE_OUTBOX_SYNCHRONOUS", False):
+        fanout.publish()
+        return
+
+    transaction.on_commit(lambda: _hand_off(fanout))
+
+
+def _hand_off(fanout: Fanout) -> None:
+    _ensure_worker()
+    _queue.put(fanout)
+
+
+def _ensure_worker() -> None:
+    global _worker
+
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name="sse-outbox", daemon=True)
+            _worker.start()
+
+
+def _next_batch() -> list[Fanout]:
+    batch = [_queue.get()]
+
+    window = getattr(settings, "SSE_COALESCE_SECONDS", 0)
+    if window > 0:
+        deadline = time.monotonic() + window
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                batch.append(_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+    return batch
+
+
+def _run() -> None:
+    from .sse_fanout import coalesce
+
+    while True:
+        batch = _next_batch()
+        try:
+            for fanout in coalesce(batch):
+                try:
+                    fanout.publish()
+                except Exception:
+                    # Nobody is waiting for us, so the best we can do is complain.  The clients will catch up the next
+                    # time they reload.
+                    logger.exception("Failed to publish server-sent events")
+        finally:
+            # Publishing might have touched the database, e.g. if django-eventstream is storing events.
+            close_old_connections()
+            for _ in batch:
+                _queue.task_done()
+
+
+def drain() -> None:
+    """Wait until everything that has been handed to the worker has been published."""
+    _queue.join()
@@ -0,0 +1,187 @@
+"""
+A bounded replay buffer for each event channel, for django-eventstream (see EVENTSTREAM_STORAGE_CLASS)
+
+Each event we publish gets a per-channel id, which the browser remembers.  When it reconnects after a network blip, it
+sends the last id it saw (ReconnectingEventSource passes it as `lastEventId`), and django-eventstream asks us for
+everything since; so the client catches up on exactly what it missed, rather than reloading the page.
+
+Each channel keeps only its most recent `SSE_REPLAY_MAX_EVENTS` events, none older than `SSE_REPLAY_MAX_AGE_SECONDS`;
+so memory use is bounded no matter how many events go by, and a channel nobody publishes to soon holds no events at all.
+If the client's last id has fallen off the end, we raise EventDoesNotExist, django-eventstream sends a "stream-reset"
+event, and the client reloads after all.
+
+A channel's id counter outlives its events by far (see COUNTER_TIMEOUT_SECONDS).  Were it to expire along with them,
+ids would start again from 1 after a quiet spell, and a client whose last id was, say, 57 would be handed the new 58
+onwards -- silently missing the new 1 through 57 -- rather than being told to reset.
+
+In redis, each channel is a counter plus a list of JSON entries; a Lua script appends and trims in one round trip.
+With any other cache backend (e.g., in the unit tests), the buffers live in this process.
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.core.serializers.json import DjangoJSONEncoder
+from django_eventstream.event import Event  # type: ignore [import-untyped]
+from django_eventstream.storage import EventDoesNotExist, StorageBase  # type: ignore [import-untyped]
+
+# KEYS[1]: the channel's counter
+# KEYS[2]: the channel's list of entries
+# ARGV[1]: the entry, as JSON, but without its id, and without the closing brace, so we can add the id here
+# ARGV[2]: how many entries to keep
+# ARGV[3]: how long to keep them, in seconds
+# ARGV[4]: how long to keep the counter, in seconds
+_APPEND_LUA = """
+local id = redis.call('INCR', KEYS[1])
+redis.call('RPUSH', KEYS[2], ARGV[1] .. ', "id": ' .. id .. '}')
+redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return id
+"""
+
+# Long enough that no browser is still holding an id from before the counter went away; short enough that the counters
+# of long-gone hands don't pile up forever.
+COUNTER_TIMEOUT_SECONDS = 30 * 24 * 60 * 60
+
+# How many times we've talked to the cache backend, by operation.  For tests.
+round_trips: collections.Counter[str] = collections.Counter()
+
+
+def _max_events() -> int:
+    return settings.SSE_REPLAY_MAX_EVENTS
+
+
+def _max_age_seconds() -> int:
+    return settings.SSE_REPLAY_MAX_AGE_SECONDS
+
+
+def _counter_key(channel: str) -> str:
+    return f"sse-replay:counter:{channel}"
+
+
+def _entries_key(channel: str) -> str:
+    return f"sse-replay:entries:{channel}"
+
+
+def _partial_entry(event_type: str, data: Any) -> str:
+    entry = json.dumps(
+        {"type": event_type, "data": data, "time": time.time()}, cls=DjangoJSONEncoder
+    )
+    return entry[:-1]
+
+
+class _LocalBuffers:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counters: dict[str, int] = collections.defaultdict(int)
+        self.entries: dict[str, collections.deque[str]] = {}
+
+    def append(self, channel: str, partial_entry: str) -> int:
+        with self.lock:
+            self.counters[channel] += 1
+            event_id = self.counters[channel]
+            buffer = self.entries.setdefault(channel, collections.deque(maxlen=_max_events()))
+            buffer.append(f'{partial_entry}, "id": {event_id}}}')
+            return event_id
+
+    def read(self, channel: str) -> tuple[int, list[str]]:
+        with self.lock:
+            return self.counters.get(channel, 0), list(self.entries.get(channel, ()))
+
+
+_local_buffers = _LocalBuffers()
+
+
+class RingBufferStorage(StorageBase):
+    def __init__(self) -> None:
+        self._append_script = None
+
+    @staticmethod
+    def _redis_client():
+        # Not `django.core.cache.cache`: that's a proxy, and we need to know what kind of backend is behind it.
+        cache = caches["default"]
+        if not isinstance(cache, RedisCache):
+            return None
+        return cache._cache.get_client(write=True)
+
+    def _script(self, client):
+        if self._append_script is None:
+            self._append_script = client.register_script(_APPEND_LUA)
+        return self._append_script
+
+    def append_event(self, channel: str, event_type: str, data: Any) -> Event:
+        return self.append_events([(channel, event_type, data)])[0]
+
+    def append_events(self, items: list[tuple[str, str, Any]]) -> list[Event]:
+        """Like append_event, for several events at once; in redis, that's one round trip for all of them."""
+        partial_entries = [_partial_entry(event_type, data) for _, event_type, data in items]
+
+        if (client := self._redis_client()) is None:
+            ids = [
+                _local_buffers.append(channel, entry)
+                for (channel, _, _), entry in zip(items, partial_entries, strict=True)
+            ]
+        else:
+            round_trips["append"] += 1
+            script = self._script(client)
+            pipeline = client.pipeline(transaction=False)
+            for (channel, _, _), entry in zip(items, partial_entries, strict=True):
+                script(
+                    keys=[_counter_key(channel), _entries_key(channel)],
+                    args=[entry, _max_events(), _max_age_seconds(), COUNTER_TIMEOUT_SECONDS],
+                    client=pipeline,
+                )
+            ids = pipeline.execute()
+
+        return [
+            Event(channel, event_type, data, id=int(event_id))
+            for (channel, event_type, data), event_id in zip(items, ids, strict=True)
+        ]
+
+    def _read(self, channel: str) -> tuple[int, list[dict[str, Any]]]:
+        if (client := self._redis_client()) is None:
+            current_id, raw_entries = _local_buffers.read(channel)
+        else:
+            round_trips["read"] += 1
+            pipeline = client.pipeline(transaction=False)
+            pipeline.get(_counter_key(channel))
+            pipeline.lrange(_entries_key(channel), 0, -1)
+            counter, raw_entries = pipeline.execute()
+            current_id = int(counter) if counter is not None else 0
+
+        oldest_acceptable = time.time() - _max_age_seconds()
+        entries = [e for e in map(json.loads, raw_entries) if e["time"] >= oldest_acceptable]
+        return current_id, entries
+
+    def get_events(self, channel: str, last_id: int, limit: int = 100) -> list[Event]:
+        current_id, entries = self._read(channel)
+
+        if last_id == current_id:
+            return []
+
+        # We can only help if we still have everything after last_id.
+        if last_id > current_id or not entries or entries[0]["id"] > last_id + 1:
+            msg = f"Event {last_id} is no longer in {channel}'s replay buffer"
+            raise EventDoesNotExist(msg, current_id)
+
+        return [
+            Event(channel, e["type"], e["data"], id=e["id"]) for e in entries if e["id"] > last_id
+        ][:limit]
+
+    def get_current_id(self, channel: str) -> int:
+        if (client := self._redis_client()) is None:
+            current_id, _ = _local_buffers.read(channel)
+            return current_id
+
+        round_trips["read"] += 1
+        counter = client.get(_counter_key(channel))
+        return int(counter) if counter is not None else 0
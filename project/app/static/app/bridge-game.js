@@ -4,83 +4,242 @@
  */
 
 /**
- * Initialize player-specific event stream (bidding box, hand updates)
- * @param {string} playerEventUrl - SSE endpoint for player-specific events
- * @param {number} playerId - Player ID for redirects
+ * What we need in order to apply "delta" events (see Hand._send_delta_events), which say just what was called or
+ * played, rather than carrying re-rendered HTML.  The table stream says what happened and whose turn it is now; the
+ * player stream says whether it's *our* turn.  They arrive separately, so we only update the bidding box and the
+ * playable cards once both describe the same action.
  */
-export function initPlayerEventStream(playerEventUrl, playerId) {
-    const playerEventSource = new ReconnectingEventSource(playerEventUrl);
-    console.log(`Listening for player events on ${playerEventUrl}`);
+const deltaState = {
+    enabled: false,
+    hasPlayerStream: false,
+    numActions: null,
+    playerNumActions: null,
+    nextSeat: null,
+    legal: [],
+    mayAct: false,
+    playPostUrl: null,
+};
 
-    let autoScrollTimer;
+/**
+ * The players at the table don't reload the page when the auction settles, or when the hand ends: the server sends
+ * each of them the HTML for what comes next (see Hand._send_play_phase_HTML and Hand._send_review_HTML), and we swap
+ * it in.  Anyone else watching still reloads.
+ */
+const phaseState = {
+    swapsPhases: false,
+    reviewShown: false,
+};
+
+/**
+ * @param {Object} options
+ * @param {boolean} options.enabled - Whether the server is sending delta events
+ * @param {number} options.numActions - Calls plus plays so far, as of when the page was rendered
+ * @param {string} options.playPostUrl - Where card buttons post to
+ * @param {boolean} options.swapsPhases - Whether we're seated at this table, and so get sent the next phase's HTML
+ */
+export function initDeltaState({ enabled, numActions, playPostUrl, swapsPhases }) {
+    deltaState.enabled = enabled;
+    deltaState.numActions = numActions;
+    deltaState.playPostUrl = playPostUrl;
+    phaseState.swapsPhases = swapsPhases;
+}
 
-    playerEventSource.addEventListener('message', function (e) {
+/**
+ * When we reconnect, the server replays whatever we missed (see app/sse_replay.py) -- unless it's been too long, in
+ * which case it says "stream-reset" instead, and we have to start over from a freshly-rendered page.
+ * @param {ReconnectingEventSource} eventSource
+ * @param {string} description - for the console
+ */
+function reloadOnStreamReset(eventSource, description) {
+    eventSource.addEventListener('stream-reset', function (e) {
         const data = JSON.parse(e.data);
-        console.log("Player event listener saw " + Object.keys(data));
+        console.log(`${description} got stream-reset for ${data.channels}; reloading`);
+        window.location.reload();
+    });
+}
 
-        // Handle all fields that might be present in the event
-        if ("bidding_box_html" in data) {
-            updateBiddingBox(data.bidding_box_html, playerId);
-        }
+/**
+ * Listen on the multiplexed player stream that base.html opens (via the HTMX SSE extension) for our own events
+ * ("player-html": bidding box, hand updates) and our table's ("table-html": auction, tricks, game state).  base.html
+ * has the extension use a ReconnectingEventSource, which says "open" again each time it reconnects; we only need to
+ * attach to it once.
+ * @param {number} playerId - Player ID for redirects
+ */
+export function initPlayerEventStream(playerId) {
+    const streamElement = document.getElementById("player-event-stream");
+    if (streamElement === null) {
+        throw new Error("base.html didn't give us a player event stream");
+    }
 
-        if ("current_hand_html" in data) {
-            autoScrollTimer = updateCurrentHand(data, autoScrollTimer);
-        }
+    console.log(`Listening for player and table events on ${streamElement.getAttribute("sse-connect")}`);
+    deltaState.hasPlayerStream = true;
 
-        if ("show_hint_button" in data) {
-            const btn = document.getElementById("hint-button");
-            if (btn) {
-                btn.style.visibility = data.show_hint_button ? "visible" : "hidden";
-            }
+    const attachedTo = new WeakSet();
+    let autoScrollTimer;
+
+    streamElement.addEventListener('htmx:sseOpen', function (evt) {
+        const source = evt.detail.source;
+        if (attachedTo.has(source)) {
+            return;
         }
-    });
+        attachedTo.add(source);
+
+        source.addEventListener('player-html', function (e) {
+            autoScrollTimer = handlePlayerEvent(JSON.parse(e.data), playerId, autoScrollTimer);
+        });
+
+        source.addEventListener('table-html', function (e) {
+            handleTableEvent(JSON.parse(e.data));
+        });
+
+        // Our hand is complete or abandoned; unless we're already showing the review, the freshly-rendered page will
+        // say how it turned out.  (The server leaves finished tables out of this stream, so we won't hear this again
+        // after reloading.)
+        source.addEventListener('hand-over', function (e) {
+            console.log("Hand is over: " + JSON.parse(e.data).hand_over);
+            if (!phaseState.reviewShown) {
+                window.location.reload();
+            }
+        });
 
-    playerEventSource.addEventListener('stream-reset', function (e) {
-        const data = JSON.parse(e.data);
-        console.log("playerEventSource got stream-reset: " + Object.keys(data));
+        reloadOnStreamReset(source, "player event stream");
     });
-
-    return playerEventSource;
 }
 
 /**
- * Initialize table-wide event stream (auction, tricks, game state)
+ * Initialize a table-only event stream, for viewers who aren't logged in as a player
  * @param {string} tableEventUrl - SSE endpoint for table-level events
  */
 export function initTableEventStream(tableEventUrl) {
     const handEventSource = new ReconnectingEventSource(tableEventUrl);
     console.log(`Listening for hand events on ${tableEventUrl}`);
+    reloadOnStreamReset(handEventSource, "handEventSource");
 
-    handEventSource.addEventListener('stream-reset', function (e) {
-        const data = JSON.parse(e.data);
-        console.log("handEventSource got stream-reset: " + Object.keys(data));
+    handEventSource.addEventListener('message', function (e) {
+        handleTableEvent(JSON.parse(e.data));
     });
 
-    handEventSource.addEventListener('message', function (e) {
-        const data = JSON.parse(e.data);
-        console.log("Hand event listener saw " + Object.keys(data));
+    // Nothing more will ever be sent, so don't keep reconnecting.
+    handEventSource.addEventListener('hand-over', function (e) {
+        console.log("Hand is over: " + JSON.parse(e.data).hand_over);
+        handEventSource.close();
+    });
 
-        // Handle all fields that might be present in the event
-        // (multiple fields can be sent in a single SSE message)
-        if ("trick_counts_string" in data) {
-            updateTrickCounts(data.trick_counts_string);
-        }
+    return handEventSource;
+}
 
-        if ("trick_html" in data) {
-            updateTrickDisplay(data.trick_html);
-        }
+/**
+ * @param {Object} data - A PlayerHandEvent
+ * @param {number} playerId - Player ID for redirects
+ * @param {number} autoScrollTimer - Timer for auto-scroll behavior
+ * @returns {number} New timer ID
+ */
+function handlePlayerEvent(data, playerId, autoScrollTimer) {
+    console.log("Player event listener saw " + Object.keys(data));
 
-        if ("auction_history_html" in data) {
-            updateAuctionHistory(data.auction_history_html);
-        }
+    if ("review_html" in data) {
+        showReview(data);
+    }
+
+    // Anything else is about the next hand, which we're not showing.
+    if (phaseState.reviewShown) {
+        return autoScrollTimer;
+    }
 
-        if ("contract_text" in data || "final_score" in data || "play_completion_deadline" in data) {
-            // Phase transition or game over - reload to show new state
-            window.location.reload();
+    if ("phase_html" in data) {
+        swapHandPhase(data.phase_html);
+    }
+
+    // Handle all fields that might be present in the event
+    if ("bidding_box_html" in data) {
+        updateBiddingBox(data.bidding_box_html, playerId);
+    }
+
+    if ("current_hand_html" in data) {
+        autoScrollTimer = updateCurrentHand(data, autoScrollTimer);
+    }
+
+    if ("show_hint_button" in data) {
+        const btn = document.getElementById("hint-button");
+        if (btn) {
+            btn.style.visibility = data.show_hint_button ? "visible" : "hidden";
         }
-    });
+    }
 
-    return handEventSource;
+    if ("may_act" in data) {
+        deltaState.mayAct = data.may_act;
+        deltaState.playerNumActions = data.num_actions;
+        applyTurn();
+    }
+
+    return autoScrollTimer;
+}
+
+/**
+ * @param {Object} data - A TableEvent
+ */
+function handleTableEvent(data) {
+    console.log("Hand event listener saw " + Object.keys(data));
+
+    // Handle all fields that might be present in the event
+    // (multiple fields can be sent in a single SSE message)
+    if ("trick_counts_string" in data) {
+        updateTrickCounts(data.trick_counts_string);
+    }
+
+    if ("trick_html" in data) {
+        updateTrickDisplay(data.trick_html);
+    }
+
+    if ("auction_history_html" in data) {
+        updateAuctionHistory(data.auction_history_html);
+    }
+
+    if ("num_actions" in data) {
+        applyTableDelta(data);
+    }
+
+    if ("play_completion_deadline" in data) {
+        window.location.reload();
+    } else if (("contract_text" in data || "final_score" in data) && !phaseState.swapsPhases) {
+        // Phase transition or game over - reload to show new state
+        window.location.reload();
+    }
+}
+
+/**
+ * Replace the "auction" slides with the "play" slides
+ * @param {string} html - interactive_hand.html's "hand-phase" partial
+ */
+function swapHandPhase(html) {
+    const container = document.getElementById("hand-phase");
+    if (container === null) {
+        return;
+    }
+
+    container.outerHTML = html;
+
+    const newContainer = document.getElementById("hand-phase");
+    if (newContainer === null) {
+        throw new Error("After swapping hand-phase, element disappeared");
+    }
+
+    htmx.process(newContainer);
+    initCarouselButtons();
+}
+
+/**
+ * Replace the whole hand with its review, now that it's over
+ * @param {Object} data - Event data containing review_html, and next_hand_html if we have somewhere to go next
+ */
+function showReview({ review_html, next_hand_html }) {
+    const container = document.getElementById("hand-content");
+    if (container === null) {
+        return;
+    }
+
+    container.innerHTML = (next_hand_html ? `Current hand: ${next_hand_html}` : "") + review_html;
+    phaseState.reviewShown = true;
 }
 
 /**
@@ -187,6 +346,232 @@ function updateAuctionHistory(html) {
     }
 }
 
+/**
+ * Apply a delta event from the table stream: show the new call or card, and note whose turn it is now.
+ * @param {Object} data - Event data containing num_actions, next_seat, legal, and new_call or new_play
+ */
+function applyTableDelta(data) {
+    if (data.num_actions <= deltaState.numActions) {
+        // Already applied, or already reflected in the page as rendered.
+        return;
+    }
+
+    if (data.num_actions !== deltaState.numActions + 1) {
+        // We missed one; the server-rendered page is our fallback.
+        window.location.reload();
+        return;
+    }
+
+    deltaState.numActions = data.num_actions;
+    deltaState.nextSeat = data.next_seat ?? null;
+    deltaState.legal = data.legal ?? [];
+
+    if ("new_call" in data) {
+        appendCallToAuction(data.new_call);
+    }
+
+    if ("new_play" in data) {
+        removeCardFromHand(data.new_play);
+        showCardInTrick(data.new_play);
+    }
+
+    applyTurn();
+}
+
+// Columns of the auction table; see _players_west_first_context_for_hand.
+const AUCTION_COLUMNS = { West: 0, North: 1, East: 2, South: 3 };
+
+/**
+ * @param {Object} newCall - {seat, serialized, html, explanation}
+ */
+function appendCallToAuction(newCall) {
+    const tbody = document.querySelector("#auction tbody");
+    if (tbody === null) {
+        return;
+    }
+
+    const column = AUCTION_COLUMNS[newCall.seat];
+    let row = tbody.lastElementChild;
+    if (row === null || column === 0) {
+        row = tbody.insertRow();
+    }
+    while (row.cells.length < 4) {
+        row.insertCell();
+    }
+
+    const cell = row.cells[column];
+    if (newCall.explanation) {
+        const span = document.createElement("span");
+        span.title = newCall.explanation;
+        span.innerHTML = newCall.html;
+        cell.replaceChildren(span);
+    } else {
+        cell.innerHTML = newCall.html;
+    }
+    tbody.closest("table")?.scrollIntoView();
+}
+
+/**
+ * @param {Object} newPlay - {seat, serialized, ...}
+ */
+function removeCardFromHand(newPlay) {
+    const card = document.getElementById(newPlay.seat)
+        ?.querySelector(`[data-card="${CSS.escape(newPlay.serialized)}"]`);
+    if (!card) {
+        // We can't see that hand.
+        return;
+    }
+
+    // <div class="spades"><div><button data-card=...></div>...</div>
+    const suit = card.parentElement.parentElement;
+    card.parentElement.remove();
+    if (suit.children.length === 0) {
+        const dash = document.createElement("div");
+        dash.textContent = "—";
+        suit.append(dash);
+    }
+}
+
+// Positions in the 3x3 trick display; see _three_by_three_trick_display_context_for_hand.
+const TRICK_CELLS = { North: 1, West: 3, East: 5, South: 7 };
+const TRICK_ARROW_CELL = 4;
+const LEAD_ARROWS = { North: "⬆️", East: "➡️", South: "⬇️", West: "⬅️" };
+
+/**
+ * @param {Object} newPlay - {seat, text, color, suit, leads_trick, trick_winner}
+ */
+function showCardInTrick(newPlay) {
+    const grid = document.querySelector("#_3x3-container .three-by-three-trick-display");
+    if (grid === null) {
+        return;
+    }
+
+    const cells = grid.children;
+    if (newPlay.leads_trick) {
+        for (const index of Object.values(TRICK_CELLS)) {
+            setTrickCard(cells[index], null);
+        }
+        cells[TRICK_ARROW_CELL].innerHTML = `<span>${LEAD_ARROWS[newPlay.seat]}</span>`;
+    }
+
+    setTrickCard(cells[TRICK_CELLS[newPlay.seat]], newPlay);
+
+    if (newPlay.trick_winner) {
+        cells[TRICK_CELLS[newPlay.trick_winner]].querySelector("div")?.classList.add("throb-div");
+    }
+    grid.scrollIntoView();
+}
+
+/**
+ * @param {Element} cell - Holds the player's name, then <div><span>card</span></div>
+ * @param {Object|null} play - What to show; null for "nothing yet"
+ */
+function setTrickCard(cell, play) {
+    const div = cell.querySelector("div");
+    const span = div?.querySelector("span");
+    if (!span) {
+        return;
+    }
+
+    div.className = play ? play.suit : "";
+    span.style.color = play ? play.color : "black";
+    span.textContent = play ? play.text : "__";
+}
+
+/**
+ * Enable just the calls or cards that we may make right now, and dim the cards that the next player may not play.
+ */
+function applyTurn() {
+    if (deltaState.hasPlayerStream && deltaState.playerNumActions !== deltaState.numActions) {
+        // Wait until both streams have told us about the latest action.
+        return;
+    }
+
+    const mayAct = deltaState.hasPlayerStream && deltaState.mayAct;
+
+    const biddingBox = document.getElementById("bidding-box");
+    if (biddingBox !== null) {
+        updateBiddingBoxButtons(biddingBox, mayAct);
+    }
+
+    for (const seat of Object.keys(TRICK_CELLS)) {
+        const isNext = seat === deltaState.nextSeat;
+        document.getElementById(seat)?.querySelectorAll("[data-card]").forEach(card => {
+            const legal = isNext && deltaState.legal.includes(card.dataset.card);
+            setCardState(card, { active: legal && mayAct, dimmed: isNext && !legal });
+        });
+    }
+}
+
+/**
+ * Mirrors bidding_box_buttons: when it's our turn, legal calls are live and the rest disabled; otherwise everything is
+ * disabled and red, with the illegal calls struck through.
+ * @param {Element} biddingBox
+ * @param {boolean} mayAct
+ */
+function updateBiddingBoxButtons(biddingBox, mayAct) {
+    const background = document.getElementById("fiddle-my-background-daddy-o");
+    if (background !== null) {
+        background.style.backgroundColor = mayAct ? "lightgreen" : "white";
+    }
+
+    biddingBox.querySelectorAll('button[name="call"]').forEach(button => {
+        const legal = deltaState.legal.includes(button.value);
+        const active = mayAct && legal;
+        const text = button.querySelector("s")?.innerHTML ?? button.innerHTML;
+
+        if (mayAct) {
+            button.className = active ? "btn btn-primary confirm-click" : "btn btn-primary";
+            button.innerHTML = text;
+        } else {
+            button.className = "btn btn-danger";
+            button.innerHTML = legal ? text : `<s>${text}</s>`;
+        }
+        button.disabled = !active;
+        button.setAttribute("hx-trigger", "confirmed");
+    });
+
+    htmx.process(biddingBox);
+}
+
+/**
+ * Mirrors _get_card_html: a playable card is a button; any other card is a span that merely looks like one.
+ * @param {Element} card - Either of those, with a data-card attribute
+ * @param {Object} state
+ * @param {boolean} state.active - Should it be playable?
+ * @param {boolean} state.dimmed - Should it be faded out?
+ */
+function setCardState(card, { active, dimmed }) {
+    let target = card;
+
+    if (active !== (card.tagName === "BUTTON")) {
+        target = document.createElement(active ? "button" : "span");
+        target.dataset.card = card.dataset.card;
+        target.textContent = card.textContent.trim();
+        target.style.setProperty("--bs-btn-color", card.style.getPropertyValue("--bs-btn-color"));
+        target.style.setProperty("--bs-btn-bg", "#ccc");
+
+        if (active) {
+            target.type = "button";
+            target.className = "btn btn-primary confirm-click";
+            target.name = "card";
+            target.value = card.dataset.card;
+            target.setAttribute("hx-post", deltaState.playPostUrl);
+            target.setAttribute("hx-trigger", "confirmed");
+            target.setAttribute("hx-swap", "none");
+        } else {
+            target.className = "btn btn-primary inactive-button";
+        }
+
+        card.replaceWith(target);
+        if (active) {
+            htmx.process(target);
+        }
+    }
+
+    target.style.opacity = dimmed ? "25%" : "";
+}
+
 /**
  * Initialize carousel prev/next buttons
  */
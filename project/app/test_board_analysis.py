@@ -0,0 +1,26 @@
+from .models import Board, Hand
+
+
+def test_board_remembers_its_double_dummy_analysis(usual_setup: Hand) -> None:
+    board = usual_setup.board
+    board.north_cards = "".join("♠" + rank for rank in "AKQJT98765432")
+    board.east_cards = "".join("♥" + rank for rank in "AKQJT98765432")
+    board.south_cards = "".join("♦" + rank for rank in "AKQJT98765432")
+    board.west_cards = "".join("♣" + rank for rank in "AKQJT98765432")
+    board.save()
+    assert not board.is_analyzed
+    assert board.par_description is None
+
+    board.analyze()
+
+    board = Board.objects.get(pk=board.pk)
+    assert board.is_analyzed
+    tricks = board.double_dummy_tricks_by_seat
+    assert tricks is not None
+    # Strains are ♣ ♦ ♥ ♠ NT.  Whoever declares in their own suit, or their partner's, ruffs everything; at notrump,
+    # the opening leader runs their suit.
+    assert tricks["N"] == [0, 13, 0, 13, 0]
+    assert tricks["E"] == [13, 0, 13, 0, 0]
+    assert board.par_score is not None and board.par_score > 0
+    assert board.par_description is not None
+    assert "7♠ by N, making" in board.par_description
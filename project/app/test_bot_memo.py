@@ -0,0 +1,33 @@
+from bridge.card import Suit
+from bridge.contract import Bid
+
+from .models import Hand, bot_memo
+from .testutils import set_auction_to
+
+
+def test_second_table_to_reach_an_auction_gets_the_remembered_call(usual_setup: Hand) -> None:
+    h = usual_setup
+    bot_memo.lookups.clear()
+
+    first = bot_memo.call(h)
+    assert bot_memo.lookups == {("call", "miss"): 1}
+
+    # Another table, playing the same board, that has got just as far.
+    again = bot_memo.call(Hand.objects.get(pk=h.pk))
+    assert bot_memo.lookups == {("call", "miss"): 1, ("call", "hit"): 1}
+    assert again == first
+
+    h.add_call(call=first)
+    bot_memo.call(h)
+    assert bot_memo.lookups[("call", "miss")] == 2
+
+
+def test_second_table_to_reach_a_position_gets_the_remembered_card(usual_setup: Hand) -> None:
+    h = usual_setup
+    set_auction_to(Bid(level=1, denomination=Suit.DIAMONDS), h)
+    bot_memo.lookups.clear()
+
+    first = bot_memo.play(h)
+    again = bot_memo.play(Hand.objects.get(pk=h.pk))
+    assert again == first
+    assert bot_memo.lookups == {("play", "miss"): 1, ("play", "hit"): 1}
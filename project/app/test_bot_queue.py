@@ -0,0 +1,36 @@
+import math
+
+from bridge.contract import Call as libCall
+
+from .models import Hand, bot_queue
+
+
+def test_ready_queue_follows_whose_turn_it_is(
+    usual_setup: Hand, django_capture_on_commit_callbacks
+) -> None:
+    h = usual_setup
+    Hand.objects.fill_in_missing_next_actors()
+    h.refresh_from_db()
+    first = h.player_who_may_call
+    assert first is not None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        if first.allow_bot_to_play_for_me:
+            first.toggle_bot()
+    assert bot_queue.pop_due(now=math.inf) is None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.toggle_bot()
+    due = h.last_action_time.timestamp() + h.board.tournament.tempo_seconds
+    assert bot_queue.next_due() == due
+    assert bot_queue.pop_due(now=due - 1) is None
+    assert bot_queue.pop_due(now=due) == (h.pk, due)
+    assert bot_queue.pop_due(now=math.inf) is None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        h.add_call(call=libCall.deserialize("Pass"))
+
+    second = h.player_who_may_call
+    assert second is not None
+    second.refresh_from_db(fields=["allow_bot_to_play_for_me"])
+    assert (bot_queue.pop_due(now=math.inf) is not None) == second.allow_bot_to_play_for_me
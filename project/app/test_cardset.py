@@ -0,0 +1,48 @@
+from bridge.card import Card, Suit
+from bridge.contract import Bid
+
+from .models import Hand, cardset
+from .testutils import set_auction_to
+
+
+def cs(*serialized: str) -> cardset.CardSet:
+    return cardset.from_cards(Card.deserialize(c) for c in serialized)
+
+
+def test_round_trip() -> None:
+    hand = cs("♠A", "♣2", "♥T", "♦K")
+    assert [c.serialize() for c in cardset.cards(hand)] == ["♣2", "♦K", "♥T", "♠A"]
+    assert hand.bit_count() == 4
+    assert cardset.from_card_string("♠A♣2♥T♦K") == hand
+
+
+def test_must_follow_suit_if_possible() -> None:
+    hand = cs("♠A", "♠3", "♥T", "♦K")
+    spades = cardset.suit_index(Card.deserialize("♠2"))
+    clubs = cardset.suit_index(Card.deserialize("♣2"))
+
+    assert cardset.legal(hand, led_suit=None) == hand
+    assert cardset.legal(hand, led_suit=spades) == cs("♠A", "♠3")
+    assert cardset.legal(hand, led_suit=clubs) == hand
+
+
+def test_skeleton_agrees_with_the_transcript(usual_setup: Hand) -> None:
+    h = usual_setup
+    set_auction_to(Bid(level=1, denomination=Suit.CLUBS), h)
+
+    # A lead, so that the next player may have to follow suit.
+    ns = h.next_seat_to_play
+    assert ns is not None
+    h.add_play_from_model_player(
+        player=h.player_who_controls_seat(ns, right_this_second=True),
+        card=h.get_xscript().slightly_less_dumb_play().card,
+    )
+
+    ns = h.next_seat_to_play
+    assert ns is not None
+    remaining = h.current_cards_by_seat()[ns]
+    legal = set(h.get_xscript().legal_cards(some_cards=list(remaining)))
+
+    for suit, holding in h.display_skeleton()[ns].items():
+        assert set(holding.cards_of_one_suit) == {c for c in remaining if c.suit == suit}
+        assert holding.legal_now == any(c in legal for c in holding.cards_of_one_suit)
@@ -50,7 +50,8 @@ def test_dummy_checkbox_updates_when_contract_determined(usual_setup: Hand) -> N
 
         # Verify the HTML contains disabled attribute
         html_call = dummy_updates[0]
-        assert html_call.kwargs["event_type"] == "message"
+        # Named for the multiplexed player stream; /events/player/bot-checkbox/ still delivers it as "message".
+        assert html_call.kwargs["event_type"] == "bot-checkbox"
         html_content = html_call.kwargs["data"]
         assert "disabled" in html_content, "Checkbox should be disabled for dummy"
         assert "dummy" in html_content.lower(), "Should indicate this is dummy"
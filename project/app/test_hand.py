@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import collections
+import contextvars
 from typing import Any
 
 import pytest
@@ -12,8 +13,18 @@ from bridge.contract import Bid as libBid
 from bridge.contract import Pass as libPass
 from bridge.seat import Seat as libSeat
 from bridge.table import Player as libPlayer
-
-from .models import AuctionError, Board, Hand, Player, board, hand
+from bridge.xscript import HandTranscript
+
+from .models import (
+    AuctionError,
+    Board,
+    Hand,
+    Player,
+    board,
+    hand,
+    xscript_codec,
+    xscript_store,
+)
 from .testutils import set_auction_to
 from .views.hand import (
     _bidding_box_context_for_hand,
@@ -287,6 +298,61 @@ def test_next_seat_to_play(usual_setup: Hand) -> None:
     assert h.next_seat_to_play.name == "East"
 
 
+def test_next_actor_fields_say_whose_turn_it_is(usual_setup: Hand) -> None:
+    h = usual_setup
+
+    # The fixture predates these fields.
+    Hand.objects.fill_in_missing_next_actors()
+    h.refresh_from_db()
+
+    first = h.player_who_may_call
+    assert first is not None
+    assert h.next_actor_player == first
+    assert list(Hand.objects.waiting_on(first)) == [h]
+
+    set_auction_to(libBid(level=1, denomination=libSuit.DIAMONDS), h)
+    h.refresh_from_db()
+    assert h.next_actor_seat == libSeat.EAST.value
+    assert h.next_actor_player == h.East
+
+    h.add_play_from_model_player(player=h.East, card=h.get_xscript().slightly_less_dumb_play().card)
+    h.refresh_from_db()
+
+    # Dummy's turn; but declarer plays for dummy.
+    assert h.next_actor_seat == libSeat.SOUTH.value
+    assert h.next_actor_player == h.North
+    assert list(h.North.hands_waiting_on_me) == [h]
+
+    was_bot = h.next_actor_is_bot
+    h.North.toggle_bot()
+    h.refresh_from_db()
+    assert h.next_actor_is_bot is not was_bot
+    assert (h in Hand.objects.bot_is_due_to_act_on()) is not was_bot
+
+
+def test_stale_instances_leave_the_next_actor_fields_alone(usual_setup: Hand) -> None:
+    h = usual_setup
+    Hand.objects.fill_in_missing_next_actors()
+
+    stale = Hand.objects.get(pk=h.pk)
+
+    with xscript_store.request_scope():
+        # Remembers the transcript as of now, before anyone's called ...
+        assert stale.next_seat_to_call is not None
+
+        # ... while someone else, with their own request scope, calls.
+        contextvars.Context().run(h.add_call, call=libBid(level=1, denomination=libSuit.CLUBS))
+        h.refresh_from_db()
+        seat, player = h.next_actor_seat, h.next_actor_player_id
+        assert seat is not None
+
+        # As if we'd just acted, but were slower to get here than they were.
+        assert not stale._update_next_actor()
+
+    h.refresh_from_db()
+    assert (h.next_actor_seat, h.next_actor_player_id) == (seat, player)
+
+
 def test_sends_message_on_auction_completed(usual_setup: Hand, monkeypatch) -> None:
     h = usual_setup
 
@@ -304,6 +370,92 @@ def test_sends_message_on_auction_completed(usual_setup: Hand, monkeypatch) -> N
     assert any("contract" in e for e in sent_events_by_channel[f"table:html:{h.pk}"])
 
 
+def test_stale_instances_dont_clobber_each_other(usual_setup: Hand) -> None:
+    h1 = usual_setup
+    h2 = Hand.objects.get(pk=h1.pk)
+
+    h1.add_call(call=libBid(level=1, denomination=libSuit.CLUBS))
+
+    # h2 was loaded before that call was made, but it builds on it rather than replacing it.
+    h2.add_call(call=libPass)
+    assert h2.num_actions == 2
+
+    h1 = Hand.objects.get(pk=h1.pk)
+    assert h1.num_actions == 2
+    assert len(h1.get_xscript().auction.player_calls) == 2
+
+    entry = xscript_store.get(h1.pk)
+    assert entry is not None
+    assert entry.version == 2
+
+
+def test_stale_cached_transcript_catches_up_without_queries(
+    usual_setup: Hand, django_assert_num_queries
+) -> None:
+    h = usual_setup
+    h.add_call(call=libBid(level=1, denomination=libSuit.CLUBS))
+    stale = xscript_store.get(h.pk)
+    assert stale is not None
+
+    h.add_call(call=libPass)
+    h.add_call(call=libPass)
+
+    xscript_store.delete(h.pk)
+    assert xscript_store.compare_and_set(h.pk, expected_version=None, entry=stale)
+
+    h = Hand.objects.prepop().get(pk=h.pk)
+    assert h.action_log == xscript_codec.to_action_log(
+        calls=xscript_codec.encode_calls(["1♣", "Pass", "Pass"]), plays=b""
+    )
+
+    # Everything missing from the cache is in the action log, which came along with the hand.
+    with django_assert_num_queries(0):
+        assert len(h.get_xscript().auction.player_calls) == 3
+
+    entry = xscript_store.get(h.pk)
+    assert entry is not None
+    assert entry.version == 3
+
+
+def test_hand_state_is_derived_once_per_action(usual_setup: Hand, monkeypatch) -> None:
+    h = usual_setup
+    set_auction_to(libBid(level=1, denomination=libSuit.CLUBS), h)
+
+    derivations = []
+    real_from_xscript = hand.HandState.from_xscript
+
+    def counting_from_xscript(cls, xscript):
+        derivations.append(xscript)
+        return real_from_xscript(xscript)
+
+    monkeypatch.setattr(hand.HandState, "from_xscript", classmethod(counting_from_xscript))
+
+    scorings = []
+    real_final_score = HandTranscript.final_score
+
+    def counting_final_score(self):
+        scorings.append(self)
+        return real_final_score(self)
+
+    monkeypatch.setattr(HandTranscript, "final_score", counting_final_score)
+
+    with xscript_store.request_scope():
+        ns = h.next_seat_to_play
+        assert ns is not None
+        assert h.declarer is not None
+        assert h.dummy is not None
+        assert h.current_trick is None
+        assert h.trick_counts_string() == '{"N/S": 0, "E/W": 0}'
+        h.player_who_controls_seat(ns, right_this_second=True)
+        h.display_skeleton()
+        # Nobody's asked for the score, and it's not over anyway.
+        assert not scorings
+        assert h.state.final_score is None
+        assert not scorings
+
+    assert len(derivations) == 1
+
+
 def test_board_attributes_from_display_number():
     with pytest.raises(AssertionError):
         board.board_attributes_from_display_number(display_number=0, rng_seeds=[])
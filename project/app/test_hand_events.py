@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import collections
+import contextlib
 import itertools
 
 import bridge.card
 import bridge.contract
 import pytest
+from django.db import transaction
 
 import app.models
+import app.sse_fanout
+import app.sse_outbox
 import app.views
+import app.views.hand
 from . import testutils
 
 
@@ -63,12 +68,210 @@ def test_auction_settled_messages(usual_setup, sent_events_by_channel) -> None:
 
     assert sum(["contract" in e["data"] for e in table_HTML_events]) == 1
 
+    # Each player gets the "play" slides to swap in, rather than reloading the page.
+    phases = [e["data"]["phase_html"] for e in player_HTML_events if "phase_html" in e["data"]]
+    assert len(phases) == 4
+    assert all('id="hand-phase"' in html and "Current Trick" in html for html in phases)
+
     # Between two and four bidding box HTMLs per call.  Two would be if we were efficient, and only re-sent them when
     # they went from active to inactive, or vice-versa; four would be if we were dumb and just always sent it, even if
     # it was inactive on the last call and is inactive on the current call.
     assert 2 * 4 <= sum(["bidding_box_html" in e["data"] for e in player_HTML_events]) <= 4 * 4
 
 
+def test_bidding_box_is_rendered_once_per_variant(
+    usual_setup, sent_events_by_channel, monkeypatch
+) -> None:
+    h = usual_setup
+
+    templates_rendered: collections.Counter[str] = collections.Counter()
+    real_render_to_string = app.views.hand.render_to_string
+
+    def counting_render_to_string(template_name, *args, **kwargs):
+        templates_rendered[template_name] += 1
+        return real_render_to_string(template_name, *args, **kwargs)
+
+    monkeypatch.setattr(app.views.hand, "render_to_string", counting_render_to_string)
+
+    h.add_call(call=bridge.contract.Bid(level=1, denomination=bridge.card.Suit.CLUBS))
+
+    bidding_boxes_sent = [
+        e
+        for channel, events in sent_events_by_channel.items()
+        if "player:html:" in channel
+        for e in events
+        if "bidding_box_html" in e["data"]
+    ]
+
+    # Every player gets one, but there are only two distinct ones: for whoever may call next, and for everyone else.
+    assert len(bidding_boxes_sent) == 4
+    assert templates_rendered["bidding-box.html"] == 2
+
+
+def test_nothing_is_published_if_the_action_fails(sent_events_by_channel) -> None:
+    with pytest.raises(ZeroDivisionError), app.sse_fanout.collect(send=app.models.hand.send_event):
+        app.models.hand.send_timestamped_event(channel="table:html:1", data={"hello": "world"})
+        1 / 0  # noqa: B018
+
+    assert not sent_events_by_channel
+
+    with app.sse_fanout.collect(send=app.models.hand.send_event):
+        app.models.hand.send_timestamped_event(channel="table:html:1", data={"hello": "world"})
+        assert not sent_events_by_channel
+
+    assert [e["data"]["hello"] for e in sent_events_by_channel["table:html:1"]] == ["world"]
+
+
+def test_events_are_published_only_after_commit(
+    usual_setup, sent_events_by_channel, settings, django_capture_on_commit_callbacks
+) -> None:
+    settings.SSE_OUTBOX_SYNCHRONOUS = False
+    h = usual_setup
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        h.add_call(call=bridge.contract.Bid(level=1, denomination=bridge.card.Suit.CLUBS))
+        assert not sent_events_by_channel
+
+    for c in callbacks:
+        c()
+    app.sse_outbox.drain()
+
+    assert any(
+        "new-call" in e["data"]
+        for channel, events in sent_events_by_channel.items()
+        if "player:json:" in channel
+        for e in events
+    )
+
+
+def test_events_are_dropped_on_rollback(
+    sent_events_by_channel, settings, django_capture_on_commit_callbacks
+) -> None:
+    settings.SSE_OUTBOX_SYNCHRONOUS = False
+
+    with (
+        django_capture_on_commit_callbacks() as callbacks,
+        contextlib.suppress(ZeroDivisionError),
+        transaction.atomic(),
+    ):
+        app.models.hand.send_timestamped_event(channel="table:html:1", data={"hello": "world"})
+        1 / 0  # noqa: B018
+
+    assert not callbacks
+    assert not sent_events_by_channel
+
+
+def test_coalescing_keeps_the_newest_fields_but_respects_phase_transitions() -> None:
+    def send(**kwargs) -> None:
+        pass
+
+    def fanout(*events: tuple[str, dict]) -> app.sse_fanout.Fanout:
+        f = app.sse_fanout.Fanout(send=send)
+        for channel, data in events:
+            f.add(channel=channel, data=data)
+        return f
+
+    table = "table:html:1"
+    player = "player:html:hand:1"
+    bot = "player:json:1"
+
+    [merged] = app.sse_fanout.coalesce(
+        [
+            fanout(
+                (table, {"trick_html": "one", "trick_counts_string": "0/0"}), (bot, {"new-play": 1})
+            ),
+            fanout((table, {"trick_html": "two"}), (bot, {"new-play": 2})),
+            fanout((player, {"current_hand_direction": "North", "current_hand_html": "N"})),
+            fanout((player, {"current_hand_direction": "East", "current_hand_html": "E"})),
+            fanout((table, {"final_score": {"text": "Passed Out"}})),
+            fanout((table, {"trick_html": "three"})),
+        ]
+    )
+
+    assert [(e.channel, e.data) for e in merged.events] == [
+        (table, {"trick_html": "two", "trick_counts_string": "0/0"}),
+        (bot, {"new-play": 1}),
+        (bot, {"new-play": 2}),
+        (player, {"current_hand_direction": "North", "current_hand_html": "N"}),
+        (player, {"current_hand_direction": "East", "current_hand_html": "E"}),
+        (table, {"final_score": {"text": "Passed Out"}}),
+        (table, {"trick_html": "three"}),
+    ]
+
+
+def test_unfamiliar_eventstream_means_publishing_one_event_at_a_time(monkeypatch) -> None:
+    import django_eventstream.utils
+
+    monkeypatch.delattr(django_eventstream.utils, "publish_event")
+    app.sse_fanout.eventstream_internals.cache_clear()
+    try:
+        assert app.sse_fanout.eventstream_internals() is None
+
+        sent = []
+
+        def send_event(**kwargs) -> None:
+            sent.append(kwargs["channel"])
+
+        monkeypatch.setattr(django_eventstream, "send_event", send_event)
+
+        f = app.sse_fanout.Fanout(send=send_event)
+        f.add(channel="table:html:1", data={"trick_html": "one"})
+        f.add(channel="player:json:1", data={"new-play": 1})
+        f.publish()
+
+        assert sent == ["table:html:1", "player:json:1"]
+    finally:
+        monkeypatch.undo()
+        app.sse_fanout.eventstream_internals.cache_clear()
+
+
+def test_delta_events_describe_the_action_rather_than_rendering_it(
+    usual_setup, sent_events_by_channel, settings
+) -> None:
+    settings.SSE_DELTA_EVENTS = True
+    h: app.models.Hand = usual_setup
+
+    testutils.set_auction_to(
+        bridge.contract.Bid(level=1, denomination=bridge.card.Suit.DIAMONDS),
+        h,
+    )
+    num_calls = h.num_actions
+
+    opening_leader = h.next_seat_to_play
+    assert opening_leader is not None
+    h.add_play_from_model_player(
+        player=h.player_who_controls_seat(seat=opening_leader, right_this_second=True),
+        card=bridge.card.Card.deserialize("d2"),
+    )
+
+    events = list(itertools.chain.from_iterable(sent_events_by_channel.values()))
+    table_deltas = [
+        e["data"] for e in events if "num_actions" in e["data"] and "legal" in e["data"]
+    ]
+
+    new_calls = [d["new_call"] for d in table_deltas if "new_call" in d]
+    assert len(new_calls) == num_calls
+    assert new_calls[0]["serialized"] == "1♦"
+
+    [lead] = [d for d in table_deltas if "new_play" in d]
+    assert lead["num_actions"] == num_calls + 1
+    assert lead["new_play"]["seat"] == opening_leader.name
+    assert lead["new_play"]["serialized"] == "♦2"
+    assert lead["new_play"]["leads_trick"]
+    assert lead["next_seat"] == opening_leader.lho().name
+    assert lead["legal"]
+
+    assert not any("auction_history_html" in e["data"] or "trick_html" in e["data"] for e in events)
+    assert not any("bidding_box_html" in e["data"] for e in events)
+
+    # Just one player may act after each action.
+    may_act_by_action: dict[int, int] = collections.Counter()
+    for e in events:
+        if "may_act" in e["data"]:
+            may_act_by_action[e["data"]["num_actions"]] += e["data"]["may_act"]
+    assert set(may_act_by_action.values()) == {1}
+
+
 def test_player_can_always_see_played_hands(two_boards_one_is_complete) -> None:
     p1 = app.models.Player.objects.get(pk=1)
     hand_count_before = p1.hands_played.count()
@@ -90,6 +293,58 @@ def test_sends_final_score(monkeypatch, sent_events_by_channel) -> None:
 
     assert any("final_score" in e["data"] for e in sent_events_by_channel["table:html:1"])
 
+    # The players get the review to swap in, rather than reloading the page.
+    for p in h1.players():
+        [review] = [
+            e["data"]
+            for e in sent_events_by_channel[p.event_HTML_hand_channel]
+            if "review_html" in e["data"]
+        ]
+        assert "Review of" in review["review_html"]
+
+
+@pytest.mark.usefixtures("two_boards_one_of_which_is_played_almost_to_completion")
+def test_finished_hands_end_their_table_stream(
+    sent_events_by_channel, django_capture_on_commit_callbacks, client
+) -> None:
+    from .models import Hand
+
+    h1: Hand = Hand.objects.get(pk=1)
+    player = h1.player_who_may_play
+    assert player is not None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        h1.add_play_from_model_player(player=player, card=bridge.card.Card.deserialize("♠A"))
+
+    last_event = sent_events_by_channel["table:html:1"][-1]
+    assert last_event["event_type"] == "hand-over"
+    assert last_event["data"] == {"hand_over": "hand over"}
+    assert app.models.channel_acl.closed(["table:html:1"]).keys() == {"table:html:1"}
+
+    # Strangers don't get our shortcut; django-eventstream turns them away, as it always has.
+    response = client.get("/events/table/html/1/")
+    assert response.streaming
+
+    # Browsers that come back get told to go away, rather than a stream.
+    client.force_login(player.user)
+    response = client.get("/events/table/html/1/")
+    assert response.status_code == 200
+    assert not response.streaming
+    assert response.content.startswith(b"retry: ")
+    assert b"event: hand-over\n" in response.content
+    assert b'"hand_over": "hand over"' in response.content
+
+
+def test_abandoned_hands_end_their_table_stream(usual_setup, sent_events_by_channel) -> None:
+    h = usual_setup
+    channel = h.event_table_html_channel
+
+    for p in h.players():
+        p.abandon_my_hand(reason="testing")
+
+    hand_overs = [e for e in sent_events_by_channel[channel] if e["event_type"] == "hand-over"]
+    assert [e["data"]["hand_over"] for e in hand_overs] == ["hand over"]
+
 
 def test_includes_dummy_in_new_play_event_for_opening_lead(
     usual_setup, sent_events_by_channel, monkeypatch
@@ -6,7 +6,8 @@ from django.template.response import TemplateResponse
 import bridge.card
 import bridge.contract
 
-from .models import Board, Hand, Player, Tournament
+from .models import Board, Hand, Player, Tournament, xscript_store
+from .testutils import set_auction_to
 from .views.board import board_archive_view
 from .views.hand import HandListView, _interactive_view, hand_serialized_view
 from .views.tournament import tournament_view
@@ -47,6 +48,23 @@ def test__interactive_view_doesnt_do_a_shitton_of_queries(
         _interactive_view(request, h)
 
 
+def test__interactive_view_fetches_the_transcript_just_once(usual_setup: Hand, rf) -> None:
+    h = usual_setup
+    set_auction_to(bridge.contract.Bid(level=1, denomination=bridge.card.Suit.CLUBS), h)
+
+    request = rf.get("/woteva/", data={"pk": h.pk})
+    p = Player.objects.first()
+    assert p is not None
+    request.user = p.user
+
+    before = xscript_store.round_trips.copy()
+    with xscript_store.request_scope():
+        _interactive_view(request, h)
+
+    assert xscript_store.round_trips["get"] - before["get"] <= 1
+    assert xscript_store.round_trips["compare_and_set"] == before["compare_and_set"]
+
+
 def test_tournament_detail_view_doesnt_do_a_shitton_of_queries(
     nearly_completed_tournament, rf, django_assert_max_num_queries
 ) -> None:
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import importlib
 
@@ -5,7 +6,9 @@ from django.conf import settings
 from django.contrib import auth
 from freezegun import freeze_time
 
-from app.models import Hand, Player, Tournament
+import app.views.events
+from app.models import Hand, Player, Tournament, channel_acl
+from app.sse_channels import SSEChannels
 
 
 def test_player_messages_are_private(usual_setup, everybodys_password) -> None:
@@ -35,6 +38,101 @@ def test_player_messages_are_private(usual_setup, everybodys_password) -> None:
     assert not cm.can_read_channel(j_random_user, the_hand.event_table_html_channel)
 
 
+def test_multiplexed_stream_carries_the_players_channels_and_their_table(
+    usual_setup, rf, everybodys_password
+) -> None:
+    module_name, class_name = settings.EVENTSTREAM_CHANNELMANAGER_CLASS.rsplit(".", maxsplit=1)
+    cm = getattr(importlib.import_module(module_name), class_name)()
+
+    north = Player.objects.get_by_name("Jeremy Northam")
+    the_hand = Hand.objects.first()
+    assert the_hand is not None
+
+    view_kwargs = {
+        "player_id": north.pk,
+        "format-channels": ["player:html:hand:{player_id}", "player:bot-checkbox:{player_id}"],
+        "multiplexed": True,
+    }
+    request = rf.get(f"/events/player/{north.pk}/", {"table": [the_hand.pk, "nonsense"]})
+    request.user = north.user
+
+    channels = cm.get_channels_for_request(request, view_kwargs)
+    assert channels == {
+        north.event_HTML_hand_channel,
+        north.bot_checkbox_channel,
+        the_hand.event_table_html_channel,
+    }
+    assert all(cm.can_read_channel(north, c) for c in channels)
+
+    assert {SSEChannels.event_type(c) for c in channels} == {
+        "player-html",
+        "bot-checkbox",
+        "table-html",
+    }
+    assert SSEChannels.event_type(north.event_JSON_hand_channel) == "message"
+
+    # Someone who may not watch the table still gets their own events.
+    kibitzer = Player.objects.create(
+        user=auth.models.User.objects.create(username="kibitzer", password=everybodys_password)
+    )
+    request = rf.get(f"/events/player/{kibitzer.pk}/", {"table": the_hand.pk})
+    request.user = kibitzer.user
+
+    kibitzer_channels = cm.get_channels_for_request(
+        request, view_kwargs | {"player_id": kibitzer.pk}
+    )
+    assert kibitzer_channels == {kibitzer.event_HTML_hand_channel, kibitzer.bot_checkbox_channel}
+    assert all(cm.can_read_channel(kibitzer, c) for c in kibitzer_channels)
+
+
+def test_multiplexed_stream_is_served(usual_setup, client) -> None:
+    north = Player.objects.get_by_name("Jeremy Northam")
+    the_hand = Hand.objects.first()
+    assert the_hand is not None
+
+    client.force_login(north.user)
+    response = client.get(f"/events/player/{north.pk}/", {"table": the_hand.pk})
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "text/event-stream"
+
+
+def test_per_channel_endpoints_still_get_plain_messages() -> None:
+    async def chunks():
+        yield b'event: table-html\nid: table%3Ahtml%3A1:7\ndata: {"trick_html": "event: bot-checkbox"}\n\n'
+        yield b"event: player-html\ndata: {}\n\nevent: hand-over\ndata: {}\n\n"
+
+    async def collect() -> list[bytes]:
+        return [c async for c in app.views.events._as_plain_messages(chunks())]
+
+    assert asyncio.run(collect()) == [
+        b'event: message\nid: table%3Ahtml%3A1:7\ndata: {"trick_html": "event: bot-checkbox"}\n\n',
+        b"event: message\ndata: {}\n\nevent: hand-over\ndata: {}\n\n",
+    ]
+
+
+def test_table_channel_decisions_are_cached(usual_setup, django_assert_num_queries) -> None:
+    module_name, class_name = settings.EVENTSTREAM_CHANNELMANAGER_CLASS.rsplit(".", maxsplit=1)
+    cm = getattr(importlib.import_module(module_name), class_name)()
+
+    north = Player.objects.get_by_name("Jeremy Northam")
+    the_hand = Hand.objects.first()
+    assert the_hand is not None
+    channel = the_hand.event_table_html_channel
+
+    channel_acl.forget([north.pk])
+    assert cm.can_read_channel(north, channel)
+
+    with django_assert_num_queries(0):
+        assert cm.can_read_channel(north, channel)
+
+    # Getting up from the table is one of the things that makes us reconsider.
+    north.abandon_my_hand()
+    assert channel_acl.get(player_pk=north.pk, channel=channel) is None
+    assert cm.can_read_channel(north, channel)
+
+
 def test_player_timestamp_updates(db, everybodys_password) -> None:
     Today = datetime.datetime.fromisoformat("2020-02-20T20:20:20Z")
 
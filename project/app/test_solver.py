@@ -0,0 +1,45 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from . import solver
+from .models import Hand
+
+
+def test_solver_turns_away_requests_past_its_limit(usual_setup: Hand, settings) -> None:
+    h = usual_setup
+    xscript = h.get_xscript()
+    solver.outcomes.clear()
+
+    first = solver.call(xscript)
+    assert solver.outcomes == {("call", "ok"): 1}
+    assert solver.call(xscript) == first
+
+    settings.SOLVER_MAX_PENDING = 0
+
+    with pytest.raises(solver.Busy):
+        solver.call(xscript, wait=False)
+
+    # Someone who can wait, waits -- but not forever.
+    with pytest.raises(solver.Busy):
+        solver.call(xscript, timeout=0.1)
+
+    assert solver.outcomes[("call", "busy")] == 2
+
+
+def test_hint_says_try_again_when_the_solver_is_busy(usual_setup: Hand, settings) -> None:
+    h = usual_setup
+    p = h.player_who_may_call
+    assert p is not None
+
+    c = Client()
+    c.force_login(p.user)
+
+    settings.SOLVER_MAX_PENDING = 0
+    response = c.get(reverse("app:hint", kwargs={"player_pk": p.pk}))
+    assert response.status_code == 200
+    assert "try again" in response.content.decode()
+
+    settings.SOLVER_MAX_PENDING = 1
+    response = c.get(reverse("app:hint", kwargs={"player_pk": p.pk}))
+    assert "If I were you" in response.content.decode()
@@ -0,0 +1,57 @@
+import datetime
+
+import pytest
+from django_eventstream.storage import EventDoesNotExist  # type: ignore [import-untyped]
+from freezegun import freeze_time
+
+from .sse_replay import RingBufferStorage
+
+
+@pytest.fixture
+def storage(settings) -> RingBufferStorage:
+    settings.SSE_REPLAY_MAX_EVENTS = 3
+    settings.SSE_REPLAY_MAX_AGE_SECONDS = 60
+    return RingBufferStorage()
+
+
+def test_reconnecting_client_gets_what_it_missed(storage, request) -> None:
+    channel = f"table:html:{request.node.name}"
+    assert storage.get_current_id(channel) == 0
+
+    first, second = storage.append_events(
+        [(channel, "table-html", '{"n": 1}'), (channel, "table-html", '{"n": 2}')]
+    )
+    assert (first.id, second.id) == (1, 2)
+    assert storage.get_current_id(channel) == 2
+
+    assert storage.get_events(channel, 2) == []
+    assert [(e.id, e.type, e.data) for e in storage.get_events(channel, 1)] == [
+        (2, "table-html", '{"n": 2}')
+    ]
+
+
+def test_buffer_is_bounded_by_size(storage, request) -> None:
+    channel = f"table:html:{request.node.name}"
+    for n in range(5):
+        storage.append_event(channel, "table-html", f'{{"n": {n}}}')
+
+    assert [e.id for e in storage.get_events(channel, 2)] == [3, 4, 5]
+
+    # Event 2 has fallen off the end, so someone who last saw event 1 missed it for good.
+    with pytest.raises(EventDoesNotExist):
+        storage.get_events(channel, 1)
+
+
+def test_buffer_is_bounded_by_age(storage, request) -> None:
+    channel = f"table:html:{request.node.name}"
+    start = datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+
+    with freeze_time(start):
+        storage.append_event(channel, "table-html", '{"n": 1}')
+        storage.append_event(channel, "table-html", '{"n": 2}')
+
+    with freeze_time(start + datetime.timedelta(seconds=30)):
+        assert [e.id for e in storage.get_events(channel, 1)] == [2]
+
+    with freeze_time(start + datetime.timedelta(seconds=61)), pytest.raises(EventDoesNotExist):
+        storage.get_events(channel, 1)
@@ -110,6 +110,30 @@ def test_first_hand_to_end_in_a_round(small_tournament_during_play: Tournament)
     assert small_tournament_during_play.hands().count() == 3
 
 
+def test_all_bot_hand_gets_played_out_at_once_if_the_tournament_says_so(
+    small_tournament_during_play: Tournament,
+) -> None:
+    t = small_tournament_during_play
+    h = t.hands().filter(table_display_number=1).first()
+    assert h is not None
+    assert not h.play_out_if_all_bots()
+    assert h.num_actions == 0
+
+    t.turbo_bot_hands = True
+    t.save()
+
+    h = Hand.objects.get(pk=h.pk)
+    assert h.play_out_if_all_bots()
+
+    h = Hand.objects.get(pk=h.pk)
+    assert h.is_complete
+    assert h.num_actions == h.call_set.count() + h.play_set.count() > 0
+    assert h.next_actor_seat is None
+
+    # Just as if it had been played a card at a time: the next board is ready at this table.
+    assert t.hands().count() == 3
+
+
 def test_last_hand_to_end_in_a_round(small_tournament_during_play: Tournament) -> None:
     mvmt = small_tournament_during_play.get_movement()
 
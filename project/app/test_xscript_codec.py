@@ -0,0 +1,55 @@
+import pytest
+
+import bridge.card
+import bridge.contract
+
+from .models import Hand, xscript_codec, xscript_store
+from .testutils import play_out_hand
+
+
+def test_every_card_and_call_has_its_own_code() -> None:
+    assert len(set(xscript_codec.CARDS)) == 52
+    assert len(set(xscript_codec.CALLS)) == 38
+
+    for c in xscript_codec.CARDS:
+        assert bridge.card.Card.deserialize(c).serialize() == c
+
+    for c in xscript_codec.CALLS:
+        assert bridge.contract.Bid.deserialize(c).serialize() == c
+
+
+def test_round_trip() -> None:
+    calls = ["1♣", "Pass", "1N", "Double", "Redouble", "7N", "Pass", "Pass", "Pass"]
+    plays = ["♦2", "♠A", "♣T", "♥K"]
+
+    blob = xscript_codec.pack(
+        board_pk=1234,
+        calls=xscript_codec.encode_calls(calls),
+        plays=xscript_codec.encode_plays(plays),
+    )
+    board_pk, call_codes, play_codes = xscript_codec.unpack(blob)
+
+    assert board_pk == 1234
+    assert xscript_codec.decode_calls(call_codes) == calls
+    assert xscript_codec.decode_plays(play_codes) == plays
+
+
+def test_rejects_garbage() -> None:
+    with pytest.raises(xscript_codec.CodecError):
+        xscript_codec.encode_plays(["♠1"])
+
+    with pytest.raises(xscript_codec.CodecError):
+        xscript_codec.unpack(b"\xff" + bytes(6))
+
+
+def test_rebuilt_transcript_matches_the_original(usual_setup: Hand) -> None:
+    h = usual_setup
+    play_out_hand(h)
+
+    entry = xscript_store.get(h.pk)
+    assert entry is not None
+    assert len(entry.plays) == 52
+    assert entry.xscript is None
+
+    rebuilt = h._xscript_from_entry(entry)
+    assert str(rebuilt.final_score()) == str(Hand.objects.get(pk=h.pk).get_xscript().final_score())
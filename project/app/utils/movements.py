@@ -159,7 +159,7 @@ class Movement:
     def ensure_boards(
         *, boards_per_round_per_table: int, num_tables: int, tournament: Tournament
     ) -> Generator[Board]:
-        from app.models import Board
+        from app.models import Board, board_analysis
 
         for group_index, display_numbers in enumerate(
             more_itertools.chunked(
@@ -171,6 +171,8 @@ class Movement:
                 a_board, created = Board.objects.get_or_create_from_display_number(
                     group=_group_letter(group_index), display_number=n, tournament=tournament
                 )
+                if created:
+                    board_analysis.analyze_in_background(a_board.pk)
                 yield a_board
 
     @classmethod
@@ -0,0 +1,112 @@
+"""
+Our front end for django-eventstream's view
+
+An event stream stays open for as long as the browser tab does.  django-eventstream only touches the database at the
+start -- to find the user, and to check that they may read the channels they asked for -- but Django doesn't close
+that connection until the response is finished, i.e. until the tab goes away.  So each subscriber used to pin a
+postgres connection for its whole life.
+
+Here we close the connection as soon as the authorization check is done, and again after each chunk we stream, in
+case django-eventstream needed to look something up again (it re-checks permissions when it rereads its storage).
+Nothing in the stream holds a connection, or a cursor, across chunks; the only ORM objects it keeps are the user and
+their player, which are plain data once loaded.
+
+Events on the channels that the multiplexed player stream carries are published with an event type naming their
+channel (see SSEChannels.event_type).  Anyone subscribed to one of those channels on its own endpoint -- e.g.
+/events/table/html/{hand_pk}/ -- has always gotten plain "message" events, so that's what we send them.
+
+Browsers keep reconnecting to a finished hand's table channel, too.  Once every channel a request asks for is closed
+(see channel_acl.close), we answer straight away with a "hand-over" event and a long `retry:`, and the browser stops
+listening -- provided that they may read those channels at all; anyone else gets django-eventstream's usual refusal.
+The permission checks are mostly answered from channel_acl's cache, so this rarely touches the database.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import AsyncIterator
+
+import django_eventstream.views  # type: ignore [import-untyped]
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.urls import path
+from django_eventstream.utils import (  # type: ignore [import-untyped]
+    add_default_headers,
+    get_channelmanager,
+)
+
+from app.models import channel_acl
+from app.sse_channels import SSEChannels
+from app.sse_events import HAND_OVER, create_table_event
+
+# How long a browser that ignores our "hand-over" event should wait before trying again.
+CLOSED_CHANNEL_RETRY_MILLISECONDS = 60 * 60 * 1000
+
+# django-eventstream starts each event with its "event:" line, and yields whole events at a time.
+_MULTIPLEXED_EVENT_LINE_RE = re.compile(
+    rb"^event: (?:"
+    + b"|".join(re.escape(t.encode()) for t in sorted(SSEChannels.multiplexed_event_types()))
+    + rb")$",
+    re.MULTILINE,
+)
+
+
+def events(request: HttpRequest, **kwargs) -> HttpResponse:
+    channelmanager = get_channelmanager()
+    channels = channelmanager.get_channels_for_request(request, kwargs)
+    if channels and channel_acl.closed(channels).keys() == channels:
+        # As django-eventstream decides who's asking.
+        user = request.user if request.user.is_authenticated else None
+        if all(channelmanager.can_read_channel(user, c) for c in channels):
+            return _closed_channels_response(request)
+
+    response = django_eventstream.views.events(request, **kwargs)
+
+    _close_db_connections()
+
+    if isinstance(response, StreamingHttpResponse) and response.is_async:
+        chunks = _closing_connections_between_chunks(response.streaming_content)
+        if not kwargs.get("multiplexed"):
+            chunks = _as_plain_messages(chunks)
+        response.streaming_content = chunks
+
+    return response
+
+
+async def _closing_connections_between_chunks(chunks: AsyncIterator) -> AsyncIterator:
+    # Database connections belong to a thread, and django-eventstream does its lookups in this request's
+    # thread-sensitive executor; a thread-sensitive sync_to_async runs there too, and so closes the right ones.
+    close = sync_to_async(_close_db_connections)
+
+    async for chunk in chunks:
+        yield chunk
+        await close()
+
+
+async def _as_plain_messages(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield _MULTIPLEXED_EVENT_LINE_RE.sub(b"event: message", chunk)
+
+
+def _closed_channels_response(request: HttpRequest) -> HttpResponse:
+    data = json.dumps(create_table_event(hand_over=HAND_OVER))
+    body = f"retry: {CLOSED_CHANNEL_RETRY_MILLISECONDS}\n\nevent: {SSEChannels.HAND_OVER_EVENT_TYPE}\ndata: {data}\n\n"
+
+    response = HttpResponse(body, content_type="text/event-stream")
+    add_default_headers(response, request=request)
+    return response
+
+
+def _close_db_connections() -> None:
+    for conn in connections.all(initialized_only=True):
+        # Nobody serving an event stream should be inside a transaction; but the unit tests are.
+        if not conn.in_atomic_block:
+            conn.close()
+
+
+# Use this wherever you'd otherwise `include(django_eventstream.urls)`.
+urlpatterns = [
+    path("", events),
+]
@@ -107,31 +107,37 @@ def _players_west_first_context_for_hand(
 
 
 def _bidding_box_context_for_hand(*, hand: Hand, as_viewed_by: app.models.Player) -> dict[str, Any]:
-    display_bidding_box = hand.auction.status is bridge.auction.Auction.Incomplete
+    if not as_viewed_by.has_played_hand(hand):
+        return {
+            "bidding_box_buttons": "No bidding box 'cuz you are not at this table",
+            "display_bidding_box": hand.auction.status is bridge.auction.Auction.Incomplete,
+            "disabled": True,
+        }
 
-    disabled = True
+    return _bidding_box_context_for_seated_player(
+        hand=hand, may_call=_player_may_call(hand=hand, player=as_viewed_by)
+    )
 
-    if not as_viewed_by.has_played_hand(hand):
-        buttons = "No bidding box 'cuz you are not at this table"
-    else:
-        allowed_caller = hand.auction.allowed_caller()
 
-        if hand.open_access:
-            disabled = False
-        else:
-            if allowed_caller is not None and (as_viewed_by.name == allowed_caller.name):
-                disabled = False
+def _player_may_call(*, hand: Hand, player: app.models.Player) -> bool:
+    if hand.open_access:
+        return True
 
-        buttons = bidding_box_buttons(
-            auction=hand.auction,
-            call_post_endpoint=reverse("app:call-post"),
-            disabled_because_out_of_turn=disabled,
-        )
+    allowed_caller = hand.auction.allowed_caller()
+    return allowed_caller is not None and player.name == allowed_caller.name
 
+
+# The bidding box looks the same to every player at the table who may not call, so the per-call fan-out renders it at
+# most twice: once for whoever may call, and once for everyone else.
+def _bidding_box_context_for_seated_player(*, hand: Hand, may_call: bool) -> dict[str, Any]:
     return {
-        "bidding_box_buttons": buttons,
-        "display_bidding_box": display_bidding_box,
-        "disabled": disabled,
+        "bidding_box_buttons": bidding_box_buttons(
+            auction=hand.auction,
+            call_post_endpoint=reverse("app:call-post"),
+            disabled_because_out_of_turn=not may_call,
+        ),
+        "display_bidding_box": hand.auction.status is bridge.auction.Auction.Incomplete,
+        "disabled": not may_call,
     }
 
 
@@ -200,7 +206,7 @@ def _get_card_html(
         return f"""<button
         type="button"
         class="btn btn-primary confirm-click"
-        name="card" value="{c.serialize()}"
+        name="card" value="{c.serialize()}" data-card="{c.serialize()}"
         style="--bs-btn-color: {c.color}; --bs-btn-bg: #ccc"
         hx-post="{reverse("app:play-post")}"
         hx-trigger="confirmed"
@@ -208,11 +214,11 @@ def _get_card_html(
         >{c}</button>"""
 
     # Meant to look like an active button, but without any hover action.
-    def card_text(text: str, *, suit_color: str, opacity: str) -> str:
+    def card_text(c: bridge.card.Card, *, opacity: str) -> str:
         return f"""<span
-        class="btn btn-primary inactive-button"
-        style="--bs-btn-color: {suit_color}; --bs-btn-bg: #ccc; {opacity}"
-        >{text}</span>"""
+        class="btn btn-primary inactive-button" data-card="{c.serialize()}"
+        style="--bs-btn-color: {c.color}; --bs-btn-bg: #ccc; {opacity}"
+        >{c}</span>"""
 
     suits = {}
     for suit, holding in sorted(all_four.items(), reverse=True):
@@ -226,11 +232,7 @@ def _get_card_html(
             )
 
             suits[suit.name()] = [
-                SafeString(
-                    _card_to_button(c)
-                    if active
-                    else card_text(str(c), suit_color=c.color, opacity=opacity)
-                )
+                SafeString(_card_to_button(c) if active else card_text(c, opacity=opacity))
                 for c in sorted(holding.cards_of_one_suit, reverse=True)
             ]
         else:
@@ -307,12 +309,28 @@ def _bidding_box_HTML_for_hand_for_player(hand: app.models.Hand, player: app.mod
     return render_to_string("bidding-box.html", context)
 
 
+def _bidding_box_HTML_for_seated_player(*, hand: app.models.Hand, may_call: bool) -> str:
+    context = _bidding_box_context_for_seated_player(hand=hand, may_call=may_call)
+    return render_to_string("bidding-box.html", context)
+
+
 def _three_by_three_HTML_for_trick(hand: app.models.Hand) -> str:
     xscript = hand.get_xscript()
     context = _three_by_three_trick_display_context_for_hand(hand, xscript)
     return render_to_string("3x3-trick-display.html", context)
 
 
+def _play_phase_HTML_for_player(*, hand: app.models.Hand, player: app.models.Player) -> str:
+    context = _four_hands_context_for_hand(as_viewed_by=player, hand=hand)
+    return render_to_string("interactive_hand.html#hand-phase", context)
+
+
+def _review_HTML_for_hand(hand: app.models.Hand) -> str:
+    # The same for everyone at the table, so nobody gets "(that's you!)" next to their name.
+    context = _read_only_context_for_hand(hand) | {"user": None}
+    return render_to_string("read-only_hand.html#review", context)
+
+
 def _hand_context_for_player(
     *, hand: app.models.Hand, seat: bridge.seat.Seat, viewer_may_control_this_seat: bool
 ) -> dict[str, Any]:
@@ -579,6 +597,14 @@ def _error_response_or_viewfunc(
 
 
 def _everything_read_only_view(request: AuthedHttpRequest, hand: app.models.Hand) -> HttpResponse:
+    return TemplateResponse(
+        request,
+        "read-only_hand.html",
+        context=_read_only_context_for_hand(hand),
+    )
+
+
+def _read_only_context_for_hand(hand: app.models.Hand) -> dict[str, Any]:
     xscript = hand.get_xscript()
     a = xscript.auction
     c = a.status
@@ -613,11 +639,7 @@ def _everything_read_only_view(request: AuthedHttpRequest, hand: app.models.Hand
             "terse_description": _terse_description(hand),
         }
 
-    return TemplateResponse(
-        request,
-        "read-only_hand.html",
-        context=context,
-    )
+    return context
 
 
 def _interactive_view(request: AuthedHttpRequest, hand: app.models.Hand) -> HttpResponse:
@@ -627,6 +649,7 @@ def _interactive_view(request: AuthedHttpRequest, hand: app.models.Hand) -> Http
         _four_hands_context_for_hand(as_viewed_by=as_viewed_by, hand=hand)
         | {
             "active_seat": hand.active_seat_name,
+            "sse_delta_events": settings.SSE_DELTA_EVENTS,
             "terse_description": _terse_description(hand),
         }
         | _auction_context_for_hand(hand)
@@ -31,7 +31,8 @@ from django_eventstream import send_event  # type: ignore [import-untyped]
 from django_filters import FilterSet
 from django_filters.views import FilterView
 
-from app.models import Hand, Message, PartnerException, Player
+from app import solver
+from app.models import Hand, Message, PartnerException, Player, bot_memo
 from app.models.player import JOIN, SPLIT
 from app.models.types import PK
 from app.templatetags.player_extras import sedate_link
@@ -323,21 +324,28 @@ def hint_view(request: AuthedHttpRequest, player_pk: PK) -> HttpResponse:
     if h is None:
         return HttpResponse(status=200, content=escape(f"{p} has no current hand"))
 
-    xscript = h.get_xscript()
-
-    if p == h.player_who_may_call:
-        call = xscript.auction.make_standard_american_call(
-            pbn=xscript.endplay_deal.to_pbn(),
-            vuln=xscript.endplay_vulnerability(),
+    try:
+        if p == h.player_who_may_call:
+            call = bot_memo.call(h, timeout=solver.HINT_TIMEOUT_SECONDS, wait=False)
+            hint = f"If I were you, I'd call {call}"
+            # Worked out in the background when the board was dealt; see app.models.board_analysis.
+            if (par := h.board.par_description) is not None:
+                hint += f" (par is {par})"
+            return HttpResponse(status=200, content=escape(hint))
+
+        if (s := h.next_seat_to_play) is not None:
+            if h.player_who_controls_seat(s, right_this_second=True):
+                card = bot_memo.play(h, timeout=solver.HINT_TIMEOUT_SECONDS, wait=False)
+                return HttpResponse(
+                    status=200,
+                    content=escape(f"If I were {h.next_seat_to_play}, I'd play {card}"),
+                )
+    except solver.SolverUnavailable as e:
+        logger.warning("%s", f"No hint for {p}: {e}")
+        return HttpResponse(
+            status=200,
+            content=escape("I'm thinking about too many hands right now; try again in a moment"),
         )
-        return HttpResponse(status=200, content=escape(f"If I were you, I'd call {call}"))
-
-    if (s := h.next_seat_to_play) is not None:
-        if h.player_who_controls_seat(s, right_this_second=True):
-            card = xscript.slightly_less_dumb_play().card
-            return HttpResponse(
-                status=200, content=escape(f"If I were {h.next_seat_to_play}, I'd play {card}")
-            )
 
     return HttpResponse(status=200, content=escape(f"It's not {p}'s turn to call or play"))
 
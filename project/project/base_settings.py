@@ -142,6 +142,33 @@ EVENTSTREAM_REDIS = {
 
 EVENTSTREAM_CHANNELMANAGER_CLASS = "app.channelmanager.MyChannelManager"
 
+# Keep each channel's recent events, so that a browser that reconnects can catch up on what it missed.  See
+# app/sse_replay.py.
+EVENTSTREAM_STORAGE_CLASS = "app.sse_replay.RingBufferStorage"
+SSE_REPLAY_MAX_EVENTS = int(os.environ.get("SSE_REPLAY_MAX_EVENTS", "200"))
+SSE_REPLAY_MAX_AGE_SECONDS = int(os.environ.get("SSE_REPLAY_MAX_AGE_SECONDS", "600"))
+
+# If True, publish server-sent events right away, on the request thread, rather than after commit on a background
+# thread.  See app/sse_outbox.py.
+SSE_OUTBOX_SYNCHRONOUS = False
+
+# If True, don't publish server-sent events at all.  Only for benchmarks; see the simulate_tournament command.
+SSE_OUTBOX_DISCARD = False
+
+# If positive, wait this long for more server-sent events before publishing, and merge successive updates to the same
+# table or player; e.g. 0.1.  Mostly useful when bots are playing with a tiny tempo.  See app/sse_outbox.py.
+SSE_COALESCE_SECONDS = float(os.environ.get("SSE_COALESCE_SECONDS", "0"))
+
+# How many worker processes to give the bot's bidding and card play, so that they don't hog the GIL in the web server or
+# in the cheating_bot command; 0 means "just run them on the caller's thread".  Past SOLVER_MAX_PENDING requests queued
+# or running at once, the "hint" button says "try again".  See app/solver.py.
+SOLVER_PROCESSES = int(os.environ.get("SOLVER_PROCESSES", "2"))
+SOLVER_MAX_PENDING = int(os.environ.get("SOLVER_MAX_PENDING", "16"))
+
+# If True, tell browsers just which call or card was played, and let bridge-game.js update the page, rather than
+# sending them re-rendered bidding boxes, hands, auctions and tricks.
+SSE_DELTA_EVENTS = os.environ.get("SSE_DELTA_EVENTS", "").lower().startswith("t")
+
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # must be near the top
@@ -162,6 +189,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "app.middleware.simple_access_log.RequestLoggingMiddleware",
+    "app.middleware.xscript_memo.XscriptMemoMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_prometheus.middleware.PrometheusAfterMiddleware",
@@ -55,3 +55,9 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
+
+# pytest-django runs each test in a transaction that never commits, so the outbox would never publish anything.
+SSE_OUTBOX_SYNCHRONOUS = True
+
+# Spawning worker processes would make every test that asks the bot for a call or card that much slower.
+SOLVER_PROCESSES = 0
@@ -1,7 +1,7 @@
 import json
 import pathlib
 
-import django_eventstream  # type: ignore [import-untyped]
+import app.views.events
 from app.forms import LoginForm
 from debug_toolbar.toolbar import debug_toolbar_urls  # type: ignore [import-untyped]
 from django.conf import settings
@@ -42,38 +42,48 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path(
         "events/lobby/",
-        include(django_eventstream.urls),
+        include(app.views.events),
         kwargs={"channels": ["lobby"]},
     ),
     path(
         "events/chat/player-to-player/<channel>/",
-        include(django_eventstream.urls),
+        include(app.views.events),
+    ),
+    # Everything a player's browser needs, on one connection; ?table=<hand_pk> adds that table's events, if the player
+    # may read them (see MyChannelManager.get_channels_for_request).
+    path(
+        "events/player/<int:player_id>/",
+        include(app.views.events),
+        {
+            "format-channels": ["player:html:hand:{player_id}", "player:bot-checkbox:{player_id}"],
+            "multiplexed": True,
+        },
     ),
     path(
         "events/player/html/hand/<player_id>/",
-        include(django_eventstream.urls),
+        include(app.views.events),
         {"format-channels": ["player:html:hand:{player_id}"]},
     ),
     path(
         "events/player/json/<player_id>/",
-        include(django_eventstream.urls),
+        include(app.views.events),
         {"format-channels": ["player:json:{player_id}"]},
     ),
     path(
         "events/player/bot-checkbox/<player_id>/",
-        include(django_eventstream.urls),
+        include(app.views.events),
         {"format-channels": ["player:bot-checkbox:{player_id}"]},
     ),
     # This gets events for one specific table.
     path(
         "events/table/html/<hand_id>/",
-        include(django_eventstream.urls),
+        include(app.views.events),
         {"format-channels": ["table:html:{hand_id}"]},
     ),
     # This gets all events for all tables.
     path(
         "events/all-tables/",
-        include(django_eventstream.urls),
+        include(app.views.events),
         kwargs={"channels": ["all-tables"]},
     ),
     path("tz_detect/", include("tz_detect.urls")),